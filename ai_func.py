@@ -1,11 +1,47 @@
 import os
+import asyncio
 import openai
 import re
 import backoff
 from functools import partial
+from utils.token_utils import count_tokens, truncate_to_tokens, split_into_chunks
+from utils.llm_cache import LLMCache, get_llm_cache
+from utils.rate_limiter import RateLimiter
+from utils.embedding_batcher import EmbeddingBatcher
 
 openai.api_key = os.environ['OPENAI_KEY']
 client = openai.OpenAI(api_key=os.environ['OPENAI_KEY'])
+# Async client used by the ingestion pipeline so LLM calls never block the Discord event loop.
+# Retries are handled by gen_gpt_chat_completion, which also applies the rate limits below.
+async_client = openai.AsyncOpenAI(api_key=os.environ['OPENAI_KEY'], max_retries=0)
+
+# Account rate limits per model as (requests per minute, tokens per minute), overridable with
+# OPENAI_RPM_<MODEL> / OPENAI_TPM_<MODEL>, e.g. OPENAI_TPM_GPT_4O_MINI. Calls beyond them wait
+# in line instead of failing with a 429.
+DEFAULT_RATE_LIMITS = {
+    "gpt-4o": (5000, 450000),
+    "gpt-4o-mini": (5000, 2000000),
+    "text-embedding-ada-002": (5000, 1000000),
+}
+# Requests in flight at once across all models
+OPENAI_MAX_CONCURRENCY = int(os.environ.get('OPENAI_MAX_CONCURRENCY', 8))
+OPENAI_MAX_RETRIES = 6
+
+_openai_semaphore = asyncio.Semaphore(OPENAI_MAX_CONCURRENCY)
+_rate_limiters = {}
+
+def get_rate_limiter(model):
+    if model not in _rate_limiters:
+        rpm, tpm = DEFAULT_RATE_LIMITS.get(model, DEFAULT_RATE_LIMITS["gpt-4o"])
+        env_suffix = re.sub(r'[^A-Z0-9]', '_', model.upper())
+        rpm = int(os.environ.get(f'OPENAI_RPM_{env_suffix}', rpm))
+        tpm = int(os.environ.get(f'OPENAI_TPM_{env_suffix}', tpm))
+        _rate_limiters[model] = RateLimiter(rpm, tpm, _openai_semaphore)
+    return _rate_limiters[model]
+
+# Rate limits, server errors and dropped connections are retried with full-jitter
+# exponential backoff; anything else (bad requests, auth) fails immediately
+RETRYABLE_OPENAI_ERRORS = (openai.RateLimitError, openai.InternalServerError, openai.APIConnectionError)
 
 def is_chinese(text):
     if any(u'\u4e00' <= c <= u'\u9fff' for c in text):
@@ -31,15 +67,20 @@ def gen_gpt_completion(prompt, temp=0.0, engine="text-davinci-003", max_tokens=1
     )
     return response
 
+def resolve_model(engine):
+    return "gpt-4o-mini" if "gpt-4o-mini" in engine else "gpt-4o"
+
 # Use gpt-40o for longer text and chat completion
-#@backoff.on_exception(
-#    partial(backoff.expo, max_value=2),
-#    (openai.RateLimitError, openai.APIError, openai.APIConnectionError),
-#)
-def gen_gpt_chat_completion(system_prompt, user_prompt, temp=0.0, engine="gpt-4o", max_tokens=2048,
-                            top_p=1, frequency_penalty=0, presence_penalty=0, use_json_mode=False):
+@backoff.on_exception(
+    partial(backoff.expo, max_value=30),
+    RETRYABLE_OPENAI_ERRORS,
+    max_tries=OPENAI_MAX_RETRIES,
+    jitter=backoff.full_jitter,
+)
+async def gen_gpt_chat_completion(system_prompt, user_prompt, temp=0.0, engine="gpt-4o", max_tokens=2048,
+                                  top_p=1, frequency_penalty=0, presence_penalty=0, use_json_mode=False):
     
-    model_to_use = "gpt-4o-mini" if "gpt-4o-mini" in engine else "gpt-4o"
+    model_to_use = resolve_model(engine)
     
     request_params = {
         "model": model_to_use,
@@ -57,24 +98,105 @@ def gen_gpt_chat_completion(system_prompt, user_prompt, temp=0.0, engine="gpt-4o
     if use_json_mode:
         request_params["response_format"] = {"type": "json_object"}
 
-    response = client.chat.completions.create(**request_params)
+    # Output tokens count towards the limit too, so reserve max_tokens up front
+    # (counted in a worker thread: a long prompt takes tiktoken a while to encode)
+    prompt_tokens = await asyncio.to_thread(count_tokens, system_prompt + user_prompt)
+    estimated_tokens = prompt_tokens + max_tokens
+    async with get_rate_limiter(model_to_use).limit(estimated_tokens):
+        response = await async_client.chat.completions.create(**request_params)
     return response
 
-def generate_summary(text_snippet, summary_type='general', focus=None, use_arxiv_prompt=False, user_memory=None):
+# Bump a prompt's version when its template changes so cached responses to the old one are not reused
+PROMPT_VERSIONS = {
+    'summary': 1,
+    'summary_chunk': 1,
+    'keywords': 1,
+    'user_memory': 1,
+    'personalized_section': 1,
+}
+
+async def cached_chat_completion(prompt_name, system_prompt, user_prompt, temp=0.0, engine="gpt-4o", max_tokens=2048,
+                                 top_p=1, frequency_penalty=0, presence_penalty=0, use_json_mode=False):
+    """
+    Return the text of a chat completion, from the LLM response cache when the same
+    request (prompt version, model, parameters and normalized prompts) was made before.
 
-    max_input_words = 150000  # Increased limit for more powerful models
-    max_input_words_chinese = 75000
-    max_output_tokens = 2048
+    Only complete responses are cached; truncated or empty ones are returned but not stored.
+    """
+    model = resolve_model(engine)
+    params = {'temp': temp, 'max_tokens': max_tokens, 'top_p': top_p, 'frequency_penalty': frequency_penalty,
+              'presence_penalty': presence_penalty, 'use_json_mode': use_json_mode}
+    cache = get_llm_cache()
+    key = LLMCache.make_key(prompt_name, PROMPT_VERSIONS[prompt_name], model, params, system_prompt, user_prompt)
+    cached = await asyncio.to_thread(cache.get, key)
+    if cached is not None:
+        return cached
+
+    response = await gen_gpt_chat_completion(system_prompt, user_prompt, temp=temp, engine=model, max_tokens=max_tokens,
+                                             top_p=top_p, frequency_penalty=frequency_penalty,
+                                             presence_penalty=presence_penalty, use_json_mode=use_json_mode)
+    choice = response.choices[-1]
+    text = (choice.message.content or '').strip()
+    if text and choice.finish_reason == 'stop':
+        await asyncio.to_thread(cache.put, key, text, prompt_name, model)
+    return text
+
+# Token budgets for summarization. Documents up to SINGLE_PASS_MAX_TOKENS are summarized
+# in one call; longer ones are split into chunks that the cheaper model condenses into
+# notes concurrently (map), and the notes are summarized into the JSON schema (reduce).
+SINGLE_PASS_MAX_TOKENS = 32000
+CHUNK_TOKENS = 8000
+MAX_CHUNKS = 24  # Text past MAX_CHUNKS * CHUNK_TOKENS tokens is dropped
+CHUNK_NOTES_MAX_TOKENS = 600
+CHUNK_CONCURRENCY = 6
+CHUNK_MODEL = "gpt-4o-mini"
+
+async def summarize_chunk(chunk, index, total, focus=None):
+    """Condense one chunk of a long document into dense notes for the final summary."""
+    system_prompt = (
+        "You are reading one part of a long document so that it can be summarized later. "
+        "Write dense notes in English (max 300 words) on this part only: its claims, methods, "
+        "results with their numbers, definitions and conclusions. Include the document title "
+        "if it appears. Do not add commentary or information that is not in the text."
+    )
+    if focus:
+        system_prompt += f" Pay special attention to anything about: '{focus}'."
+    user_prompt = f"Part {index + 1} of {total}:\n\n---\n\n{chunk}"
+    try:
+        return await cached_chat_completion(
+            'summary_chunk',
+            system_prompt,
+            user_prompt,
+            max_tokens=CHUNK_NOTES_MAX_TOKENS,
+            engine=CHUNK_MODEL,
+            temp=0.0
+        )
+    except Exception as e:
+        # Keep the start of the chunk itself rather than losing the part entirely
+        print(f"Chunk {index + 1}/{total} summary failed, using its opening text: {e}")
+        return truncate_to_tokens(chunk, CHUNK_NOTES_MAX_TOKENS)
+
+async def condense_long_text(text_snippet, focus=None):
+    """Map step: split a long text into chunks and summarize them concurrently, in order."""
+    chunks = (await asyncio.to_thread(split_into_chunks, text_snippet, CHUNK_TOKENS))[:MAX_CHUNKS]
+    semaphore = asyncio.Semaphore(CHUNK_CONCURRENCY)
+
+    async def run(index, chunk):
+        async with semaphore:
+            return await summarize_chunk(chunk, index, len(chunks), focus=focus)
 
-    # ... (rest of the function remains the same until prompts) ...
+    notes = await asyncio.gather(*(run(i, chunk) for i, chunk in enumerate(chunks)))
+    return "\n\n".join(f"[Part {i + 1} of {len(chunks)}]\n{note}" for i, note in enumerate(notes))
 
-    # Truncate the text snippet if it's too long
-    words = text_snippet.split()
-    if is_chinese(text_snippet):
-        text_snippet = text_snippet[:max_input_words_chinese]
-    elif len(words) > max_input_words:
-        words = words[:max_input_words]
-        text_snippet = " ".join(words)
+async def generate_summary(text_snippet, summary_type='general', focus=None, use_arxiv_prompt=False, user_memory=None):
+
+    max_output_tokens = 2048
+
+    # Long documents are condensed chunk by chunk instead of being truncated. Tokenizing
+    # hundreds of thousands of characters takes a while, so it runs in a worker thread
+    is_condensed = await asyncio.to_thread(count_tokens, text_snippet) > SINGLE_PASS_MAX_TOKENS
+    if is_condensed:
+        text_snippet = await condense_long_text(text_snippet, focus=focus)
 
     # Choose prompt based on whether this is an arXiv paper
     if use_arxiv_prompt:
@@ -147,10 +269,16 @@ def generate_summary(text_snippet, summary_type='general', focus=None, use_arxiv
         json_prompt_structure += f"\n- Pay special attention to the following aspect and ensure it is covered in the summary: '{focus}'"
 
     system_prompt = json_prompt_structure
-    user_prompt = f"Here is the text to summarize:\n\n---\n\n{text_snippet}"
+    if is_condensed:
+        user_prompt = ("The document is too long to read at once, so here are notes on each of its "
+                       "consecutive parts, in order. Summarize the whole document from them:"
+                       f"\n\n---\n\n{text_snippet}")
+    else:
+        user_prompt = f"Here is the text to summarize:\n\n---\n\n{text_snippet}"
 
     try:
-        response = gen_gpt_chat_completion(
+        summary_json = await cached_chat_completion(
+            'summary',
             system_prompt, 
             user_prompt, 
             max_tokens=max_output_tokens, 
@@ -158,8 +286,6 @@ def generate_summary(text_snippet, summary_type='general', focus=None, use_arxiv
             temp=0.2 # A little creativity for better summaries
         )
         
-        summary_json = response.choices[-1].message.content.strip()
-        
         # Basic validation if it's a string that looks like JSON
         if summary_json.startswith('{') and summary_json.endswith('}'):
             return summary_json
@@ -179,7 +305,7 @@ def generate_summary(text_snippet, summary_type='general', focus=None, use_arxiv
         error_msg = str(e).replace('"', "'")
         return '{"error": "An unexpected error occurred: ' + error_msg + '"}'
 
-def process_user_memory(existing_profile: str, new_memory_input: str) -> str:
+async def process_user_memory(existing_profile: str, new_memory_input: str) -> str:
     """
     Process and synthesize user memory using GPT-4o-mini.
     Takes existing profile and new memory input, returns updated profile.
@@ -212,15 +338,14 @@ Please synthesize these into a single, updated research profile."""
 Please create a research profile based on this interest."""
 
     try:
-        response = gen_gpt_chat_completion(
+        updated_profile = await cached_chat_completion(
+            'user_memory',
             system_prompt, 
             user_prompt, 
             max_tokens=300,
             engine="gpt-4o-mini",
             temp=0.3  # Slight creativity for better synthesis
         )
-        
-        updated_profile = response.choices[-1].message.content.strip()
         return updated_profile
         
     except Exception as e:
@@ -230,7 +355,7 @@ Please create a research profile based on this interest."""
         else:
             return new_memory_input.strip()
 
-def generate_personalized_section(document_content: str, user_memory: str) -> str:
+async def generate_personalized_section(document_content: str, user_memory: str) -> str:
     """
     Generate a personalized "Why You Should Read This" section for an existing document.
     This is a lightweight call specifically for cached documents.
@@ -263,7 +388,8 @@ User's Research Interests: {user_memory}
 Please analyze if this document is relevant to the user's interests and provide a personalized recommendation if appropriate."""
 
     try:
-        response = gen_gpt_chat_completion(
+        result = await cached_chat_completion(
+            'personalized_section',
             system_prompt, 
             user_prompt, 
             max_tokens=150,
@@ -271,8 +397,6 @@ Please analyze if this document is relevant to the user's interests and provide
             temp=0.3
         )
         
-        result = response.choices[-1].message.content.strip()
-        
         # Check if the AI determined the document is not relevant
         if "NOT_RELEVANT" in result.upper():
             return ""
@@ -283,16 +407,43 @@ Please analyze if this document is relevant to the user's interests and provide
         # Fail silently for personalization - don't break the main flow
         return ""
 
-def generate_embedding(text_snippet):
+async def generate_embedding(text_snippet):
     #embedding = openai.Embedding.create(
     #    input=text_snippet, model="text-embedding-ada-002"
     #)["data"][0]["embedding"]
-    embedding = client.embeddings.create(
-        input=text_snippet[:8192], model="text-embedding-ada-002"
-    ).data[0].embedding
-    return embedding
+    # Concurrent requests are sent to the API together, see _embedding_batcher
+    return await _embedding_batcher.embed(text_snippet[:8192])
+
+EMBEDDING_MODEL = "text-embedding-ada-002"
 
-def extract_keywords_from_summary(summary):
+@backoff.on_exception(
+    partial(backoff.expo, max_value=30),
+    RETRYABLE_OPENAI_ERRORS,
+    max_tries=OPENAI_MAX_RETRIES,
+    jitter=backoff.full_jitter,
+)
+async def _create_embeddings(texts, model):
+    tokens = await asyncio.to_thread(lambda: sum(count_tokens(text) for text in texts))
+    async with get_rate_limiter(model).limit(tokens):
+        response = await async_client.embeddings.create(input=texts, model=model)
+    # The API returns one item per input with its index; order by it to be safe
+    return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+async def _embed_batch(texts):
+    try:
+        return await _create_embeddings(texts, EMBEDDING_MODEL)
+    except openai.BadRequestError:
+        if len(texts) == 1:
+            raise
+        # One rejected input should not fail the documents batched with it
+        results = await asyncio.gather(*(_create_embeddings([text], EMBEDDING_MODEL) for text in texts),
+                                       return_exceptions=True)
+        return [result if isinstance(result, BaseException) else result[0] for result in results]
+
+# Up to 64 inputs of at most 8192 characters each stays well within the per-request token limit
+_embedding_batcher = EmbeddingBatcher(_embed_batch, max_batch=64, max_wait=0.02)
+
+async def extract_keywords_from_summary(summary):
     prompt = (
         "You are an expert knowledge management assistant specializing in extracting meaningful keywords for research databases and knowledge graphs.\n\n"
         "From the following summary, identify the most important keywords and phrases that capture:\n"
@@ -322,10 +473,8 @@ def extract_keywords_from_summary(summary):
     user_prompt = summary
     #response = gen_gpt_completion(prompt, max_tokens=100)
     try:
-        response = gen_gpt_chat_completion(system_prompt, user_prompt, max_tokens=256)
-
         # Extract keywords from response and clean them up
-        keywords_text = response.choices[-1].message.content.strip()
+        keywords_text = await cached_chat_completion('keywords', system_prompt, user_prompt, max_tokens=256)
         
         # Remove any leading text and get just the keywords
         if ':' in keywords_text:
@@ -422,7 +571,7 @@ def test_obsidian_markdown():
     summary = "This paper introduces MLCopilot, a framework for automating machine learning pipelines using large language models like ChatGPT. The system demonstrates competitive programming capabilities and automates hyperparameter optimization in various AI applications."
     
     print("Testing improved keyword extraction and Obsidian markdown conversion...")
-    keywords = extract_keywords_from_summary(summary)
+    keywords = asyncio.run(extract_keywords_from_summary(summary))
     print(f"Extracted keywords: {keywords}")
     
     result = summary_to_obsidian_markdown(summary, keywords)
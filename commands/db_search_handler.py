@@ -1,5 +1,5 @@
 import time
-from database_manager import DatabaseManager
+from database_manager import DatabaseManager, get_database_manager
 
 async def handle_db_search(message, db_manager: DatabaseManager = None):
     """Handle database search command: !dbsearch <keyword>"""
@@ -8,7 +8,7 @@ async def handle_db_search(message, db_manager: DatabaseManager = None):
         return
     
     if db_manager is None:
-        db_manager = DatabaseManager()
+        db_manager = get_database_manager()
     
     keyword = message.content.split(' ', 1)[1].strip()
     
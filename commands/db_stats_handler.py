@@ -1,11 +1,11 @@
 import os
-from database_manager import DatabaseManager
+from database_manager import DatabaseManager, get_database_manager
 
 async def handle_db_stats(message, db_manager: DatabaseManager = None):
     """Handle database stats command: !dbstats"""
     
     if db_manager is None:
-        db_manager = DatabaseManager()
+        db_manager = get_database_manager()
     
     try:
         stats = db_manager.get_stats()
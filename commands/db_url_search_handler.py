@@ -1,5 +1,5 @@
 import time
-from database_manager import DatabaseManager
+from database_manager import DatabaseManager, get_database_manager
 
 async def handle_db_url_search(message, db_manager: DatabaseManager = None):
     """Handle database URL search command: !dburl <pattern>"""
@@ -8,7 +8,7 @@ async def handle_db_url_search(message, db_manager: DatabaseManager = None):
         return
     
     if db_manager is None:
-        db_manager = DatabaseManager()
+        db_manager = get_database_manager()
     
     pattern = message.content.split(' ', 1)[1].strip()
     
@@ -1,3 +1,4 @@
+import asyncio
 import discord
 import arxiv
 import re
@@ -138,7 +139,8 @@ async def handle_find(message, indexer, db_manager):
             _title_field_tokens_and(original_query)
         ]
 
-        candidates = _gather_candidates(client, queries, max_per_query=12)
+        # The arxiv client pages through results with blocking HTTP calls
+        candidates = await asyncio.to_thread(_gather_candidates, client, queries, max_per_query=12)
 
         if not candidates:
             await search_msg.edit(content=f"❌ No arXiv papers found for title: **{content}**")
@@ -38,7 +38,7 @@ async def process_new_memory(message, db_manager: DatabaseManager, user_id: str,
         existing_profile = existing_profile_data['current_memory_profile'] if existing_profile_data else ""
         
         # Process the memory using AI
-        updated_profile = process_user_memory(existing_profile, new_memory)
+        updated_profile = await process_user_memory(existing_profile, new_memory)
         
         # Save to database
         success = db_manager.set_user_memory(user_id, updated_profile, new_memory)
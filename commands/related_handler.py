@@ -1,5 +1,42 @@
+import asyncio
+
 from indexer import Indexer
 
+def _is_scored(result):
+    """DB results carry a similarity score; legacy keyword matches do not."""
+    return isinstance(result, dict) and 'similarity' in result
+
+def _find_related(indexer, db_manager, document_id, user_id):
+    """
+    Look up a document and its related documents; blocking, so it runs in a worker thread.
+
+    Returns (document, related, legacy_docs): ``document`` is None when it is not found,
+    and ``legacy_docs`` maps the ids of unscored results to their full records.
+    """
+    # First check if document exists and belongs to user (for new DB documents);
+    # for legacy documents, use the indexer (no user filtering yet)
+    db_doc = db_manager.get_document_by_id(document_id, user_id=user_id)
+    document = db_doc or indexer.get_document_by_id(document_id)
+    if not document:
+        return None, [], {}
+
+    # Get related documents (prefer DB if available, fallback to legacy)
+    if db_doc:
+        # Nearest neighbours of the document's own embedding among the user's documents
+        # (the first search also loads the vector index)
+        embedding = db_manager.get_embedding(document_id)
+        if embedding is not None:
+            related = db_manager.semantic_search(embedding, limit=5, user_id=user_id, exclude_ids=[document_id])
+        else:
+            related = db_manager.get_related_documents(document_id, limit=5, user_id=user_id)
+    else:
+        # Legacy system - no user filtering available yet
+        related = indexer.get_related_documents(document_id)
+
+    legacy_docs = {result['id']: indexer.get_document_by_id(result['id'])
+                   for result in related[:5] if not _is_scored(result) and 'id' in result}
+    return document, related, legacy_docs
+
 async def handle_related(message, indexer: Indexer, db_manager):
     """Handle !related command - find user's documents related to a given document"""
     
@@ -15,29 +52,13 @@ async def handle_related(message, indexer: Indexer, db_manager):
         await message.channel.send('Document ID must be a number')
         return
     
-    # First check if document exists and belongs to user (for new DB documents)
-    db_doc = db_manager.get_document_by_id(document_id, user_id=user_id)
-    
-    # For legacy documents, use the indexer (no user filtering yet)
-    legacy_doc = indexer.get_document_by_id(document_id)
-    
-    document = db_doc or legacy_doc
+    # SQLite lookups and the vector search run off the event loop
+    document, related, legacy_docs = await asyncio.to_thread(_find_related, indexer, db_manager, document_id, user_id)
     
     if not document:
         await message.channel.send(f'Document not found with ID: {document_id} in your collection\n*Note: You can only view your own documents*')
         return
     
-    # Get related documents (prefer DB if available, fallback to legacy)
-    if db_doc:
-        # Use semantic search on user's documents for better results
-        query = document.get('summary', document.get('url', ''))[:100]  # Use summary as query
-        related_results = db_manager.semantic_search(query, limit=5, user_id=user_id)
-        # Filter out the original document
-        related = [r for r in related_results if r.get('id') != document_id]
-    else:
-        # Legacy system - no user filtering available yet
-        related = indexer.get_related_documents(document_id)
-    
     if not related:
         await message.channel.send(f'No related documents found in your collection for ID: {document_id}')
         return
@@ -61,7 +82,7 @@ async def handle_related(message, indexer: Indexer, db_manager):
             break
             
         # Handle both DB and legacy document formats
-        if isinstance(result, dict) and 'similarity' in result:
+        if _is_scored(result):
             # DB document with similarity score
             doc_info = [
                 f"{i}. [{result['url']}]",
@@ -71,7 +92,7 @@ async def handle_related(message, indexer: Indexer, db_manager):
             ]
         else:
             # Legacy document format
-            related_doc = indexer.get_document_by_id(result['id']) if 'id' in result else result
+            related_doc = legacy_docs.get(result.get('id')) or result
             related_keywords = related_doc.get('keywords', [])
             if isinstance(related_keywords, str):
                 related_keywords = [k.strip() for k in related_keywords.split(',')]
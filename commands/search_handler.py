@@ -11,25 +11,26 @@ async def handle_search(message, indexer: Indexer, db_manager: DatabaseManager):
     query = message.content.split(' ', 1)[1].strip()
     user_id = str(message.author.id)  # Get user ID for filtering
     
-    # Search both legacy indexer and database (user-filtered)
-    legacy_results = indexer.search_by_text(query)  # Legacy indexer doesn't have user filtering yet
-    db_results = db_manager.search_by_keyword(query, user_id=user_id)  # Filter by user
+    # Full-text search of both legacy indexer and database (user-filtered), best match first
+    legacy_results = indexer.search_by_text(query, user_id=user_id)
+    db_results = db_manager.search_text(query, user_id=user_id, limit=50)  # Filter by user
     
     # Combine and deduplicate results by URL
     all_results = []
     seen_urls = set()
     
-    # Add legacy results (filter by user_id if available in legacy data)
+    # Add legacy results (already filtered by user)
     for result in legacy_results:
-        # For now, legacy results don't have user filtering, so we include them
-        # In a future phase, we can add user filtering to the legacy indexer
         if result['url'] not in seen_urls:
             all_results.append({
                 'url': result['url'],
                 'type': result['type'],
                 'timestamp': result['timestamp'],
                 'summary': result['summary'],
-                'keywords': indexer.get_document_by_id(result['id'])['keywords'] if 'id' in result else [],
+                'snippet': result['snippet'],
+                'rank': result['rank'],
+                'match': result['match'],
+                'keywords': result['keywords'],
                 'source': 'legacy'
             })
             seen_urls.add(result['url'])
@@ -42,6 +43,9 @@ async def handle_search(message, indexer: Indexer, db_manager: DatabaseManager):
                 'type': result['type'],
                 'timestamp': result['timestamp'],
                 'summary': result['summary'],
+                'snippet': result['snippet'],
+                'rank': result['rank'],
+                'match': result['match'],
                 'keywords': result['keywords'],
                 'source': 'database'
             })
@@ -51,8 +55,9 @@ async def handle_search(message, indexer: Indexer, db_manager: DatabaseManager):
         await message.channel.send(f'🔍 No results found for: **{query}**\n*Note: Only your documents are searched*')
         return
     
-    # Sort by timestamp (most recent first)
-    all_results.sort(key=lambda x: x['timestamp'], reverse=True)
+    # Full-text matches first, by relevance (lower BM25 rank is better). Substring matches
+    # have no relevance score, so they form a second tier, most recent first
+    all_results.sort(key=lambda x: (x['match'] != 'fulltext', x['rank'] or 0, -x['timestamp']))
     
     # Limit results for Discord message
     limited_results = all_results[:5]
@@ -67,8 +72,8 @@ async def handle_search(message, indexer: Indexer, db_manager: DatabaseManager):
         if len(url) > 80:
             url = url[:77] + '...'
         
-        # Show summary (full summary)
-        summary = result['summary']
+        # Show the matching passage, with the matched words in bold
+        summary = result['snippet'] or result['summary']
         
         # Show first few keywords
         keywords = ', '.join(result['keywords'][:4]) if result['keywords'] else 'No keywords'
@@ -1,6 +1,8 @@
 import os
 from indexer import Indexer
 from database_manager import DatabaseManager
+from readers.http_client import get_http_client
+from utils.llm_cache import get_llm_cache
 
 async def handle_stats(message, indexer: Indexer, db_manager: DatabaseManager):
     """Handle !stats command - show user-specific statistics from both legacy and database sources"""
@@ -71,6 +73,22 @@ async def handle_stats(message, indexer: Indexer, db_manager: DatabaseManager):
             size_mb = os.path.getsize(db_path) / (1024 * 1024)
             response += f"\n💾 **Database size:** {size_mb:.2f} MB\n"
         
+        # Busiest hosts fetched by the readers since the bot started
+        http_metrics = get_http_client().metrics()
+        if http_metrics:
+            response += "\n🌐 **Fetches since start:**\n"
+            busiest = sorted(http_metrics.items(), key=lambda item: item[1]['requests'], reverse=True)[:3]
+            for host, stats in busiest:
+                response += (f"   • {host}: {stats['requests']} requests, {stats['errors']} errors, "
+                             f"{stats['bytes'] / (1024 * 1024):.1f} MB, avg {stats['avg_seconds']:.2f}s\n")
+        
+        # Replayed LLM requests served from the response cache
+        llm_stats = get_llm_cache().stats()
+        lookups = llm_stats['hits'] + llm_stats['misses']
+        if lookups:
+            response += (f"\n🧠 **LLM cache:** {llm_stats['hits']}/{lookups} hits since start, "
+                         f"{llm_stats['entries']} responses stored\n")
+        
         response += "\n🔧 **Available commands:**\n"
         response += "   • `!grep <term>` - Text search\n"
         response += "   • `!egrep <keyword>` - Keyword search\n"
@@ -1,53 +1,96 @@
 import re
 import socket
+import asyncio
 import time
 import json
 import requests
 from urllib.parse import urlparse
 
-from url_processor import get_url_type_and_reader, generate_file_path
-from content_processor import process_content
+from url_processor import read_url, generate_file_path
+from content_processor import process_content, compute_content_hash
+from ai_func import generate_personalized_section
 from indexer import Indexer
 from database_manager import DatabaseManager
-from utils.embed_builder import create_summary_embed, create_error_embed, create_processing_embed, create_existing_document_embed
+from utils.embed_builder import create_summary_embed, create_error_embed, create_processing_embed, create_existing_document_embed, create_bulk_status_embed
+from utils.ingestion_queue import IngestionQueue
+from utils.progress_reporter import ProgressReporter, BulkProgressReporter
+from utils.single_flight import SingleFlight
+from utils.url_utils import canonicalize_url, extract_urls, remove_urls, dedupe_urls
+
+# In-process registry of running ingestions, keyed on the canonical document key and the focus
+_ingestion_flights = SingleFlight()
+
+# Shared worker pool for fetch/summarize/embed work; my_bot.py sets the worker count
+ingestion_queue = IngestionQueue()
 
 async def handle_wget(message, indexer: Indexer, db_manager: DatabaseManager):
-    """Handle !wget command or direct URL - retrieve and process content into both systems"""
-    
-    # Extract URL, potential focus, and force flag from the message
-    parts = message.content.split(' ')
-    command = parts[0]
-    url = ""
-    focus = None
+    """
+    Handle !wget command or direct URL - retrieve and process content into both systems.
+
+    Every URL and bare arXiv ID in the message (and in attached .txt files) is ingested.
+    A single URL gets the full summary embed; several are processed concurrently and
+    reported in one aggregated status embed.
+    """
+    command, urls, focus, force_refresh = await parse_wget_request(message)
+
+    if not urls:
+        # Nothing URL-like was found, so show what was given as the URL
+        given_url = ' '.join(arg for arg in message.content.split()[1:] if arg != '--force') or None
+        await message.channel.send(embed=create_error_embed("Invalid URL", "Please provide a valid URL.", command, given_url))
+        return
+
+    if len(urls) == 1:
+        await handle_single_url(message, command, urls[0], focus, force_refresh, indexer, db_manager)
+    else:
+        await handle_bulk_urls(message, urls, force_refresh, indexer, db_manager)
+
+async def parse_wget_request(message):
+    """
+    Extract the command, the deduplicated URLs, the focus text and the --force flag.
+
+    Returns:
+        (command, urls, focus, force_refresh)
+    """
+    parts = message.content.split()
+    command = parts[0] if parts else '!wget'
     force_refresh = False
-    use_arxiv_prompt = False
 
     if command == '!wget':
-        # Parse wget command arguments
-        args = parts[1:] if len(parts) > 1 else []
-        
+        args = parts[1:]
         # Check for --force flag (only supported for !wget command)
         if '--force' in args:
             force_refresh = True
-            args.remove('--force')
-        
-        if args:
-            url = args[0].strip()
-            if len(args) > 1:
-                focus = ' '.join(args[1:]).strip()
+            args = [arg for arg in args if arg != '--force']
     else:
         # Direct URL posting - no --force flag support
-        url = command.strip()
-        if len(parts) > 1:
-            focus = ' '.join(parts[1:]).strip()
+        args = parts
+
+    text = ' '.join(args)
+    urls = extract_urls(text)
+    focus = remove_urls(text) or None
+    if command == '!wget' and not urls and args:
+        # Keep accepting bare domains such as "example.com/page" after !wget
+        urls = [args[0]]
+        focus = ' '.join(args[1:]) or None
 
-    url, arxiv_id_detected = normalize_arxiv_identifier(url)
-    if arxiv_id_detected:
-        use_arxiv_prompt = True
+    # Reading lists can also be attached as plain text files
+    for attachment in getattr(message, 'attachments', None) or []:
+        if attachment.filename.lower().endswith('.txt'):
+            data = await attachment.read()
+            urls.extend(extract_urls(data.decode('utf-8', errors='ignore')))
 
+    return command, dedupe_urls(urls), focus, force_refresh
+
+def prepare_url(candidate):
+    """
+    Normalize a URL or bare arXiv ID and validate it.
+
+    Returns:
+        (url, use_arxiv_prompt, error): ``error`` is a message when the URL is invalid.
+    """
+    url, arxiv_id_detected = normalize_arxiv_identifier(candidate)
     # Check if this is an arXiv URL for BOTH !wget command and direct URL
-    if is_arxiv_url(url):
-        use_arxiv_prompt = True
+    use_arxiv_prompt = arxiv_id_detected or is_arxiv_url(url)
 
     # Basic URL validation
     try:
@@ -56,252 +99,345 @@ async def handle_wget(message, indexer: Indexer, db_manager: DatabaseManager):
              # If no scheme, try adding https and re-parsing
             parsed_url = urlparse('https://' + url)
             if not all([parsed_url.scheme, parsed_url.netloc]):
-                await message.channel.send(embed=create_error_embed("Invalid URL", "Please provide a valid URL.", command, url))
-                return
+                return url, use_arxiv_prompt, "Please provide a valid URL."
     except ValueError:
-        await message.channel.send(embed=create_error_embed("Invalid URL", "Could not parse the provided URL.", command, url))
+        return url, use_arxiv_prompt, "Could not parse the provided URL."
+    return url, use_arxiv_prompt, None
+
+async def handle_single_url(message, command, url, focus, force_refresh, indexer: Indexer, db_manager: DatabaseManager):
+    """Process one URL and show its full summary embed."""
+    url, use_arxiv_prompt, url_error = prepare_url(url)
+    if url_error:
+        await message.channel.send(embed=create_error_embed("Invalid URL", url_error, command, url))
         return
 
     start_time = time.time()
     
     # Send processing message using an embed
-    if force_refresh:
-        processing_embed = create_processing_embed(url)
-        processing_embed.title = "🔄 Force Refreshing URL..."
-        processing_embed.description = f"Force refreshing content from:\n{url}\n\n*Note: This will bypass cache and reprocess the document.*"
-    else:
-        processing_embed = create_processing_embed(url)
-    
+    processing_embed = create_processing_embed(url, force_refresh=force_refresh)
     processing_msg = await message.channel.send(embed=processing_embed)
+    progress = ProgressReporter(processing_msg, url, force_refresh=force_refresh)
     
     try:
-        file_type, reader = get_url_type_and_reader(url)
-        content = reader.read(url)
-        
-        file_path, time_now, complete_url = generate_file_path(url, file_type)
-        
-        # Check if document already exists (unless force refresh is requested)
-        existing_doc = None
-        if not force_refresh:
-            existing_doc = db_manager.check_existing_document(complete_url)
-        
-        user_id = str(message.author.id)  # Get Discord user ID
-        
-        # Get user memory for personalization (only for arXiv papers)
-        user_memory = None
-        if use_arxiv_prompt:
-            user_memory_data = db_manager.get_user_memory(user_id)
-            if user_memory_data:
-                user_memory = user_memory_data.get('current_memory_profile')
-        
-        if existing_doc and not force_refresh:
-            # Check if document is outdated (older than 7 days)
-            if db_manager.is_document_outdated(existing_doc['timestamp'], days_threshold=7):
-                # Document is old, update it with new content
-                summary_json, keywords = process_content(
-                    file_type=file_type,
-                    file_path=file_path,
-                    timestamp=time_now,
-                    content=content,
-                    url=complete_url,
-                    focus=focus,
-                    use_arxiv_prompt=use_arxiv_prompt,
-                    user_memory=user_memory
-                )
-                
-                # Add to legacy indexer
-                indexer.index_file(file_path)
-                
-                # Generate new embedding
-                content_text = content
-                if isinstance(content, dict):
-                    content_text = content.get('content', str(content))
-                
-                from ai_func import generate_embedding
-                embedding = generate_embedding(content_text) if content_text else []
-                
-                content_preview = content_text[:500] if isinstance(content_text, str) else str(content_text)[:500]
-                
-                # Update the existing document
-                success = db_manager.update_document(
-                    document_id=existing_doc['id'],
-                    summary=summary_json,
-                    keywords=keywords,
-                    embedding=embedding,
-                    content_preview=content_preview,
-                    user_id=user_id
-                )
-                
-                if success:
-                    processing_time = time.time() - start_time
-                    summary_embed = create_summary_embed(
-                        summary_json=summary_json,
-                        url=complete_url,
-                        doc_type=file_type,
-                        db_id=existing_doc['id'],
-                        processing_time=processing_time,
-                        is_updated=True
-                    )
-                    await processing_msg.edit(embed=summary_embed)
-                else:
-                    error_embed = create_error_embed("Database Error", "Failed to update existing document.", "!wget", url)
-                    await processing_msg.edit(embed=error_embed)
-                return
-            else:
-                # Document is recent, just display it
-                # Check if we need to add personalization for this user
-                summary_json = existing_doc['summary']
-                
-                if use_arxiv_prompt and user_memory:
-                    # Add personalized section for cached arXiv documents
-                    try:
-                        from ai_func import generate_personalized_section
-                        
-                        # Generate personalized section
-                        content_for_personalization = existing_doc.get('content_preview', '') or summary_json
-                        personalized_text = generate_personalized_section(content_for_personalization, user_memory)
-                        
-                        if personalized_text:
-                            # Parse existing summary and add personalized section
-                            try:
-                                summary_data = json.loads(summary_json)
-                                summary_data['why_you_should_read'] = personalized_text
-                                summary_json = json.dumps(summary_data)
-                            except (json.JSONDecodeError, TypeError):
-                                # If parsing fails, use original summary
-                                pass
-                    except Exception:
-                        # If personalization fails, continue with original summary
-                        pass
-                
-                # Create the document dict with potentially personalized summary
-                doc_with_summary = existing_doc.copy()
-                doc_with_summary['summary'] = summary_json
-                
-                existing_embed = create_existing_document_embed(doc_with_summary, existing_doc['id'])
-                await processing_msg.edit(embed=existing_embed)
-                return
-        
-        # Document doesn't exist OR force refresh is requested - create new one or update existing
-        if force_refresh and existing_doc:
-            # Force refresh: update existing document
-            summary_json, keywords = process_content(
-                file_type=file_type,
-                file_path=file_path,
-                timestamp=time_now,
-                content=content,
-                url=complete_url,
-                focus=focus,
-                use_arxiv_prompt=use_arxiv_prompt,
-                user_memory=user_memory
-            )
-            
-            # Add to legacy indexer
-            indexer.index_file(file_path)
-            
-            # Generate new embedding
-            content_text = content
-            if isinstance(content, dict):
-                content_text = content.get('content', str(content))
-            
-            from ai_func import generate_embedding
-            embedding = generate_embedding(content_text) if content_text else []
-            
-            content_preview = content_text[:500] if isinstance(content_text, str) else str(content_text)[:500]
-            
-            # Update the existing document
-            success = db_manager.update_document(
-                document_id=existing_doc['id'],
-                summary=summary_json,
-                keywords=keywords,
-                embedding=embedding,
-                content_preview=content_preview,
-                user_id=user_id
-            )
-            
-            if success:
-                processing_time = time.time() - start_time
-                summary_embed = create_summary_embed(
-                    summary_json=summary_json,
-                    url=complete_url,
-                    doc_type=file_type,
-                    db_id=existing_doc['id'],
-                    processing_time=processing_time,
-                    is_updated=True
-                )
-                await processing_msg.edit(embed=summary_embed)
-            else:
-                error_embed = create_error_embed("Database Error", "Failed to force update existing document.", "!wget", url)
-                await processing_msg.edit(embed=error_embed)
-            return
-        
-        # Document doesn't exist, create new one
-        summary_json, keywords = process_content(
-            file_type=file_type,
-            file_path=file_path,
-            timestamp=time_now,
-            content=content,
-            url=complete_url,
+        outcome = await resolve_document(
+            url=url,
+            user_id=str(message.author.id),  # Get Discord user ID
             focus=focus,
+            force_refresh=force_refresh,
             use_arxiv_prompt=use_arxiv_prompt,
-            user_memory=user_memory
+            indexer=indexer,
+            db_manager=db_manager,
+            progress=progress
         )
+        await progress.finish()
         
-        # Add to legacy indexer
-        indexer.index_file(file_path)
-        
-        # Add to database
-        content_text = content
-        if isinstance(content, dict):
-            content_text = content.get('content', str(content))
-        
-        from ai_func import generate_embedding
-        embedding = generate_embedding(content_text) if content_text else []
-        
-        content_preview = content_text[:500] if isinstance(content_text, str) else str(content_text)[:500]
+        if outcome['status'] == 'found':
+            # Document is recent, just display it
+            existing_embed = create_existing_document_embed(outcome['document'], outcome['document']['id'])
+            await processing_msg.edit(embed=existing_embed)
+            return
         
-        doc_id = db_manager.add_document(
-            url=complete_url,
-            doc_type=file_type,
-            timestamp=time_now,
-            summary=summary_json,  # Store the JSON string directly
-            file_path=file_path,
-            keywords=keywords,
-            embedding=embedding,
-            content_preview=content_preview,
-            user_id=user_id
-        )
+        if outcome['status'] == 'db_error':
+            error_message = "Failed to force update existing document." if force_refresh else "Failed to update existing document."
+            error_embed = create_error_embed("Database Error", error_message, "!wget", url)
+            await processing_msg.edit(embed=error_embed)
+            return
         
+        result = outcome['result']
         processing_time = time.time() - start_time
-        
-        # Create the final summary embed
         summary_embed = create_summary_embed(
-            summary_json=summary_json,
-            url=complete_url,
-            doc_type=file_type,
-            db_id=doc_id,
+            summary_json=outcome['summary_json'],
+            url=result['url'],
+            doc_type=result['file_type'],
+            db_id=result['doc_id'],
             processing_time=processing_time,
-            is_updated=False
+            is_updated=result['is_updated'],
+            is_unchanged=result['is_unchanged']
         )
-        
         await processing_msg.edit(embed=summary_embed)
 
     except (socket.gaierror, requests.exceptions.RequestException) as e:
+        await progress.finish()
         error_embed = create_error_embed("Network Error", str(e), "!wget", url)
         await processing_msg.edit(embed=error_embed)
         print(f'Network error for URL "{url}": {str(e)}')
     except Exception as e:
-        # Catch JSON parsing errors from the summary as well
-        error_message = str(e)
-        if isinstance(e, json.JSONDecodeError):
-            error_message = "Failed to parse AI summary response."
-        
-        error_embed = create_error_embed("Processing Error", error_message, "!wget", url)
+        await progress.finish()
+        error_embed = create_error_embed("Processing Error", describe_error(e), "!wget", url)
         await processing_msg.edit(embed=error_embed)
         import traceback
         print(f'An error occurred while processing {url}: {e}')
         traceback.print_exc()
 
+async def handle_bulk_urls(message, urls, force_refresh, indexer: Indexer, db_manager: DatabaseManager):
+    """Process a reading list concurrently and report every item in one status embed."""
+    start_time = time.time()
+    user_id = str(message.author.id)
+
+    progress_msg = await message.channel.send(embed=create_bulk_status_embed(
+        [{'url': url, 'status': 'pending'} for url in urls], force_refresh=force_refresh))
+    bulk = BulkProgressReporter(progress_msg, urls, force_refresh=force_refresh)
+
+    async def process_item(index, candidate):
+        url, use_arxiv_prompt, url_error = prepare_url(candidate)
+        if url_error:
+            bulk.set(index, status='error', detail=url_error)
+            return
+        try:
+            # Focus text and per-user personalization only make sense for a single document
+            outcome = await resolve_document(
+                url=url,
+                user_id=user_id,
+                focus=None,
+                force_refresh=force_refresh,
+                use_arxiv_prompt=use_arxiv_prompt,
+                indexer=indexer,
+                db_manager=db_manager,
+                progress=bulk.item(index),
+                personalize=False
+            )
+        except Exception as e:
+            print(f'An error occurred while processing {url}: {e}')
+            bulk.set(index, status='error', detail=describe_error(e))
+            return
+
+        if outcome['status'] == 'found':
+            document = outcome['document']
+            bulk.set(index, status='found', title=summary_title(document['summary']), db_id=document['id'], detail=None)
+        elif outcome['status'] == 'db_error':
+            bulk.set(index, status='error', detail="Failed to update existing document.")
+        else:
+            result = outcome['result']
+            bulk.set(index, status='updated' if result['is_updated'] else 'new',
+                     title=summary_title(result['summary_json']), db_id=result['doc_id'],
+                     detail="content unchanged" if result['is_unchanged'] else None)
+
+    # Items are throttled by the shared ingestion queue, so they can all be started at once
+    await asyncio.gather(*(process_item(index, url) for index, url in enumerate(urls)))
+
+    await bulk.finish()
+    bulk.processing_time = time.time() - start_time
+    await progress_msg.edit(embed=bulk.render())
+
+async def resolve_document(url, user_id, focus, force_refresh, use_arxiv_prompt, indexer: Indexer,
+                           db_manager: DatabaseManager, progress=None, personalize=True):
+    """
+    Return a stored document if it is fresh, otherwise ingest it through the shared pipeline.
+
+    ``progress`` is an optional ``ProgressReporter``-like object with ``update`` and ``queued``.
+    With ``personalize`` set, arXiv summaries get this user's "Why You Should Read This" section.
+
+    Returns a dict with ``status``: ``'found'`` with the ``document``, ``'new'`` or ``'updated'``
+    with the ingestion ``result`` and the ``summary_json`` to show, or ``'db_error'``.
+    """
+    # Get user memory for personalization (only for arXiv papers)
+    user_memory = None
+    if use_arxiv_prompt and personalize:
+        user_memory_data = await asyncio.to_thread(db_manager.get_user_memory, user_id)
+        if user_memory_data:
+            user_memory = user_memory_data.get('current_memory_profile')
+    
+    # Look the document up by its canonical key before touching the network,
+    # so a cache hit never pays for a fetch
+    existing_doc = await asyncio.to_thread(db_manager.check_existing_document, url)
+    
+    if existing_doc and not force_refresh and not db_manager.is_document_outdated(existing_doc['timestamp'], days_threshold=7):
+        # Check if we need to add personalization for this user
+        summary_json = existing_doc['summary']
+        if use_arxiv_prompt and user_memory:
+            content_for_personalization = existing_doc.get('content_preview', '') or summary_json
+            summary_json = await personalize_summary(summary_json, content_for_personalization, user_memory)
+        
+        # Create the document dict with potentially personalized summary
+        doc_with_summary = existing_doc.copy()
+        doc_with_summary['summary'] = summary_json
+        return {'status': 'found', 'document': doc_with_summary}
+    
+    # New document, outdated document (older than 7 days) or force refresh: fetch and process.
+    # Concurrent requests for the same document share a single pipeline run, which
+    # waits its turn in the shared worker pool. The focus shapes the summary itself,
+    # so requests with a different focus get their own run.
+    flight_key = (canonicalize_url(url), ' '.join(focus.lower().split()) if focus else None)
+    if progress and _ingestion_flights.in_flight(flight_key):
+        progress.update(stage="Waiting for an identical request already in progress")
+    result, shared = await _ingestion_flights.do(
+        flight_key,
+        lambda: ingestion_queue.submit(
+            user_id,
+            lambda: ingest_document(
+                url=url,
+                existing_doc=existing_doc,
+                force_refresh=force_refresh,
+                focus=focus,
+                use_arxiv_prompt=use_arxiv_prompt,
+                user_memory=user_memory,
+                user_id=user_id,
+                indexer=indexer,
+                db_manager=db_manager,
+                progress=progress.update if progress else None
+            ),
+            on_position=progress.queued if progress else None
+        )
+    )
+    
+    if result['doc_id'] is None:
+        return {'status': 'db_error'}
+    
+    summary_json = result['summary_json']
+    if (shared or result['is_unchanged']) and use_arxiv_prompt and personalize:
+        # The summary was personalized for whoever started the pipeline or first stored it
+        if user_memory:
+            summary_json = await personalize_summary(summary_json, result['content_preview'] or summary_json, user_memory)
+        else:
+            summary_json = strip_personalized_section(summary_json)
+    
+    return {
+        'status': 'updated' if result['is_updated'] else 'new',
+        'result': result,
+        'summary_json': summary_json,
+    }
+
+def describe_error(e):
+    """Short user-facing description of a processing failure."""
+    # Catch JSON parsing errors from the summary as well
+    if isinstance(e, json.JSONDecodeError):
+        return "Failed to parse AI summary response."
+    if isinstance(e, socket.gaierror):
+        return f"Network error: {e}"
+    return str(e) or e.__class__.__name__
+
+def summary_title(summary_json):
+    """Title from a JSON summary, or None for plain-text summaries."""
+    try:
+        return json.loads(summary_json).get('title')
+    except (json.JSONDecodeError, TypeError, AttributeError):
+        return None
+
+async def ingest_document(url, existing_doc, focus, use_arxiv_prompt, user_memory, user_id,
+                          indexer: Indexer, db_manager: DatabaseManager, progress=None, force_refresh=False):
+    """
+    Fetch, summarize, embed and persist a document.
+
+    ``progress(stage)`` is called as the pipeline moves between stages. With
+    ``force_refresh`` the HTTP cache revalidates the page with the server instead of
+    serving a still-fresh copy.
+
+    When refreshing a document whose refetched content hashes the same as what is
+    stored, the stored summary, keywords and embedding are kept and only its timestamps
+    are bumped, unless a new focus was requested.
+    
+    Returns a dict with ``doc_id`` (None if updating the existing row failed), ``url``,
+    ``file_type``, ``summary_json``, ``content_preview``, ``is_updated`` and ``is_unchanged``.
+    """
+    report = progress or (lambda stage: None)
+    
+    # Readers use blocking HTTP clients and HTML/PDF parsers, so run them in a
+    # worker thread to keep the event loop free
+    report("🌐 Fetching content")
+    file_type, content, artifact = await asyncio.to_thread(read_url, url, revalidate=force_refresh)
+    content_hash = compute_content_hash(content)
+    
+    if existing_doc and not focus and existing_doc.get('content_hash') == content_hash:
+        # Same bytes as last time: skip the LLM and keep the stored analysis
+        report("💾 Content unchanged, keeping the stored summary")
+        success = await asyncio.to_thread(db_manager.touch_document, existing_doc['id'], content_hash)
+        return {
+            'doc_id': existing_doc['id'] if success else None,
+            'url': existing_doc['url'],
+            'file_type': existing_doc['type'],
+            'summary_json': existing_doc['summary'],
+            'content_preview': existing_doc.get('content_preview') or '',
+            'is_updated': True,
+            'is_unchanged': True,
+        }
+    
+    file_path, time_now, complete_url = generate_file_path(url, file_type)
+    
+    report("🧠 Summarizing")
+    processed = await process_content(
+        file_type=file_type,
+        file_path=file_path,
+        timestamp=time_now,
+        content=content,
+        url=complete_url,
+        focus=focus,
+        use_arxiv_prompt=use_arxiv_prompt,
+        user_memory=user_memory,
+        artifact=artifact
+    )
+    
+    # Add to legacy indexer
+    report("💾 Saving")
+    await asyncio.to_thread(indexer.index_file, file_path)
+    
+    if existing_doc:
+        # Update the existing document
+        success = await asyncio.to_thread(
+            db_manager.update_document,
+            document_id=existing_doc['id'],
+            summary=processed['summary_json'],
+            keywords=processed['keywords'],
+            embedding=processed['embedding'],
+            content_preview=processed['content_preview'],
+            user_id=user_id,
+            content_hash=content_hash
+        )
+        doc_id = existing_doc['id'] if success else None
+    else:
+        # Document doesn't exist, create new one
+        doc_id = await asyncio.to_thread(
+            db_manager.add_document,
+            url=complete_url,
+            doc_type=file_type,
+            timestamp=time_now,
+            summary=processed['summary_json'],  # Store the JSON string directly
+            file_path=file_path,
+            keywords=processed['keywords'],
+            embedding=processed['embedding'],
+            content_preview=processed['content_preview'],
+            user_id=user_id,
+            content_hash=content_hash
+        )
+    
+    return {
+        'doc_id': doc_id,
+        'url': complete_url,
+        'file_type': file_type,
+        'summary_json': processed['summary_json'],
+        'content_preview': processed['content_preview'],
+        'is_updated': bool(existing_doc),
+        'is_unchanged': False,
+    }
+
+async def personalize_summary(summary_json, document_content, user_memory):
+    """Add a "Why You Should Read This" section for this user to a stored arXiv summary."""
+    try:
+        personalized_text = await generate_personalized_section(document_content, user_memory)
+        
+        if personalized_text:
+            # Parse existing summary and add personalized section
+            try:
+                summary_data = json.loads(summary_json)
+                summary_data['why_you_should_read'] = personalized_text
+                summary_json = json.dumps(summary_data)
+            except (json.JSONDecodeError, TypeError):
+                # If parsing fails, use original summary
+                pass
+    except Exception:
+        # If personalization fails, continue with original summary
+        pass
+    return summary_json
+
+def strip_personalized_section(summary_json):
+    """Remove another user's "Why You Should Read This" section from a summary."""
+    try:
+        summary_data = json.loads(summary_json)
+    except (json.JSONDecodeError, TypeError):
+        return summary_json
+    if summary_data.pop('why_you_should_read', None) is None:
+        return summary_json
+    return json.dumps(summary_data)
+
 def normalize_arxiv_identifier(candidate: str):
     """Return normalized arXiv URL when the input is a bare identifier."""
     if not candidate:
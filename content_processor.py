@@ -1,28 +1,49 @@
 from ai_func import generate_summary, generate_embedding
 from readers.arxiv_reader import download_arxiv_pdf
+from readers.http_client import get_http_client
 from readers.pdf_reader import download_pdf
+from utils.context_packer import pack_sections
+import asyncio
+import hashlib
 import json
 import os
 
-def process_content(file_type, file_path, timestamp, content, url, focus=None, use_arxiv_prompt=False, user_memory=None):
+async def process_content(file_type, file_path, timestamp, content, url, focus=None, use_arxiv_prompt=False, user_memory=None, artifact=None):
     """
     Processes the raw content to generate a structured summary and save all relevant data.
+
+    LLM calls go through the async OpenAI client and the summary and embedding are
+    generated concurrently; file writes run in worker threads so the Discord event loop
+    stays responsive, and PDF archival happens in the background after we return.
+
+    Returns a dict with ``summary_json``, ``keywords``, ``embedding``, ``content_preview``
+    and ``file_path`` that callers persist directly, so the embedding is computed once.
+
+    ``artifact`` is the original file from ``BaseReader.read_document``; it is archived
+    as-is so a PDF the reader already downloaded is not fetched again.
     """
-    summary_json_str = generate_summary(content, summary_type=file_type, focus=focus, use_arxiv_prompt=use_arxiv_prompt, user_memory=user_memory)
-    
+    content_text = get_content_text(content)
+    # arXiv papers are summarized from their most informative sections only; the full
+    # text is still saved, hashed and embedded. Packing tokenizes the whole paper, so it
+    # runs in a worker thread
+    summary_text = await asyncio.to_thread(pack_sections, content_text) if use_arxiv_prompt else content_text
+
+    # The summary and the embedding are independent, so request them concurrently.
     # The summary string is already a JSON, so we can save it directly.
     # No need to call separate keyword extraction.
-    
     # For embedding, we should use the original content for richness,
     # but the summary can be a good, dense alternative if content is too large.
     # Let's stick with content for now.
-    embedding = generate_embedding(content)
+    summary_json_str, embedding = await asyncio.gather(
+        generate_summary(summary_text, summary_type=file_type, focus=focus, use_arxiv_prompt=use_arxiv_prompt, user_memory=user_memory),
+        generate_embedding(content_text) if content_text else _empty_embedding()
+    )
 
     # Attempt to parse the JSON to extract keywords for the database
     try:
         summary_data = json.loads(summary_json_str)
         # Use "suggested_keywords" from the JSON, fall back to an empty list
-        keywords = summary_data.get("suggested_keywords", []) 
+        keywords = summary_data.get("suggested_keywords", [])
     except (json.JSONDecodeError, TypeError):
         summary_data = {}
         keywords = []
@@ -36,25 +57,80 @@ def process_content(file_type, file_path, timestamp, content, url, focus=None, u
         'keywords': keywords,
         'embeddings': embedding,
     }
-    
+
     # Save the processed data to a file
+    await asyncio.to_thread(_write_content_file, file_path, content_dict)
+
+    # Archive the original PDF in the background; the user does not wait for it
+    if file_type in ('arxiv', 'pdf'):
+        _run_in_background(_archive_pdf(file_type, file_path, url, artifact))
+
+    # Append to the legacy index CSV
+    await asyncio.to_thread(_append_legacy_index, file_type, timestamp, file_path)
+
+    return {
+        'summary_json': summary_json_str,
+        'keywords': keywords,
+        'embedding': embedding,
+        'content_preview': content_text[:500],
+        'file_path': file_path,
+    }
+
+# Strong references to fire-and-forget tasks so they are not garbage collected mid-flight
+_background_tasks = set()
+
+def _run_in_background(coro):
+    task = asyncio.ensure_future(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+async def _empty_embedding():
+    return []
+
+async def _archive_pdf(file_type, file_path, url, artifact=None):
+    pdf_file_name = file_path.replace('.json', '.pdf')
+    try:
+        if artifact:
+            # Persist what the reader fetched, or fetch the deferred artifact once now
+            data = artifact.get('data')
+            if data is None:
+                data = await asyncio.to_thread(_fetch_artifact, artifact['url'])
+            local_file_path = os.path.join(os.path.dirname(pdf_file_name), artifact['filename'])
+            await asyncio.to_thread(_write_bytes, local_file_path, data)
+            print(f"PDF archived to: {local_file_path}")
+        # Special handling for arxiv PDFs
+        elif file_type == 'arxiv':
+            await asyncio.to_thread(download_arxiv_pdf, url, os.path.dirname(pdf_file_name))
+        # Special handling for direct PDF downloads
+        elif file_type == 'pdf':
+            await asyncio.to_thread(download_pdf, url, os.path.dirname(pdf_file_name))
+    except Exception as e:
+        print(f"Failed to archive PDF for {url}: {e}")
+
+def get_content_text(content):
+    """Flatten reader output (plain text or a dict for complex content) into text."""
+    if isinstance(content, dict):
+        return content.get('content', str(content))
+    return content if isinstance(content, str) else str(content)
+
+def compute_content_hash(content):
+    """SHA-256 of the flattened reader output, used to detect unchanged refetches."""
+    return hashlib.sha256(get_content_text(content).encode('utf-8', errors='replace')).hexdigest()
+
+def _fetch_artifact(url):
+    response = get_http_client().get(url)
+    response.raise_for_status()
+    return response.content
+
+def _write_bytes(path, data):
+    with open(path, 'wb') as f:
+        f.write(data)
+
+def _write_content_file(file_path, content_dict):
     with open(file_path, 'w', encoding='utf-8') as file:
         json.dump(content_dict, file, indent=4, ensure_ascii=False)
 
-    # Special handling for arxiv PDFs
-    if file_type == 'arxiv':
-        pdf_file_name = file_path.replace('.json', '.pdf')
-        download_arxiv_pdf(url, os.path.dirname(pdf_file_name))
-    
-    # Special handling for direct PDF downloads
-    elif file_type == 'pdf':
-        pdf_file_name = file_path.replace('.json', '.pdf')
-        download_pdf(url, os.path.dirname(pdf_file_name))
-    
-    # Append to the legacy index CSV
+def _append_legacy_index(file_type, timestamp, file_path):
     with open('saved_text/index.csv', 'a') as index_file:
         index_file.write(f'{file_type},{timestamp},{file_path}\n')
-        
-    # Return the JSON string and the extracted keywords
-    return summary_json_str, keywords
-
@@ -1,17 +1,113 @@
 import sqlite3
 import json
 import os
+import threading
+import re
 import time
 from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
+from utils.url_utils import canonicalize_url
+from vector_index import VectorIndex, HnswIndex
+
+# Embeddings are stored as packed little-endian float32 BLOBs (6 KB for 1536 dimensions)
+EMBEDDING_DTYPE = np.dtype('<f4')
+
+def encode_embedding(embedding) -> bytes:
+    """Pack an embedding (list or array of floats) into the BLOB stored in embeddings.embedding_vector."""
+    return np.asarray(embedding, dtype=EMBEDDING_DTYPE).tobytes()
+
+# One documents_fts row, built from a documents row aliased {doc}: the summary's title, its
+# other JSON values as text (the raw JSON if it is not valid JSON), the keywords and the
+# stored content preview
+_FTS_ROW_SQL = '''
+    {doc}.id,
+    CASE WHEN json_valid({doc}.summary) THEN json_extract({doc}.summary, '$.title') END,
+    CASE WHEN json_valid({doc}.summary)
+         THEN (SELECT group_concat(value, ' ') FROM json_each({doc}.summary) WHERE key IS NOT 'title')
+         ELSE {doc}.summary END,
+    (SELECT group_concat(keyword, ' ') FROM keywords WHERE document_id = {doc}.id),
+    {doc}.content_preview
+'''
+
+# bm25() column weights for title, summary, keywords, content
+_FTS_WEIGHTS = '10.0, 2.0, 5.0, 1.0'
+
+def fts_query(text: str) -> str:
+    """
+    Turn free text into a safe FTS5 query: every word must match, as a prefix.
+
+    Words are quoted, so FTS5 syntax in user input (quotes, AND/OR/NOT, column filters,
+    parentheses) is searched for literally instead of raising a syntax error.
+    """
+    return ' '.join(f'"{word}"*' for word in re.findall(r'\w+', text))
+
+# Chinese, Japanese and Korean scripts. unicode61 indexes a run of these as one token,
+# so a query for part of a run cannot match through FTS
+_CJK_RE = re.compile(r'[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff]')
+
+def decode_embedding(value) -> np.ndarray:
+    """Read-only float32 view of a stored embedding; JSON text from old rows is also accepted."""
+    if isinstance(value, str):
+        return np.asarray(json.loads(value), dtype=EMBEDDING_DTYPE)
+    return np.frombuffer(value, dtype=EMBEDDING_DTYPE)
 
 class DatabaseManager:
-    def __init__(self, db_path: str = "discord_bot.db"):
+    """
+    SQLite access for documents, keywords, embeddings and user profiles.
+
+    Each thread gets its own long-lived connection, opened on first use and tuned with
+    the pragmas below. The database runs in WAL mode, so readers (searches on the event
+    loop, other worker threads) never wait for the ingestion writer and vice versa.
+    Share one instance per database file, see ``get_database_manager``.
+
+    Embeddings are also held in a vector index for ``semantic_search``: the exact NumPy
+    index by default, or an HNSW index for large libraries (``vector_backend='hnsw'`` or
+    ``VECTOR_INDEX_BACKEND=hnsw``, needs hnswlib).
+    """
+
+    def __init__(self, db_path: str = "discord_bot.db", cache_size_kb: int = 32 * 1024,
+                 mmap_size: int = 256 * 1024 * 1024, busy_timeout: float = 10.0,
+                 vector_backend: str = None):
         self.db_path = db_path
+        # 'exact' (NumPy, rebuilt from the database on start) or 'hnsw' (approximate,
+        # persisted next to the database); see vector_index.py
+        self.vector_backend = vector_backend or os.environ.get('VECTOR_INDEX_BACKEND', 'exact')
+        self.cache_size_kb = cache_size_kb
+        self.mmap_size = mmap_size
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        self._vector_index = None
+        self._vector_index_lock = threading.Lock()
         self.init_database()
     
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Return this thread's connection, opening it on first use.
+
+        Use it as ``with self._connect() as conn:`` so the block commits on success and
+        rolls back on error; the connection itself stays open until ``close``.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # check_same_thread=False only so close() can close every thread's connection;
+            # each connection is still used by the thread that opened it
+            conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout, check_same_thread=False)
+            conn.execute('PRAGMA synchronous = NORMAL')  # Safe with WAL; fsyncs at checkpoints only
+            conn.execute(f'PRAGMA cache_size = -{int(self.cache_size_kb)}')
+            conn.execute(f'PRAGMA mmap_size = {int(self.mmap_size)}')
+            conn.execute('PRAGMA temp_store = MEMORY')
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+    
     def init_database(self):
         """Initialize the database with required tables."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
+            # WAL is persistent in the database file, so setting it once is enough
+            conn.execute('PRAGMA journal_mode = WAL')
             cursor = conn.cursor()
             
             # Create documents table
@@ -26,7 +122,9 @@ class DatabaseManager:
                     content_preview TEXT,
                     user_id TEXT,
                     created_at DATETIME,
-                    updated_at DATETIME
+                    updated_at DATETIME,
+                    canonical_url TEXT,
+                    content_hash TEXT
                 )
             ''')
             
@@ -46,6 +144,22 @@ class DatabaseManager:
             except sqlite3.OperationalError:
                 pass  # Column already exists
             
+            try:
+                cursor.execute('ALTER TABLE documents ADD COLUMN canonical_url TEXT')
+            except sqlite3.OperationalError:
+                pass  # Column already exists
+            
+            try:
+                cursor.execute('ALTER TABLE documents ADD COLUMN content_hash TEXT')
+            except sqlite3.OperationalError:
+                pass  # Column already exists
+            
+            # Backfill canonical keys for rows created before the column existed
+            cursor.execute('SELECT id, url FROM documents WHERE canonical_url IS NULL')
+            missing_keys = [(canonicalize_url(url), doc_id) for doc_id, url in cursor.fetchall()]
+            if missing_keys:
+                cursor.executemany('UPDATE documents SET canonical_url = ? WHERE id = ?', missing_keys)
+            
             # Create keywords table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS keywords (
@@ -62,7 +176,7 @@ class DatabaseManager:
                 CREATE TABLE IF NOT EXISTS embeddings (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     document_id INTEGER NOT NULL,
-                    embedding_vector TEXT NOT NULL,
+                    embedding_vector BLOB NOT NULL,
                     FOREIGN KEY (document_id) REFERENCES documents (id) ON DELETE CASCADE
                 )
             ''')
@@ -80,6 +194,8 @@ class DatabaseManager:
             
             # Create indexes for better performance
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_documents_url ON documents(url)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_embeddings_document_id ON embeddings(document_id)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_documents_canonical_url ON documents(canonical_url)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_documents_type ON documents(type)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_documents_timestamp ON documents(timestamp)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_documents_user_id ON documents(user_id)')
@@ -89,18 +205,102 @@ class DatabaseManager:
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_profiles_user_id ON user_profiles(user_id)')
             
             conn.commit()
+            
+            converted = self._migrate_embeddings_to_blobs(cursor)
+            self.fts_enabled = self._init_fulltext(cursor)
+        
+        if converted:
+            # Reclaim the space the JSON text took; VACUUM cannot run inside a transaction
+            self._connect().execute('VACUUM')
+            print(f"Converted {converted} embeddings from JSON text to float32 blobs")
+    
+    def _init_fulltext(self, cursor) -> bool:
+        """
+        Create the documents_fts full-text index and the triggers that keep it in sync.
+        
+        Documents are indexed on insert and re-indexed when their summary or content
+        changes or their keywords are replaced. Existing documents are backfilled when
+        the index is first created. Returns False if SQLite was built without FTS5.
+        """
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'documents_fts'")
+        exists = cursor.fetchone() is not None
+        try:
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts
+                USING fts5(title, summary, keywords, content, tokenize = 'porter unicode61')
+            ''')
+        except sqlite3.OperationalError as e:
+            print(f"Full-text search unavailable, falling back to LIKE queries: {e}")
+            return False
+        
+        new_row = _FTS_ROW_SQL.format(doc='new')
+        cursor.executescript(f'''
+            CREATE TRIGGER IF NOT EXISTS documents_fts_insert AFTER INSERT ON documents BEGIN
+                INSERT INTO documents_fts (rowid, title, summary, keywords, content) SELECT {new_row};
+            END;
+            CREATE TRIGGER IF NOT EXISTS documents_fts_update AFTER UPDATE OF summary, content_preview ON documents BEGIN
+                DELETE FROM documents_fts WHERE rowid = old.id;
+                INSERT INTO documents_fts (rowid, title, summary, keywords, content) SELECT {new_row};
+            END;
+            CREATE TRIGGER IF NOT EXISTS documents_fts_delete AFTER DELETE ON documents BEGIN
+                DELETE FROM documents_fts WHERE rowid = old.id;
+            END;
+            CREATE TRIGGER IF NOT EXISTS keywords_fts_insert AFTER INSERT ON keywords BEGIN
+                UPDATE documents_fts
+                SET keywords = (SELECT group_concat(keyword, ' ') FROM keywords WHERE document_id = new.document_id)
+                WHERE rowid = new.document_id;
+            END;
+            CREATE TRIGGER IF NOT EXISTS keywords_fts_delete AFTER DELETE ON keywords BEGIN
+                UPDATE documents_fts
+                SET keywords = (SELECT group_concat(keyword, ' ') FROM keywords WHERE document_id = old.document_id)
+                WHERE rowid = old.document_id;
+            END;
+        ''')
+        
+        if not exists:
+            cursor.execute(f'''
+                INSERT INTO documents_fts (rowid, title, summary, keywords, content)
+                SELECT {_FTS_ROW_SQL.format(doc='d')} FROM documents d
+            ''')
+            if cursor.rowcount > 0:
+                print(f"Built full-text index for {cursor.rowcount} documents")
+        return True
+    
+    def _migrate_embeddings_to_blobs(self, cursor, batch_size: int = 500) -> int:
+        """
+        Rewrite embeddings stored as JSON text (before float32 blobs) in place.
+        
+        Tables created before the change declare the column TEXT; SQLite keeps BLOB values
+        as-is in a TEXT column, so only the rows need converting, not the table.
+        """
+        cursor.execute("SELECT id FROM embeddings WHERE typeof(embedding_vector) = 'text'")
+        ids = [row[0] for row in cursor.fetchall()]
+        for start in range(0, len(ids), batch_size):
+            batch = ids[start:start + batch_size]
+            placeholders = ','.join('?' * len(batch))
+            cursor.execute(f'SELECT id, embedding_vector FROM embeddings WHERE id IN ({placeholders})', batch)
+            cursor.executemany('UPDATE embeddings SET embedding_vector = ? WHERE id = ?',
+                               [(encode_embedding(json.loads(vector)), row_id) for row_id, vector in cursor.fetchall()])
+        return len(ids)
     
     def check_existing_document(self, url: str) -> Optional[Dict[str, Any]]:
-        """Check if a document already exists and return its info if found."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        """
+        Check if a document already exists and return its info if found.
+        
+        The lookup goes through the canonical document key, so any URL form of the
+        same document (http/https, www, trailing slash, arXiv abs/pdf/html, ...) hits.
+        """
+        with self._connect() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
             
             cursor.execute('''
-                SELECT id, url, type, timestamp, summary, user_id, updated_at
+                SELECT id, url, type, timestamp, summary, user_id, updated_at, content_preview, content_hash
                 FROM documents
-                WHERE url = ?
-            ''', (url,))
+                WHERE canonical_url = ? OR url = ?
+                ORDER BY (url = ?) DESC, updated_at DESC
+                LIMIT 1
+            ''', (canonicalize_url(url), url, url))
             
             row = cursor.fetchone()
             if row:
@@ -115,17 +315,21 @@ class DatabaseManager:
     
     def add_document(self, url: str, doc_type: str, timestamp: float, summary: str, 
                     file_path: str, keywords: List[str], embedding: List[float], 
-                    content_preview: str = None, user_id: str = None) -> int:
+                    content_preview: str = None, user_id: str = None, content_hash: str = None) -> int:
         """Add a new document or update existing one and return its ID."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             
             current_time = time.time()
             current_datetime = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(current_time))
+            canonical_url = canonicalize_url(url)
             
-            # Check if document already exists
+            # Check if document already exists (exact URL first, then any equivalent URL)
             cursor.execute('SELECT id, created_at FROM documents WHERE url = ?', (url,))
             existing = cursor.fetchone()
+            if not existing:
+                cursor.execute('SELECT id, created_at FROM documents WHERE canonical_url = ? LIMIT 1', (canonical_url,))
+                existing = cursor.fetchone()
             
             if existing:
                 # Update existing document
@@ -133,17 +337,17 @@ class DatabaseManager:
                 cursor.execute('''
                     UPDATE documents 
                     SET type = ?, timestamp = ?, summary = ?, file_path = ?, 
-                        content_preview = ?, user_id = ?, updated_at = ?
+                        content_preview = ?, user_id = ?, updated_at = ?, canonical_url = ?, content_hash = ?
                     WHERE id = ?
-                ''', (doc_type, timestamp, summary, file_path, content_preview, user_id, current_datetime, doc_id))
+                ''', (doc_type, timestamp, summary, file_path, content_preview, user_id, current_datetime, canonical_url, content_hash, doc_id))
                 document_id = doc_id
             else:
                 # Insert new document
                 cursor.execute('''
                     INSERT INTO documents 
-                    (url, type, timestamp, summary, file_path, content_preview, user_id, created_at, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (url, doc_type, timestamp, summary, file_path, content_preview, user_id, current_datetime, current_datetime))
+                    (url, type, timestamp, summary, file_path, content_preview, user_id, created_at, updated_at, canonical_url, content_hash)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (url, doc_type, timestamp, summary, file_path, content_preview, user_id, current_datetime, current_datetime, canonical_url, content_hash))
                 document_id = cursor.lastrowid
             
             # Clear existing keywords for this document
@@ -160,21 +364,23 @@ class DatabaseManager:
             cursor.execute('DELETE FROM embeddings WHERE document_id = ?', (document_id,))
             
             # Insert embedding
+            embedding_version = None
             if embedding:
-                embedding_json = json.dumps(embedding)
                 cursor.execute('''
                     INSERT INTO embeddings (document_id, embedding_vector)
                     VALUES (?, ?)
-                ''', (document_id, embedding_json))
+                ''', (document_id, encode_embedding(embedding)))
+                embedding_version = cursor.lastrowid
             
             conn.commit()
+            self._index_embedding(document_id, embedding, user_id, doc_type, embedding_version)
             return document_id
     
     def update_document(self, document_id: int, summary: str, keywords: List[str], 
                        embedding: List[float], content_preview: str = None, 
-                       user_id: str = None) -> bool:
+                       user_id: str = None, content_hash: str = None) -> bool:
         """Update an existing document with new summary, keywords, and embedding."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             
             current_time = time.time()
@@ -183,9 +389,9 @@ class DatabaseManager:
             # Update document
             cursor.execute('''
                 UPDATE documents 
-                SET summary = ?, content_preview = ?, user_id = ?, updated_at = ?
+                SET summary = ?, content_preview = ?, user_id = ?, updated_at = ?, timestamp = ?, content_hash = ?
                 WHERE id = ?
-            ''', (summary, content_preview, user_id, current_datetime, document_id))
+            ''', (summary, content_preview, user_id, current_datetime, current_time, content_hash, document_id))
             
             if cursor.rowcount == 0:
                 return False  # Document not found
@@ -200,21 +406,52 @@ class DatabaseManager:
             
             # Clear and re-insert embedding
             cursor.execute('DELETE FROM embeddings WHERE document_id = ?', (document_id,))
+            embedding_version = None
             if embedding:
-                embedding_json = json.dumps(embedding)
                 cursor.execute('''
                     INSERT INTO embeddings (document_id, embedding_vector)
                     VALUES (?, ?)
-                ''', (document_id, embedding_json))
+                ''', (document_id, encode_embedding(embedding)))
+                embedding_version = cursor.lastrowid
+            
+            cursor.execute('SELECT type FROM documents WHERE id = ?', (document_id,))
+            doc_type = cursor.fetchone()[0]
             
             conn.commit()
+            self._index_embedding(document_id, embedding, user_id, doc_type, embedding_version)
             return True
     
-    def get_document_by_id(self, document_id: int, user_id: str = None) -> Optional[Dict[str, Any]]:
-        """Get a document by its ID, optionally filtered by user_id."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+    def touch_document(self, document_id: int, content_hash: str = None) -> bool:
+        """
+        Mark a document as refreshed without changing its summary, keywords or embedding.
+        
+        Used when refetched content hashes the same as the stored content.
+        """
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            
+            current_time = time.time()
+            current_datetime = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(current_time))
+            
+            cursor.execute('''
+                UPDATE documents
+                SET timestamp = ?, updated_at = ?, content_hash = COALESCE(?, content_hash)
+                WHERE id = ?
+            ''', (current_time, current_datetime, content_hash, document_id))
+            
+            conn.commit()
+            return cursor.rowcount > 0
+    
+    def get_document_by_id(self, document_id: int, user_id: str = None,
+                           include_embedding: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Get a document by its ID, optionally filtered by user_id.
+        
+        With ``include_embedding``, the float32 embedding is added as ``embeddings``.
+        """
+        with self._connect() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
             
             if user_id:
                 cursor.execute('''
@@ -237,23 +474,125 @@ class DatabaseManager:
             ''', (document_id,))
             document['keywords'] = [row[0] for row in cursor.fetchall()]
             
-            # Get embedding
-            cursor.execute('''
-                SELECT embedding_vector FROM embeddings WHERE document_id = ?
-            ''', (document_id,))
-            embedding_row = cursor.fetchone()
-            if embedding_row:
-                document['embeddings'] = json.loads(embedding_row[0])
-            else:
-                document['embeddings'] = []
+            # The embedding is only loaded for callers that ask for it
+            if include_embedding:
+                document['embeddings'] = self.get_embedding(document_id)
             
             return document
     
+    def get_vector_index(self):
+        """
+        Return the vector index of all embeddings, loading it on first use.
+        
+        Afterwards add_document/update_document keep it current, so it is never reloaded.
+        """
+        if self._vector_index is None:
+            with self._vector_index_lock:
+                if self._vector_index is None:
+                    self._vector_index = self._load_vector_index()
+        return self._vector_index
+    
+    def _load_vector_index(self):
+        start = time.perf_counter()
+        skipped = 0
+        if self.vector_backend == 'hnsw':
+            index = HnswIndex(path=f'{self.db_path}.hnsw')
+            index.load()
+            # Bring the saved index up to date: (re)index embeddings whose row id differs
+            # from the indexed version and drop documents whose embedding is gone
+            indexed = index.versions()
+            with self._connect() as conn:
+                stored = dict(conn.execute('SELECT document_id, id FROM embeddings').fetchall())
+            for document_id in indexed.keys() - stored.keys():
+                index.remove(document_id)
+            stale = [document_id for document_id, version in stored.items() if indexed.get(document_id) != version]
+        elif self.vector_backend == 'exact':
+            index = VectorIndex()
+            stale = None
+        else:
+            raise ValueError(f"Unknown vector index backend: {self.vector_backend}")
+        
+        for document_id, user_id, doc_type, vector, version in self._iter_embedding_rows(stale):
+            try:
+                index.upsert(document_id, decode_embedding(vector), user_id, doc_type, version)
+            except ValueError:
+                skipped += 1  # Embedding from a different model (dimension mismatch)
+        print(f"Vector index ({self.vector_backend}) loaded: {len(index)} embeddings in "
+              f"{time.perf_counter() - start:.2f}s" + (f", {skipped} skipped" if skipped else ""))
+        return index
+    
+    def _iter_embedding_rows(self, document_ids: List[int] = None, batch_size: int = 500):
+        """Yield (document_id, user_id, type, embedding blob, embedding row id) for all or the given documents."""
+        query = '''
+            SELECT e.document_id, d.user_id, d.type, e.embedding_vector, e.id
+            FROM embeddings e
+            JOIN documents d ON d.id = e.document_id
+        '''
+        with self._connect() as conn:
+            if document_ids is None:
+                yield from conn.execute(query)
+                return
+            for start in range(0, len(document_ids), batch_size):
+                batch = document_ids[start:start + batch_size]
+                yield from conn.execute(f"{query} WHERE e.document_id IN ({','.join('?' * len(batch))})", batch).fetchall()
+    
+    def _index_embedding(self, document_id: int, embedding, user_id: str, doc_type: str, version: int = None):
+        """Apply a committed embedding change to the vector index; ``version`` is None when it was removed."""
+        # Held while the index loads, so a document committed mid-load is not missed
+        with self._vector_index_lock:
+            index = self._vector_index
+            if index is None:
+                return
+            try:
+                if version is not None:
+                    index.upsert(document_id, embedding, user_id, doc_type, version)
+                else:
+                    index.remove(document_id)
+            except ValueError as e:
+                print(f"Not indexing embedding: {e}")
+            if isinstance(index, HnswIndex) and index.needs_rebuild():
+                index.start_rebuild(lambda: ((row[0], decode_embedding(row[3])) for row in self._iter_embedding_rows()))
+    
+    def semantic_search(self, query_embedding, limit: int = 5, user_id: str = None, doc_type: str = None,
+                        exclude_ids: List[int] = None) -> List[Dict[str, Any]]:
+        """
+        Find the documents whose embeddings are most similar to ``query_embedding``.
+        
+        Returns documents (id, url, type, timestamp, summary, user_id) with their cosine
+        ``similarity``, most similar first, optionally restricted to a user and/or type.
+        """
+        matches = self.get_vector_index().search(query_embedding, k=limit, user_id=user_id,
+                                                 doc_type=doc_type, exclude_ids=exclude_ids or ())
+        if not matches:
+            return []
+        similarities = dict(matches)
+        placeholders = ','.join('?' * len(matches))
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
+            cursor.execute(f'''
+                SELECT id, url, type, timestamp, summary, user_id
+                FROM documents
+                WHERE id IN ({placeholders})
+            ''', list(similarities))
+            documents = [dict(row) for row in cursor.fetchall()]
+        for document in documents:
+            document['similarity'] = similarities[document['id']]
+        documents.sort(key=lambda document: document['similarity'], reverse=True)
+        return documents
+    
+    def get_embedding(self, document_id: int) -> Optional[np.ndarray]:
+        """Return a document's embedding as a float32 array, or None if it has none."""
+        with self._connect() as conn:
+            row = conn.execute('SELECT embedding_vector FROM embeddings WHERE document_id = ?',
+                               (document_id,)).fetchone()
+        return decode_embedding(row[0]) if row else None
+    
     def search_by_url(self, pattern: str, user_id: str = None) -> List[Dict[str, Any]]:
         """Search documents by URL pattern, optionally filtered by user."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._connect() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
             
             if user_id:
                 cursor.execute('''
@@ -274,9 +613,9 @@ class DatabaseManager:
 
     def search_by_keyword(self, keyword: str, user_id: str = None) -> List[Dict[str, Any]]:
         """Search documents by keyword, optionally filtered by user."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._connect() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
             
             if user_id:
                 cursor.execute('''
@@ -309,11 +648,72 @@ class DatabaseManager:
             
             return results
     
+    def search_text(self, query: str, user_id: str = None, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Full-text search over titles, summaries, keywords and content, optionally filtered by user.
+        
+        Results are ranked by BM25 (best first, ``rank`` ascending) and carry a ``snippet``
+        with the matched words in bold, plus the document's ``keywords``. Falls back to
+        substring matching if SQLite has no FTS5, or if the query contains CJK characters
+        (those documents are not split into words, so only a substring match finds them).
+        
+        Each result's ``match`` is ``'fulltext'`` or ``'substring'``. Substring matches have
+        no relevance score: their ``rank`` is None and they come most recent first.
+        """
+        match = fts_query(query)
+        if not match:
+            return []
+        user_filter = "AND d.user_id = ?" if user_id else ""
+        user_params = [user_id] if user_id else []
+        
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
+            
+            if self.fts_enabled and not _CJK_RE.search(query):
+                cursor.execute(f'''
+                    SELECT d.id, d.url, d.type, d.timestamp, d.summary, d.user_id, d.updated_at,
+                           snippet(documents_fts, -1, '**', '**', '…', 16) AS snippet,
+                           bm25(documents_fts, {_FTS_WEIGHTS}) AS rank, 'fulltext' AS match
+                    FROM documents_fts
+                    JOIN documents d ON d.id = documents_fts.rowid
+                    WHERE documents_fts MATCH ? {user_filter}
+                    ORDER BY rank
+                    LIMIT ?
+                ''', [match, *user_params, limit])
+            else:
+                pattern = f'%{query}%'
+                cursor.execute(f'''
+                    SELECT d.id, d.url, d.type, d.timestamp, d.summary, d.user_id, d.updated_at,
+                           substr(COALESCE(d.content_preview, ''), 1, 200) AS snippet, NULL AS rank,
+                           'substring' AS match
+                    FROM documents d
+                    WHERE (d.summary LIKE ? OR d.content_preview LIKE ?
+                           OR d.id IN (SELECT document_id FROM keywords WHERE keyword LIKE ?)) {user_filter}
+                    ORDER BY d.updated_at DESC
+                    LIMIT ?
+                ''', [pattern, pattern, pattern, *user_params, limit])
+            results = [dict(row) for row in cursor.fetchall()]
+            
+            # Keywords of all results in one query
+            keywords = {result['id']: [] for result in results}
+            if keywords:
+                cursor.execute(f'''
+                    SELECT document_id, keyword FROM keywords
+                    WHERE document_id IN ({','.join('?' * len(keywords))})
+                ''', list(keywords))
+                for row in cursor.fetchall():
+                    keywords[row[0]].append(row[1])
+            for result in results:
+                result['keywords'] = keywords[result['id']]
+            
+            return results
+    
     def get_user_documents(self, user_id: str) -> List[Dict[str, Any]]:
         """Get all documents for a specific user."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._connect() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
             
             cursor.execute('''
                 SELECT id, url, type, timestamp, summary, user_id, updated_at
@@ -338,9 +738,9 @@ class DatabaseManager:
     
     def get_documents_by_type(self, doc_type: str, user_id: str = None) -> List[Dict[str, Any]]:
         """Get all documents of a specific type, optionally filtered by user."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._connect() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
             
             if user_id:
                 cursor.execute('''
@@ -361,7 +761,7 @@ class DatabaseManager:
     
     def get_stats(self, user_id: str = None) -> Dict[str, Any]:
         """Get database statistics, optionally filtered by user."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             
             user_filter = "WHERE user_id = ?" if user_id else ""
@@ -447,9 +847,9 @@ class DatabaseManager:
     
     def get_related_documents(self, document_id: int, limit: int = 5, user_id: str = None) -> List[Dict[str, Any]]:
         """Get documents related to the given document based on shared keywords, optionally filtered by user."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._connect() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
             
             user_filter = "AND d.user_id = ?" if user_id else ""
             user_params = (document_id, document_id, user_id, limit) if user_id else (document_id, document_id, limit)
@@ -470,7 +870,7 @@ class DatabaseManager:
     
     def set_user_memory(self, user_id: str, memory_profile: str, raw_memory: str) -> bool:
         """Creates or updates a user's memory profile."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             
             current_datetime = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(time.time()))
@@ -522,9 +922,9 @@ class DatabaseManager:
     
     def get_user_memory(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Retrieves a user's memory profile."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._connect() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
             
             cursor.execute('''
                 SELECT user_id, current_memory_profile, raw_memories, created_at, updated_at
@@ -545,7 +945,7 @@ class DatabaseManager:
     
     def clear_user_memory(self, user_id: str) -> bool:
         """Clears a user's memory profile."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             
             cursor.execute('DELETE FROM user_profiles WHERE user_id = ?', (user_id,))
@@ -554,9 +954,9 @@ class DatabaseManager:
     
     def get_recent_documents(self, limit: int = 10, user_id: str = None) -> List[Dict[str, Any]]:
         """Get recent documents, optionally filtered by user."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._connect() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
             
             if user_id:
                 cursor.execute('''
@@ -617,5 +1017,25 @@ class DatabaseManager:
                     print(f"Error migrating {line}: {e}")
     
     def close(self):
-        """Close database connection (placeholder for future connection pooling)."""
-        pass
+        """Save a persistent vector index and close every thread's connection. The manager reopens connections if used again."""
+        if isinstance(self._vector_index, HnswIndex):
+            self._vector_index.save()
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                print(f"Error closing database connection: {e}")
+        # A fresh thread-local drops every thread's reference to its closed connection
+        self._local = threading.local()
+
+_shared_managers = {}
+_shared_managers_lock = threading.Lock()
+
+def get_database_manager(db_path: str = "discord_bot.db") -> DatabaseManager:
+    """Return the process-wide manager for ``db_path``, creating it on first use."""
+    with _shared_managers_lock:
+        if db_path not in _shared_managers:
+            _shared_managers[db_path] = DatabaseManager(db_path)
+        return _shared_managers[db_path]
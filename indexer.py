@@ -3,18 +3,20 @@ import json
 import glob
 import re
 from datetime import datetime
-from database_manager import DatabaseManager
+from database_manager import DatabaseManager, get_database_manager
 
 class Indexer:
-    def __init__(self, db_path: str = "discord_bot.db", auto_migrate: bool = False):
+    def __init__(self, db_path: str = "discord_bot.db", auto_migrate: bool = False,
+                 db_manager: DatabaseManager = None):
         """
         Initialize the indexer with a SQLite database path.
         
         Args:
             db_path (str): Path to the SQLite database file
             auto_migrate (bool): Whether to automatically migrate existing CSV data to database
+            db_manager (DatabaseManager): Manager to use; defaults to the shared one for db_path
         """
-        self.db_manager = DatabaseManager(db_path)
+        self.db_manager = db_manager or get_database_manager(db_path)
         # Migrate data from old CSV system if it exists and auto_migrate is enabled
         if auto_migrate:
             self._migrate_existing_data()
@@ -126,20 +128,19 @@ class Indexer:
         """
         return self.db_manager.search_by_keyword(keyword)[:limit]
     
-    def search_by_text(self, query, limit=10):
+    def search_by_text(self, query, limit=10, user_id=None):
         """
         Search for documents containing the specified text in content or summary.
         
         Args:
             query (str): Text to search for
             limit (int): Maximum number of results to return
+            user_id (str): Only search this user's documents, if given
             
         Returns:
-            list: List of dictionaries containing document information
+            list: List of dictionaries containing document information, best match first
         """
-        # For now, use keyword search as a fallback for text search
-        # In the future, this could be enhanced with full-text search
-        return self.search_by_keyword(query, limit)
+        return self.db_manager.search_text(query, user_id=user_id, limit=limit)
     
     def get_document_by_id(self, document_id):
         """
@@ -1,75 +1,93 @@
+import asyncio
 import discord
 import os
-from indexer import Indexer
-from database_manager import DatabaseManager
-
-from commands.index_handler import handle_index
-from commands.search_handler import handle_search
-from commands.keyword_search_handler import handle_keyword_search
-from commands.related_handler import handle_related
-from commands.stats_handler import handle_stats
-from commands.wget_handler import handle_wget
-from commands.tail_handler import handle_tail
-from commands.migrate_handler import handle_migrate
-from commands.whoami_handler import handle_whoami
-from commands.mem_handler import handle_mem
-
-# Initialize Discord client
-intents = discord.Intents.default()
-intents.members = True
-discord_token = os.environ['DISCORD_TOKEN']
-client = discord.Client(intents=intents)
 
 # Configuration options
 AUTO_MIGRATE_EXISTING_DATA = False  # Set to True to automatically migrate CSV data to database on startup
+INGESTION_WORKERS = 4  # Number of URLs fetched and summarized concurrently; extra requests queue fairly per user
+
+# Everything below is set up in main(), not at import time: PDF extraction workers are
+# started with forkserver/spawn, which import this module again in each worker process,
+# and they must not open the database or connect to Discord and OpenAI
+
+def create_client(indexer, db_manager):
+    """Build the Discord client and register its event handlers."""
+    from commands.index_handler import handle_index
+    from commands.search_handler import handle_search
+    from commands.keyword_search_handler import handle_keyword_search
+    from commands.related_handler import handle_related
+    from commands.stats_handler import handle_stats
+    from commands.wget_handler import handle_wget
+    from commands.tail_handler import handle_tail
+    from commands.migrate_handler import handle_migrate
+    from commands.whoami_handler import handle_whoami
+    from commands.mem_handler import handle_mem
+    from utils.url_utils import extract_urls
 
-# Initialize the indexer and database manager
-indexer = Indexer(auto_migrate=AUTO_MIGRATE_EXISTING_DATA)
-db_manager = DatabaseManager()
+    # Initialize Discord client
+    intents = discord.Intents.default()
+    intents.members = True
+    client = discord.Client(intents=intents)
 
-# Command dispatcher
-COMMANDS = {
-    '!index': handle_index,
-    '!grep': handle_search,
-    '!egrep': handle_keyword_search,
-    '!related': handle_related,
-    '!stats': handle_stats,
-    '!wget': handle_wget,
-    '!tail': handle_tail,
-    '!migrate': handle_migrate,
-    '!whoami': handle_whoami,
-    '!mem': handle_mem,
-}
+    # Command dispatcher
+    commands = {
+        '!index': handle_index,
+        '!grep': handle_search,
+        '!egrep': handle_keyword_search,
+        '!related': handle_related,
+        '!stats': handle_stats,
+        '!wget': handle_wget,
+        '!tail': handle_tail,
+        '!migrate': handle_migrate,
+        '!whoami': handle_whoami,
+        '!mem': handle_mem,
+    }
 
-@client.event
-async def on_ready():
-    print('Logged in as {0.user}'.format(client))
-    print('Indexer initialized')
-    print('Database manager initialized')
-    print(f'Auto-migration of existing data: {"ENABLED" if AUTO_MIGRATE_EXISTING_DATA else "DISABLED"}')
-    if not AUTO_MIGRATE_EXISTING_DATA:
-        print('To enable auto-migration, set AUTO_MIGRATE_EXISTING_DATA = True in my_bot.py')
-        print('Or run: python tools/migrate_to_database.py')
-    print('Available commands: !grep, !egrep, !stats, !wget, !tail, !index, !related, !migrate, !whoami, !mem')
+    @client.event
+    async def on_ready():
+        print('Logged in as {0.user}'.format(client))
+        print('Indexer initialized')
+        print('Database manager initialized')
+        print(f'Auto-migration of existing data: {"ENABLED" if AUTO_MIGRATE_EXISTING_DATA else "DISABLED"}')
+        print(f'Ingestion workers: {INGESTION_WORKERS}')
+        if not AUTO_MIGRATE_EXISTING_DATA:
+            print('To enable auto-migration, set AUTO_MIGRATE_EXISTING_DATA = True in my_bot.py')
+            print('Or run: python tools/migrate_to_database.py')
+        print('Available commands: !grep, !egrep, !stats, !wget, !tail, !index, !related, !migrate, !whoami, !mem')
+        # Load the vector index in a worker thread now rather than on the first !related
+        await asyncio.to_thread(db_manager.get_vector_index)
 
-@client.event
-async def on_message(message):
-    if message.author == client.user:
-        return
+    @client.event
+    async def on_message(message):
+        if message.author == client.user:
+            return
 
-    command = message.content.split(' ')[0]
+        parts = message.content.split()
+        command = parts[0] if parts else ''
 
-    if command in COMMANDS:
-        if command in ['!index', '!grep', '!egrep', '!related', '!stats', '!wget', '!tail', '!migrate', '!whoami', '!mem']:
-            await COMMANDS[command](message, indexer, db_manager)
+        if command in commands:
+            await commands[command](message, indexer, db_manager)
+        # Also treat messages that start with a URL or arXiv ID (including pasted reading lists) as a
+        # !wget command. Links cited later in a conversation are left alone; use !wget for those
         else:
-            await COMMANDS[command](message)
-    # Also treat messages that are just a URL as a !wget command
-    elif message.content.startswith('http://') or message.content.startswith('https://') or message.content.startswith('www.'):
-        await handle_wget(message, indexer, db_manager)
+            urls = extract_urls(message.content)
+            if urls and message.content.lstrip().startswith(urls[0]):
+                await handle_wget(message, indexer, db_manager)
 
+    return client
 
-if __name__ == '__main__':
+def main():
+    from indexer import Indexer
+    from database_manager import get_database_manager
+    from commands.wget_handler import ingestion_queue
+
+    discord_token = os.environ['DISCORD_TOKEN']
+    ingestion_queue.configure(INGESTION_WORKERS)
+
+    # Initialize the database manager and the indexer, which share one set of connections
+    db_manager = get_database_manager()
+    indexer = Indexer(auto_migrate=AUTO_MIGRATE_EXISTING_DATA, db_manager=db_manager)
+    client = create_client(indexer, db_manager)
     try:
         client.run(discord_token)
     finally:
@@ -77,3 +95,5 @@ if __name__ == '__main__':
         indexer.close()
         db_manager.close()
 
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,11 @@
 import requests
+from .http_client import get_http_client
 from bs4 import BeautifulSoup
 import html2text
 import re
 import json
 
-def extract_aikeke_content(url):
+def extract_aikeke_content(url, http_client=None):
     """
     Extract content from 爱可可 WeChat articles, converting to markdown and extracting arxiv/github links.
     
@@ -14,13 +15,9 @@ def extract_aikeke_content(url):
     Returns:
         dict: JSON object containing markdown text and lists of arxiv and github links
     """
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
     try:
         # Fetch the article
-        response = requests.get(url, headers=headers)
+        response = (http_client or get_http_client()).get(url)
         response.raise_for_status()
         
         # Parse HTML content
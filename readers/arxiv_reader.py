@@ -1,12 +1,14 @@
 import os
 import re
-import requests
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 from .base_reader import BaseReader
+from .html_utils import make_soup, iter_section_siblings
+from .latex_cleaner import clean_text, remove_latex_equations, remove_complex_latex
+from .http_client import get_http_client
 
-def download_arxiv_pdf(arxiv_link, local_directory):
+def arxiv_pdf_url(arxiv_link):
     """
-    Download the arXiv PDF for a given link. Accepts various arXiv URL formats and
+    Return the PDF URL for a given arXiv link. Accepts various arXiv URL formats and
     also supports Hugging Face papers pages (https://huggingface.co/papers/<id>)
     by extracting the arXiv ID and constructing the proper PDF URL.
     """
@@ -36,11 +38,17 @@ def download_arxiv_pdf(arxiv_link, local_directory):
 
     if not pdf_link:
         raise ValueError("Invalid arXiv link")
+    return pdf_link
 
+def download_arxiv_pdf(arxiv_link, local_directory, http_client=None):
+    """
+    Download the arXiv PDF for a given link to a local directory.
+    """
+    pdf_link = arxiv_pdf_url(arxiv_link)
     pdf_filename = pdf_link.split("/")[-1]
     local_file_path = os.path.join(local_directory, pdf_filename)
 
-    response = requests.get(pdf_link)
+    response = (http_client or get_http_client()).get(pdf_link)
     response.raise_for_status()
 
     with open(local_file_path, "wb") as f:
@@ -75,12 +83,13 @@ def extract_arxiv_id(url, include_version=False):
 
     return None
 
-def get_arxiv_content_old_version(url):
+def get_arxiv_content_old_version(url, http_client=None):
     if '/pdf/' in url:
         # If the URL is a PDF link, construct the corresponding abstract link
         url = url.replace('/pdf/', '/abs/', 1).replace('.pdf', '', 1)
-    response = requests.get(url)
-    soup = BeautifulSoup(response.text, 'html.parser')
+    response = (http_client or get_http_client()).get(url)
+    # Only the title and abstract are needed from the abstract page
+    soup = make_soup(response.text, parse_only=SoupStrainer(['h1', 'blockquote']))
     title = soup.find('h1', class_='title mathjax').text.strip()
     abstract = soup.find('blockquote', class_='abstract mathjax').text.strip()
     content = f'{title}\n\n{abstract}'
@@ -91,7 +100,8 @@ def get_arxiv_content_old_version(url):
     return content
 
 # arxiv HTML page may have a few patterns, so we need to try multiple URLs
-def fetch_arxiv_page(arxiv_id):
+def fetch_arxiv_page(arxiv_id, http_client=None):
+    http_client = http_client or get_http_client()
     # Define a list of URL patterns to try
     url_patterns = [
         #f"https://browse.arxiv.org/html/{arxiv_id}v{{version}}",
@@ -102,69 +112,16 @@ def fetch_arxiv_page(arxiv_id):
     for version in range(1, 3):  # Assuming you want to check versions 1 and 2; adjust range as needed
         for pattern in url_patterns:
             url = pattern.format(version=version)
-            response = requests.get(url)
+            response = http_client.get(url)
             if response.status_code == 200:
                 return response.text
     return None  # Return None if none of the URLs work
 
-def remove_latex_equations(text):
-    # Pattern to match common LaTeX equation delimiters and commands
-    # Adjust the pattern as needed to cover more cases
-    pattern = r'\\(?:begin\{[a-z]*\}|end\{[a-z]*\}|[a-zA-Z]+\{.*?\}|[a-zA-Z]+)'
-    clean_text = re.sub(pattern, '', text)
-    
-    # Additional cleanup for orphaned markers or commands
-    clean_text = re.sub(r'\\[a-zA-Z]+', '', clean_text)
-    clean_text = re.sub(r'\{|\}', '', clean_text)
-    
-    return clean_text
-
-def remove_complex_latex(text):
-    # Attempt to catch complex LaTeX-like expressions by looking for extended patterns
-    # This pattern is an attempt to match more complex mathematical expressions
-    # Adjust and expand upon these patterns based on observed structures in your text
-    patterns = [
-        r'\([^\)]*\)',  # Attempt to catch expressions enclosed in parentheses
-        r'\[[^\]]*\]',  # Attempt to catch expressions enclosed in brackets
-        r'\\[a-zA-Z]+\[[^\]]*\]',  # Catch LaTeX commands that might use brackets
-        r'\\[a-zA-Z]+',  # Catch standalone LaTeX commands
-        r'\{[^\}]*\}',  # Attempt to catch expressions enclosed in curly braces
-        r'[a-zA-Z]\[[^\]]*\]',  # Catch expressions like X[...]
-        r'\^[^\s]+',  # Catch superscript expressions
-        r'_\{[^\}]*\}',  # Catch subscript expressions
-        r'bold_[a-zA-Z]',  # Specific patterns observed in your example
-        r'italic_[a-zA-Z]',
-        r'fraktur_[a-zA-Z]',
-        r'over\^[^\s]+',  # Catch over^ expressions
-        r'start_[A-Z]+',  # Catch start_ expressions
-        r'end_[A-Z]+'  # Catch end_ expressions
-    ]
-    
-    clean_text = text
-    for pattern in patterns:
-        clean_text = re.sub(pattern, '', clean_text)
-    
-    # Additional cleanup for leftover markers or nonsensical sequences
-    clean_text = re.sub(r'[\{\}\[\]\(\)]', '', clean_text)  # Remove leftover braces, brackets, parentheses
-    clean_text = re.sub(r'\s+', ' ', clean_text).strip()  # Remove extra spaces
-    
-    return clean_text
-
 def parse_html(html_content):
-    soup = BeautifulSoup(html_content, 'html.parser')
+    soup = make_soup(html_content)
 
     sections = {}
 
-    # Function to clean text by removing non-tokenizable characters
-    def clean_text(text):
-        # Replace non-tokenizable characters with an empty string
-        cleaned_text = re.sub(r'[^\x00-\x7F]+', '', text)
-        # Remove LaTeX equations
-        cleaned_text = remove_latex_equations(cleaned_text)
-        # Remove complex LaTeX-like expressions
-        cleaned_text = remove_complex_latex(cleaned_text)
-        return cleaned_text
-    
     # Extract title from <h1>
     title = soup.find('h1')
     if title:
@@ -185,22 +142,18 @@ def parse_html(html_content):
         section_name = clean_text(heading.get_text(strip=True))
 
         # Extracting content under the section
-        content = []
-        for sibling in heading.find_next_siblings():
-            if sibling.name == 'h2':
-                break
-            content.append(clean_text(sibling.get_text(strip=True)))
+        content = [clean_text(sibling.get_text(strip=True)) for sibling in iter_section_siblings(heading)]
         sections[section_name] = ' '.join(content)
 
     return sections
 
 # new version of get_arxiv_content by including html version
 # now we get the ID first, and then construct the html version link
-def get_arxiv_content(url):
+def get_arxiv_content(url, http_client=None):
     arxiv_id = extract_arxiv_id(url)
     if arxiv_id is None:
         return "Arxiv ID not found."
-    arxiv_html_content = fetch_arxiv_page(arxiv_id)
+    arxiv_html_content = fetch_arxiv_page(arxiv_id, http_client)
     if arxiv_html_content:
         arxiv_sections = parse_html(arxiv_html_content)
         content = '\n\n'.join([f'**{section_name}**\n{section_content}' for section_name, section_content in arxiv_sections.items()])
@@ -208,8 +161,17 @@ def get_arxiv_content(url):
     else: # if the html page is not found, we downgrade the old version
         #return "Arxiv page not found."
         print("Arxiv page not found. Downgrading to old version.")
-        return get_arxiv_content_old_version(url)
+        return get_arxiv_content_old_version(url, http_client)
 
 class ArxivReader(BaseReader):
     def read(self, url: str) -> str:
-        return get_arxiv_content(url)
+        return get_arxiv_content(url, self.http)
+
+    def read_document(self, url: str) -> tuple[str, dict | None]:
+        # The text comes from the HTML page, so the PDF is only fetched when it is archived
+        content = self.read(url)
+        try:
+            pdf_link = arxiv_pdf_url(url)
+        except ValueError:
+            return content, None
+        return content, {'filename': pdf_link.split("/")[-1], 'url': pdf_link}
@@ -1,6 +1,11 @@
 from abc import ABC, abstractmethod
+from .http_client import HttpClient, get_http_client
 
 class BaseReader(ABC):
+    def __init__(self, http_client: HttpClient = None):
+        # All network access goes through the shared pooled client unless one is injected
+        self.http = http_client or get_http_client()
+
     @abstractmethod
     def read(self, url: str) -> str | dict:
         """
@@ -13,3 +18,16 @@ class BaseReader(ABC):
             The content of the URL as a string, or a dictionary for complex content.
         """
         pass
+
+    def read_document(self, url: str) -> tuple[str | dict, dict | None]:
+        """
+        Reads the content from a given URL together with the original artifact, if any.
+
+        Readers that download a file worth archiving (e.g. a PDF) override this so the
+        bytes they already fetched can be saved without downloading them again.
+
+        Returns:
+            (content, artifact): ``artifact`` is None or a dict with a ``filename`` and
+            either the raw ``data`` or a ``url`` to fetch it from later.
+        """
+        return self.read(url), None
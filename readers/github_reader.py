@@ -1,6 +1,5 @@
 from .base_reader import BaseReader
 import github3
-import requests
 import json
 
 class GithubReader(BaseReader):
@@ -49,7 +48,7 @@ class GithubReader(BaseReader):
 class GithubIpynbReader(BaseReader):
     def read(self, url: str) -> dict:
         raw_url = url.replace('github.com', 'raw.githubusercontent.com').replace('/blob/', '/')
-        response = requests.get(raw_url)
+        response = self.http.get(raw_url)
         if response.status_code == 200:
             notebook_content = response.text
             notebook_data = json.loads(notebook_content)
@@ -0,0 +1,31 @@
+from bs4 import BeautifulSoup, Tag
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'  # C parser; much faster and lighter than html.parser on large pages
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+def make_soup(html, parse_only=None):
+    """
+    Parse HTML with the fastest available parser.
+
+    ``parse_only`` is an optional ``SoupStrainer`` that keeps only the parts of the
+    page the caller needs, which saves building the rest of the tree.
+    """
+    return BeautifulSoup(html, HTML_PARSER, parse_only=parse_only)
+
+def iter_section_siblings(heading, stop_name='h2'):
+    """
+    Yield the tag siblings after ``heading`` up to the next ``stop_name`` tag.
+
+    Walks ``next_siblings`` lazily, so extracting every section of a page is linear in
+    its size, unlike calling ``find_next_siblings()`` (which builds the list of all
+    following siblings) for each heading.
+    """
+    for sibling in heading.next_siblings:
+        if not isinstance(sibling, Tag):
+            continue
+        if sibling.name == stop_name:
+            break
+        yield sibling
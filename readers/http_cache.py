@@ -0,0 +1,181 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+class HttpCache:
+    """
+    Content-addressed on-disk cache for reader responses.
+
+    Bodies are stored once per SHA-256 under ``cache_dir`` and indexed by URL in a small
+    SQLite database together with their ETag/Last-Modified validators, so a refresh can
+    send a conditional GET and serve the stored body on a 304. Responses that are still
+    fresh per ``Cache-Control: max-age`` are served without touching the network. The
+    least recently used bodies are evicted once the cache grows past ``max_bytes``.
+    """
+
+    def __init__(self, cache_dir: str = 'saved_text/http_cache', max_bytes: int = 1024 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.db_path = os.path.join(cache_dir, 'index.db')
+        self._total_bytes = 0  # Running total of stored body sizes
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._init_database()
+
+    @contextmanager
+    def _connect(self):
+        """A connection that commits on success and is always closed."""
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _init_database(self):
+        with self._connect() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS entries (
+                    url TEXT PRIMARY KEY,
+                    body_hash TEXT NOT NULL,
+                    final_url TEXT,
+                    status_code INTEGER,
+                    headers TEXT,
+                    etag TEXT,
+                    last_modified TEXT,
+                    max_age INTEGER,
+                    stored_at REAL NOT NULL
+                )
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS bodies (
+                    body_hash TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_entries_body_hash ON entries(body_hash)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_bodies_last_used ON bodies(last_used)')
+            self._total_bytes = conn.execute('SELECT COALESCE(SUM(size), 0) FROM bodies').fetchone()[0]
+
+    def _body_path(self, body_hash: str) -> str:
+        return os.path.join(self.cache_dir, body_hash[:2], body_hash)
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        """
+        Return the cached entry for ``url`` or None.
+
+        The entry has ``body_hash``, ``final_url``, ``status_code``, ``headers``, ``etag``,
+        ``last_modified`` and ``fresh`` (True if it can be served without revalidating).
+        """
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute('SELECT * FROM entries WHERE url = ?', (url,)).fetchone()
+        if not row or not os.path.exists(self._body_path(row['body_hash'])):
+            return None
+        entry = dict(row)
+        entry['headers'] = json.loads(entry['headers'] or '{}')
+        entry['fresh'] = bool(entry['max_age']) and time.time() - entry['stored_at'] < entry['max_age']
+        return entry
+
+    def load_body(self, entry: Dict) -> Optional[bytes]:
+        """Read a cached body and mark it as recently used."""
+        try:
+            with open(self._body_path(entry['body_hash']), 'rb') as f:
+                body = f.read()
+        except OSError:
+            return None
+        with self._lock, self._connect() as conn:
+            conn.execute('UPDATE bodies SET last_used = ? WHERE body_hash = ?', (time.time(), entry['body_hash']))
+        return body
+
+    def revalidated(self, url: str, headers: Dict[str, str]):
+        """Record a 304 for ``url``: the stored body is current again."""
+        with self._lock, self._connect() as conn:
+            conn.execute('UPDATE entries SET stored_at = ?, max_age = ? WHERE url = ?',
+                         (time.time(), parse_max_age(headers), url))
+
+    def store(self, url: str, response) -> bool:
+        """
+        Cache a successful response if it is cacheable.
+
+        Only 200 responses without ``Cache-Control: no-store`` that carry a validator or
+        a max-age are kept, since anything else could never be served or revalidated.
+        """
+        headers = response.headers
+        cache_control = headers.get('Cache-Control', '').lower()
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        max_age = parse_max_age(headers)
+        if response.status_code != 200 or 'no-store' in cache_control:
+            return False
+        if not (etag or last_modified or max_age):
+            return False
+
+        body = response.content
+        body_hash = hashlib.sha256(body).hexdigest()
+        body_path = self._body_path(body_hash)
+        if not os.path.exists(body_path):
+            os.makedirs(os.path.dirname(body_path), exist_ok=True)
+            tmp_path = f'{body_path}.{threading.get_ident()}.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(body)
+            os.replace(tmp_path, body_path)
+
+        # The body is stored decoded, so only keep headers that still describe it
+        kept_headers = {name: headers[name] for name in ('Content-Type', 'ETag', 'Last-Modified') if name in headers}
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            known = conn.execute('SELECT 1 FROM bodies WHERE body_hash = ?', (body_hash,)).fetchone()
+            conn.execute('''
+                INSERT INTO bodies (body_hash, size, last_used) VALUES (?, ?, ?)
+                ON CONFLICT(body_hash) DO UPDATE SET last_used = excluded.last_used
+            ''', (body_hash, len(body), now))
+            conn.execute('''
+                INSERT OR REPLACE INTO entries
+                (url, body_hash, final_url, status_code, headers, etag, last_modified, max_age, stored_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (url, body_hash, response.url, response.status_code, json.dumps(kept_headers),
+                  etag, last_modified, max_age, now))
+            if not known:
+                self._total_bytes += len(body)
+            if self._total_bytes > self.max_bytes:
+                self._evict(conn)
+        return True
+
+    def _evict(self, conn):
+        """Drop least recently used bodies (and the URLs pointing at them) beyond the size cap."""
+        # Recount before evicting, in case another process shares the cache
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM bodies').fetchone()[0]
+        if total > self.max_bytes:
+            for body_hash, size in conn.execute('SELECT body_hash, size FROM bodies ORDER BY last_used').fetchall():
+                if total <= self.max_bytes:
+                    break
+                conn.execute('DELETE FROM entries WHERE body_hash = ?', (body_hash,))
+                conn.execute('DELETE FROM bodies WHERE body_hash = ?', (body_hash,))
+                try:
+                    os.remove(self._body_path(body_hash))
+                except OSError:
+                    pass
+                total -= size
+        self._total_bytes = total
+
+    def stats(self) -> Dict:
+        with self._connect() as conn:
+            urls = conn.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+            bodies, size = conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM bodies').fetchone()
+        return {'urls': urls, 'bodies': bodies, 'bytes': size, 'max_bytes': self.max_bytes}
+
+def parse_max_age(headers) -> Optional[int]:
+    """Seconds a response may be served without revalidation, from Cache-Control."""
+    cache_control = headers.get('Cache-Control', '').lower()
+    if 'no-cache' in cache_control or 'no-store' in cache_control:
+        return None
+    match = re.search(r'(?:^|[,\s])max-age=(\d+)', cache_control)
+    return int(match.group(1)) if match and int(match.group(1)) > 0 else None
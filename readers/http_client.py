@@ -0,0 +1,221 @@
+import contextvars
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+
+from .http_cache import HttpCache
+
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+# Set by ``revalidate_cache`` for the current thread or task
+_revalidate = contextvars.ContextVar('http_cache_revalidate', default=False)
+
+@contextmanager
+def revalidate_cache():
+    """
+    Within this block, cached responses are revalidated with the server even while fresh.
+
+    Used for user-requested refreshes: the conditional GET still turns an unchanged
+    page into a 304 and a local read, but a fresh ``max-age`` never hides a change.
+    """
+    token = _revalidate.set(True)
+    try:
+        yield
+    finally:
+        _revalidate.reset(token)
+
+class ResponseTooLarge(requests.exceptions.RequestException):
+    """Raised when a response body exceeds the client's size cap."""
+
+class HttpClient:
+    """
+    Pooled HTTP client shared by all readers.
+
+    One ``requests.Session`` with keep-alive connection pools per host, connect/read
+    timeouts on every request, a cap on response size (enforced while streaming, so an
+    oversized body is never fully downloaded), a common User-Agent and per-host metrics.
+    Safe to use from the worker threads the readers run in.
+
+    With an ``HttpCache``, plain GETs are served from disk while fresh and otherwise
+    revalidated with If-None-Match/If-Modified-Since, reusing the stored body on a 304.
+    """
+
+    def __init__(self, connect_timeout: float = 5.0, read_timeout: float = 30.0,
+                 max_response_bytes: int = 50 * 1024 * 1024, pool_connections: int = 32,
+                 pool_maxsize: int = 8, connect_retries: int = 2,
+                 user_agent: str = DEFAULT_USER_AGENT, cache: Optional[HttpCache] = None):
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_response_bytes = max_response_bytes
+        self.cache = cache
+
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = user_agent
+        # pool_connections is the number of hosts to keep pools for, pool_maxsize the
+        # number of keep-alive connections per host. Only connection failures are
+        # retried here; anything else is the caller's decision.
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=Retry(total=connect_retries, connect=connect_retries, read=0, backoff_factor=0.3),
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self._metrics_lock = threading.Lock()
+        self._metrics: Dict[str, Dict] = defaultdict(lambda: {
+            'requests': 0, 'errors': 0, 'bytes': 0, 'seconds': 0.0, 'status': defaultdict(int),
+            'cache_hits': 0, 'revalidated': 0,
+        })
+
+    def get(self, url: str, max_bytes: Optional[int] = None, use_cache: bool = True, **kwargs) -> requests.Response:
+        """
+        GET ``url`` and return the response with its body loaded.
+
+        Accepts the usual ``requests`` keyword arguments; ``timeout`` defaults to the
+        client's timeouts and ``max_bytes`` overrides the size cap for this call.
+        Raises ``ResponseTooLarge`` when the body is larger than the cap.
+        Set ``use_cache=False`` to bypass the on-disk cache entirely.
+        """
+        # Requests with caller-specific headers or parameters are not cached
+        if not (self.cache and use_cache and not kwargs.get('headers') and not kwargs.get('params')):
+            return self.request('GET', url, max_bytes=max_bytes, **kwargs)
+
+        host = urlsplit(url).hostname or ''
+        entry = self.cache.lookup(url)
+        if entry and entry['fresh'] and not _revalidate.get():
+            body = self.cache.load_body(entry)
+            if body is not None:
+                self._record_cache(host, 'cache_hits')
+                return self._cached_response(entry, body)
+            entry = None
+
+        headers = {}
+        if entry and entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+        response = self.request('GET', url, max_bytes=max_bytes, headers=headers or None, **kwargs)
+
+        if response.status_code == 304 and entry:
+            body = self.cache.load_body(entry)
+            if body is not None:
+                self.cache.revalidated(url, response.headers)
+                self._record_cache(host, 'revalidated')
+                return self._cached_response(entry, body)
+            # The body vanished between lookup and load; fetch it unconditionally
+            response = self.request('GET', url, max_bytes=max_bytes, **kwargs)
+
+        try:
+            self.cache.store(url, response)
+        except OSError as e:
+            print(f"Failed to cache {url}: {e}")
+        return response
+
+    @staticmethod
+    def _cached_response(entry, body: bytes) -> requests.Response:
+        response = requests.Response()
+        response.status_code = entry['status_code'] or 200
+        response.reason = 'OK'
+        response.url = entry['final_url'] or entry['url']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.headers['Content-Length'] = str(len(body))
+        response._content = body
+        response._content_consumed = True
+        return response
+
+    def head(self, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault('allow_redirects', True)
+        return self.request('HEAD', url, **kwargs)
+
+    def request(self, method: str, url: str, max_bytes: Optional[int] = None, **kwargs) -> requests.Response:
+        kwargs.setdefault('timeout', self.timeout)
+        limit = max_bytes or self.max_response_bytes
+        host = urlsplit(url).hostname or ''
+        start = time.perf_counter()
+        response = None
+        try:
+            response = self.session.request(method, url, stream=True, **kwargs)
+            self._read_body(response, limit)
+        except requests.exceptions.RequestException:
+            if response is not None:
+                response.close()
+            self._record(host, start, error=True)
+            raise
+        self._record(host, start, status=response.status_code, size=len(response.content))
+        return response
+
+    def _read_body(self, response: requests.Response, limit: int):
+        declared = response.headers.get('Content-Length')
+        if declared and declared.isdigit() and int(declared) > limit:
+            raise ResponseTooLarge(f"Response from {response.url} is {int(declared)} bytes (limit {limit})",
+                                   response=response)
+        body = bytearray()
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            body.extend(chunk)
+            if len(body) > limit:
+                raise ResponseTooLarge(f"Response from {response.url} exceeds {limit} bytes", response=response)
+        # Hand the buffered body back to requests so .content/.text/.json() work as usual
+        response._content = bytes(body)
+        response._content_consumed = True
+        response.close()  # Returns the connection to the pool
+
+    def _record(self, host: str, start: float, status: int = None, size: int = 0, error: bool = False):
+        elapsed = time.perf_counter() - start
+        with self._metrics_lock:
+            stats = self._metrics[host]
+            stats['requests'] += 1
+            stats['seconds'] += elapsed
+            stats['bytes'] += size
+            if error:
+                stats['errors'] += 1
+            else:
+                stats['status'][status] += 1
+
+    def _record_cache(self, host: str, counter: str):
+        with self._metrics_lock:
+            self._metrics[host][counter] += 1
+
+    def metrics(self) -> Dict[str, Dict]:
+        """
+        Per-host request counts, errors, bytes received, average latency, status codes and
+        cache use (``cache_hits`` served from disk, ``revalidated`` by a 304).
+        """
+        with self._metrics_lock:
+            return {
+                host: {
+                    'requests': stats['requests'],
+                    'errors': stats['errors'],
+                    'bytes': stats['bytes'],
+                    'avg_seconds': stats['seconds'] / stats['requests'] if stats['requests'] else 0.0,
+                    'status': dict(stats['status']),
+                    'cache_hits': stats['cache_hits'],
+                    'revalidated': stats['revalidated'],
+                }
+                for host, stats in self._metrics.items()
+            }
+
+    def close(self):
+        self.session.close()
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+def get_http_client() -> HttpClient:
+    """Return the process-wide client (with the on-disk cache) that readers use unless they are given one."""
+    global _default_client
+    if _default_client is None:
+        with _default_client_lock:
+            if _default_client is None:
+                _default_client = HttpClient(cache=HttpCache())
+    return _default_client
@@ -1,38 +1,31 @@
-import requests
-from bs4 import BeautifulSoup
+from .html_utils import make_soup, iter_section_siblings
+from .http_client import get_http_client
 
-def fetch_huggingface_model_page(url):
-    response = requests.get(url)
+def fetch_huggingface_model_page(url, http_client=None):
+    response = (http_client or get_http_client()).get(url)
     if response.status_code == 200:
         return response.text
     else:
         return None
 
 def parse_huggingface_html(html_content):
-    soup = BeautifulSoup(html_content, 'html.parser')
+    soup = make_soup(html_content)
     sections = {}
 
     for heading in soup.find_all('h2'):
         heading_text = heading.get_text(strip=True)
-        content = []
-
-        for sibling in heading.find_next_siblings():
-            if sibling.name == 'h2':
-                break
-            content.append(sibling.get_text(strip=True))
+        content = [sibling.get_text(strip=True) for sibling in iter_section_siblings(heading)]
 
         sections[heading_text] = ' '.join(content)
 
     return sections
 
 from .base_reader import BaseReader
-from bs4 import BeautifulSoup
-import requests
 
 class HuggingfaceReader(BaseReader):
     def read(self, url: str) -> str:
-        response = requests.get(url)
-        soup = BeautifulSoup(response.text, 'html.parser')
+        response = self.http.get(url)
+        soup = make_soup(response.text)
         
         # Find the main content of the page
         main_content = soup.find('div', class_='prose')
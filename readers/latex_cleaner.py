@@ -0,0 +1,68 @@
+import re
+
+# Cleanup of LaTeX and math markup left in the text of arXiv HTML pages.
+#
+# The patterns are applied in the same order as the original string-based passes,
+# since earlier removals can create new matches for later ones. Each pass is
+# precompiled and skipped when the characters it needs are absent (most paragraphs
+# contain no backslash, caret or underscore), passes that can never match after an
+# earlier one are dropped, and single-character deletions use str.translate.
+
+_LATEX_COMMAND_RE = re.compile(r'\\(?:begin\{[a-z]*\}|end\{[a-z]*\}|[a-zA-Z]+\{.*?\}|[a-zA-Z]+)')
+_ORPHAN_COMMAND_RE = re.compile(r'\\[a-zA-Z]+')
+_BRACES = str.maketrans('', '', '{}')
+
+_PARENTHESES_RE = re.compile(r'\([^\)]*\)')
+_BRACKETS_RE = re.compile(r'\[[^\]]*\]')
+_CURLY_RE = re.compile(r'\{[^\}]*\}')
+_SUPERSCRIPT_RE = re.compile(r'\^[^\s]+')
+_BOLD_RE = re.compile(r'bold_[a-zA-Z]')
+_ITALIC_RE = re.compile(r'italic_[a-zA-Z]')
+_FRAKTUR_RE = re.compile(r'fraktur_[a-zA-Z]')
+_START_RE = re.compile(r'start_[A-Z]+')
+_END_RE = re.compile(r'end_[A-Z]+')
+_LEFTOVER_MARKERS = str.maketrans('', '', '{}[]()')
+
+def remove_latex_equations(text):
+    """Remove LaTeX commands and environments, then any orphaned commands and braces."""
+    if '\\' in text:
+        text = _LATEX_COMMAND_RE.sub('', text)
+        text = _ORPHAN_COMMAND_RE.sub('', text)
+    return text.translate(_BRACES)
+
+def remove_complex_latex(text):
+    """Remove bracketed math, superscripts and rendered-math artifacts, and collapse whitespace."""
+    if '(' in text:
+        text = _PARENTHESES_RE.sub('', text)
+    if '[' in text:
+        # Also covers "\cmd[...]" and "X[...]": no bracket pair survives this pass
+        text = _BRACKETS_RE.sub('', text)
+    if '\\' in text:
+        text = _ORPHAN_COMMAND_RE.sub('', text)
+    if '{' in text:
+        # Also covers "_{...}": no brace pair survives this pass
+        text = _CURLY_RE.sub('', text)
+    if '^' in text:
+        # Also covers "over^...": no caret followed by a non-space survives this pass
+        text = _SUPERSCRIPT_RE.sub('', text)
+    if '_' in text:
+        text = _BOLD_RE.sub('', text)
+        text = _ITALIC_RE.sub('', text)
+        text = _FRAKTUR_RE.sub('', text)
+        text = _START_RE.sub('', text)
+        text = _END_RE.sub('', text)
+
+    # Additional cleanup for leftover markers or nonsensical sequences
+    text = text.translate(_LEFTOVER_MARKERS)
+    # Same as collapsing \s+ runs to one space and stripping, without the regex
+    return ' '.join(text.split())
+
+def clean_text(text):
+    """Strip non-ASCII characters and LaTeX markup from text extracted from arXiv HTML."""
+    # Replace non-tokenizable characters with an empty string
+    if not text.isascii():
+        text = text.encode('ascii', 'ignore').decode('ascii')
+    # Remove LaTeX equations
+    text = remove_latex_equations(text)
+    # Remove complex LaTeX-like expressions
+    return remove_complex_latex(text)
@@ -1,118 +1,269 @@
+import multiprocessing
 import os
 import re
-import requests
 import tempfile
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import urlsplit
 from .base_reader import BaseReader
+from .http_client import get_http_client
 
-def download_pdf(pdf_url, local_directory):
+def pdf_filename_from_url(pdf_url):
     """
-    Download a PDF from a URL to a local directory.
+    Local file name used when archiving the PDF behind a URL.
     """
     pdf_filename = pdf_url.split("/")[-1]
     
     # Ensure filename has .pdf extension
     if not pdf_filename.endswith('.pdf'):
         pdf_filename += '.pdf'
-    
-    local_file_path = os.path.join(local_directory, pdf_filename)
+    return pdf_filename
 
-    response = requests.get(pdf_url, headers={
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-    })
+def fetch_pdf_bytes(pdf_url, http_client=None):
+    """
+    Download a PDF into memory.
+    """
+    response = (http_client or get_http_client()).get(pdf_url)
     response.raise_for_status()
+    return response.content
+
+def download_pdf(pdf_url, local_directory, http_client=None):
+    """
+    Download a PDF from a URL to a local directory.
+    """
+    local_file_path = os.path.join(local_directory, pdf_filename_from_url(pdf_url))
 
     with open(local_file_path, "wb") as f:
-        f.write(response.content)
+        f.write(fetch_pdf_bytes(pdf_url, http_client))
 
     print(f"PDF downloaded to: {local_file_path}")
     return local_file_path
 
-def extract_text_from_pdf(pdf_path):
-    """
-    Extract text content from a PDF file using pdfplumber.
-    """
+# Extraction budget: the summarizer only reads a bounded prefix of a document, so pages
+# past these limits are never parsed
+PDF_MAX_PAGES = 120
+PDF_MAX_CHARS = 400_000
+PDF_PAGES_PER_TASK = 8  # Pages handed to one worker process at a time
+PDF_WORKERS = min(4, os.cpu_count() or 1)
+
+_pdf_pool = None
+_pdf_pool_lock = threading.Lock()
+
+def _get_pdf_pool():
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is None:
+            # Forking the bot (event loop, sqlite connections and HTTP pool held by other
+            # threads) can deadlock the child, so workers start from a fresh interpreter.
+            # The fork server preloads only this module rather than the bot's __main__,
+            # which keeps its setup under main() for the same reason
+            if 'forkserver' in multiprocessing.get_all_start_methods():
+                context = multiprocessing.get_context('forkserver')
+                context.set_forkserver_preload(['readers.pdf_reader'])
+            else:
+                context = multiprocessing.get_context('spawn')
+            _pdf_pool = ProcessPoolExecutor(max_workers=PDF_WORKERS, mp_context=context)
+        return _pdf_pool
+
+def _import_pdfplumber():
     try:
         import pdfplumber
     except ImportError:
         raise ImportError("pdfplumber is required for PDF processing. Install it with: pip install pdfplumber")
-    
+    return pdfplumber
+
+def _extract_page_range(pdf_path, start, end):
+    """
+    Extract and clean pages ``start``..``end - 1`` (0-based). Runs in a worker process.
+    """
+    pdfplumber = _import_pdfplumber()
+    pages = []
+    with pdfplumber.open(pdf_path) as pdf:
+        for page_index in range(start, min(end, len(pdf.pages))):
+            page = pdf.pages[page_index]
+            page_text = page.extract_text()
+            if page_text:
+                # Clean up the text
+                pages.append((page_index + 1, clean_pdf_text(page_text)))
+            page.flush_cache()  # pdfplumber keeps parsed objects per page otherwise
+    return pages
+
+def iter_pdf_pages(pdf_source, max_pages=PDF_MAX_PAGES, max_chars=PDF_MAX_CHARS, pages_per_task=PDF_PAGES_PER_TASK):
+    """
+    Yield ``(page_number, cleaned_text)`` for a PDF path or in-memory PDF bytes, in page order.
+
+    Page ranges are extracted in parallel in a process pool, so the bot process does not
+    hold the GIL while pdfplumber parses. Pages are yielded as soon as their range is
+    done, and extraction stops (cancelling queued ranges) once ``max_pages`` pages or
+    ``max_chars`` characters have been produced.
+    """
+    pdfplumber = _import_pdfplumber()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # Workers open the PDF from disk; sending the bytes to every task would copy them each time
+        if isinstance(pdf_source, (bytes, bytearray)):
+            pdf_path = os.path.join(temp_dir, 'document.pdf')
+            with open(pdf_path, 'wb') as f:
+                f.write(pdf_source)
+        else:
+            pdf_path = pdf_source
+
+        try:
+            with pdfplumber.open(pdf_path) as pdf:
+                page_count = min(len(pdf.pages), max_pages)
+        except Exception as e:
+            raise ValueError(f"Failed to extract text from PDF: {str(e)}")
+
+        ranges = [(start, min(start + pages_per_task, page_count)) for start in range(0, page_count, pages_per_task)]
+        if len(ranges) <= 1:
+            # Not worth a round trip to the pool
+            yield from _limit_chars((page for start, end in ranges for page in _extract_page_range(pdf_path, start, end)), max_chars)
+            return
+
+        pool = _get_pdf_pool()
+        # Keep a few ranges in flight ahead of the consumer rather than the whole document
+        window = PDF_WORKERS * 2
+        pending = deque()
+        next_range = 0
+        try:
+            def fill():
+                nonlocal next_range
+                while next_range < len(ranges) and len(pending) < window:
+                    start, end = ranges[next_range]
+                    pending.append(pool.submit(_extract_page_range, pdf_path, start, end))
+                    next_range += 1
+
+            def ordered_pages():
+                fill()
+                while pending:
+                    pages = pending.popleft().result()
+                    fill()
+                    yield from pages
+
+            yield from _limit_chars(ordered_pages(), max_chars)
+        except BrokenProcessPool:
+            raise ValueError("Failed to extract text from PDF: worker process crashed")
+        finally:
+            for future in pending:
+                future.cancel()
+            # Running ranges still read the temporary file; wait before it is removed
+            wait(pending)
+
+def _limit_chars(pages, max_chars):
+    total = 0
+    for page_number, page_text in pages:
+        if total >= max_chars:
+            return
+        page_text = page_text[:max_chars - total]
+        total += len(page_text)
+        yield page_number, page_text
+
+def extract_text_from_pdf(pdf_source, max_pages=PDF_MAX_PAGES, max_chars=PDF_MAX_CHARS):
+    """
+    Extract text content from a PDF file path or in-memory PDF bytes using pdfplumber.
+
+    The pages are joined before anything is summarized: ingestion hashes the complete
+    text to skip unchanged documents, so summarization cannot start on a partial
+    document. ``iter_pdf_pages`` streams pages for callers that can use them early.
+    """
     text_content = []
-    
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            for page_num, page in enumerate(pdf.pages, 1):
-                page_text = page.extract_text()
-                if page_text:
-                    # Clean up the text
-                    page_text = clean_pdf_text(page_text)
-                    text_content.append(f"**Page {page_num}**\n{page_text}")
+        for page_num, page_text in iter_pdf_pages(pdf_source, max_pages=max_pages, max_chars=max_chars):
+            if page_text:
+                text_content.append(f"**Page {page_num}**\n{page_text}")
+    except (ImportError, ValueError):
+        raise
     except Exception as e:
         raise ValueError(f"Failed to extract text from PDF: {str(e)}")
     
     return '\n\n'.join(text_content)
 
+_WHITESPACE_RE = re.compile(r'\s+')
+_NON_ASCII_RE = re.compile(r'[^\x00-\x7F]+')
+_SPACE_BEFORE_PUNCTUATION_RE = re.compile(r'\s+([.!?;,])')
+_SENTENCE_BREAK_RE = re.compile(r'([.!?])\s*\n\s*')
+_EXTRA_BREAKS_RE = re.compile(r'\n\s*\n\s*\n+')
+
 def clean_pdf_text(text):
     """
     Clean up extracted PDF text by removing excessive whitespace and artifacts.
     """
     # Remove excessive whitespace
-    text = re.sub(r'\s+', ' ', text)
+    text = _WHITESPACE_RE.sub(' ', text)
     
     # Remove weird artifacts common in PDFs
-    text = re.sub(r'[^\x00-\x7F]+', '', text)  # Remove non-ASCII characters
-    text = re.sub(r'\x0c', '\n', text)  # Replace form feed with newline
+    text = _NON_ASCII_RE.sub('', text)  # Remove non-ASCII characters
+    text = text.replace('\x0c', '\n')  # Replace form feed with newline
     
     # Clean up spacing around punctuation
-    text = re.sub(r'\s+([.!?;,])', r'\1', text)
-    text = re.sub(r'([.!?])\s*\n\s*', r'\1\n\n', text)  # Better paragraph breaks
+    text = _SPACE_BEFORE_PUNCTUATION_RE.sub(r'\1', text)
+    text = _SENTENCE_BREAK_RE.sub(r'\1\n\n', text)  # Better paragraph breaks
     
     # Remove excessive line breaks
-    text = re.sub(r'\n\s*\n\s*\n+', '\n\n', text)
+    text = _EXTRA_BREAKS_RE.sub('\n\n', text)
     
     return text.strip()
 
 def is_pdf_url(url):
     """
-    Check if a URL points to a PDF file.
+    Check if a URL points to a PDF file by its extension.
+    
+    URLs without a .pdf extension are recognized from the response itself
+    (see ``is_pdf_response``) rather than with a separate HEAD request.
+    """
+    return urlsplit(url).path.lower().endswith('.pdf')
+
+def is_pdf_response(response):
     """
-    # Check file extension
-    if url.lower().endswith('.pdf'):
-        return True
+    Check whether a fetched response is a PDF, by content-type or by its magic bytes.
+    """
+    content_type = response.headers.get('content-type', '').lower()
+    return 'application/pdf' in content_type or response.content[:5] == b'%PDF-'
+
+def read_pdf(url, http_client=None):
+    """
+    Download a PDF once and extract its content from memory.
     
-    # Check content-type header (for URLs without .pdf extension)
+    Returns:
+        (content, pdf_bytes): ``pdf_bytes`` is None if the download or extraction failed.
+    """
     try:
-        response = requests.head(url, headers={
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }, timeout=10)
-        content_type = response.headers.get('content-type', '').lower()
-        return 'application/pdf' in content_type
-    except:
-        # If we can't check headers, fall back to URL inspection
-        return False
+        # Download the PDF
+        pdf_bytes = fetch_pdf_bytes(url, http_client)
+    except Exception as e:
+        return f"Error processing PDF: {str(e)}", None
+    return read_pdf_bytes(url, pdf_bytes)
 
-def get_pdf_content(url):
+def read_pdf_bytes(url, pdf_bytes):
+    """
+    Extract content from PDF bytes that were already downloaded from ``url``.
+    
+    Returns:
+        (content, pdf_bytes): ``pdf_bytes`` is None if extraction failed.
+    """
+    try:
+        # Extract text content
+        content = extract_text_from_pdf(pdf_bytes)
+        
+        if not content.strip():
+            return "PDF appears to be empty or contains only images/non-text content.", pdf_bytes
+        
+        # Add metadata header
+        filename = pdf_filename_from_url(url)
+        header = f"**PDF Document: {filename}**\n**Source URL:** {url}\n\n"
+        
+        return header + content, pdf_bytes
+        
+    except Exception as e:
+        return f"Error processing PDF: {str(e)}", None
+
+def get_pdf_content(url, http_client=None):
     """
     Download and extract content from a PDF URL.
     """
-    with tempfile.TemporaryDirectory() as temp_dir:
-        try:
-            # Download the PDF
-            pdf_path = download_pdf(url, temp_dir)
-            
-            # Extract text content
-            content = extract_text_from_pdf(pdf_path)
-            
-            if not content.strip():
-                return "PDF appears to be empty or contains only images/non-text content."
-            
-            # Add metadata header
-            filename = os.path.basename(pdf_path)
-            header = f"**PDF Document: {filename}**\n**Source URL:** {url}\n\n"
-            
-            return header + content
-            
-        except Exception as e:
-            return f"Error processing PDF: {str(e)}"
+    content, _ = read_pdf(url, http_client)
+    return content
 
 class PDFReader(BaseReader):
     """
@@ -129,4 +280,22 @@ class PDFReader(BaseReader):
         Returns:
             The extracted text content from the PDF
         """
-        return get_pdf_content(url)
+        return get_pdf_content(url, self.http)
+    
+    def read_document(self, url: str) -> tuple[str, dict | None]:
+        """
+        Read a PDF URL and keep the downloaded bytes for archival.
+        """
+        return self._with_artifact(url, *read_pdf(url, self.http))
+    
+    def read_document_from_bytes(self, url: str, pdf_bytes: bytes) -> tuple[str, dict | None]:
+        """
+        Like ``read_document`` for a PDF whose bytes were already fetched.
+        """
+        return self._with_artifact(url, *read_pdf_bytes(url, pdf_bytes))
+    
+    @staticmethod
+    def _with_artifact(url, content, pdf_bytes):
+        if pdf_bytes is None:
+            return content, None
+        return content, {'filename': pdf_filename_from_url(url), 'data': pdf_bytes}
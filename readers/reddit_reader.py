@@ -1,11 +1,11 @@
 import praw
 import os
-import requests
+from .http_client import get_http_client
 
-def resolve_reddit_url(short_url):
+def resolve_reddit_url(short_url, http_client=None):
     # FIXME: This is a temporary solution to resolve the short URL
     # Reddit may block server IP for simple redictions while local laptop was OK
-    response = requests.get(short_url, allow_redirects=True)
+    response = (http_client or get_http_client()).get(short_url, allow_redirects=True)
     return response.url
 
 def extract_submission_id(url):
@@ -16,10 +16,10 @@ def extract_submission_id(url):
     else:
         return None
 
-def fetch_reddit_thread_content(thread_url, client_id, client_secret, user_agent):
+def fetch_reddit_thread_content(thread_url, client_id, client_secret, user_agent, http_client=None):
     # Check if the URL needs to be resolved
     if '/s/' in thread_url:
-        final_url = resolve_reddit_url(thread_url)
+        final_url = resolve_reddit_url(thread_url, http_client)
     else:
         final_url = thread_url
 
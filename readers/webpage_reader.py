@@ -1,15 +1,14 @@
 from .base_reader import BaseReader
-import requests
 from bs4 import BeautifulSoup
 
 class WebpageReader(BaseReader):
     def read(self, url: str) -> str:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3"
-        }
+        response = self.http.get(url)
+        return self.parse(response.text)
 
-        response = requests.get(url,headers=headers)
-        soup = BeautifulSoup(response.text, 'html.parser')
+    def parse(self, html: str) -> str:
+        """Extract readable text from an already fetched HTML page."""
+        soup = BeautifulSoup(html, 'html.parser')
         
         # Remove script and style tags
         for script in soup(["script", "style"]):
@@ -1,4 +1,5 @@
 import requests
+from .http_client import get_http_client
 from bs4 import BeautifulSoup
 import html2text
 import re
@@ -6,7 +7,7 @@ import json
 from urllib.parse import urlparse, parse_qs
 from .aikeke_reader import extract_aikeke_content
 
-def wechat_to_markdown(url):
+def wechat_to_markdown(url, http_client=None):
     """
     Load WeChat article, convert to markdown, extract arxiv links and save as JSON.
     
@@ -20,20 +21,15 @@ def wechat_to_markdown(url):
     parsed_url = urlparse(url)
     article_id = parsed_url.path.split('/')[-1]
     
-    # Configure headers to mimic browser request
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
     try:
         # Fetch the article
-        response = requests.get(url, headers=headers)
+        response = (http_client or get_http_client()).get(url)
         response.raise_for_status()
         
         # Check if it's an 爱可可 article
         if "爱可可" in response.text:
             print(f"[DEBUG] Found 爱可可 article, using aikeke_reader for: {url}")
-            result = extract_aikeke_content(url)
+            result = extract_aikeke_content(url, http_client)
             if result:
                 print(f"[DEBUG] Extracted {len(result['arxiv_links'])} arxiv links and {len(result['github_links'])} github links")
                 print("[DEBUG] ArXiv links:", result['arxiv_links'])
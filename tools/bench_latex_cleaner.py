@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Equivalence check and microbenchmark for the arXiv LaTeX cleaner
+
+Compares readers/latex_cleaner.clean_text against the original multi-pass
+implementation (kept below as the reference), first on randomly generated
+markup-heavy strings, then on the text blocks of a corpus of arXiv HTML pages.
+Without a corpus, a synthetic long paper is used.
+
+Usage:
+    python tools/bench_latex_cleaner.py [html_dir] [--fuzz N] [--repeat N]
+
+Examples:
+    python tools/bench_latex_cleaner.py
+    python tools/bench_latex_cleaner.py saved_html/ --repeat 5
+"""
+
+import os
+import sys
+import re
+import random
+import time
+import argparse
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from readers.latex_cleaner import clean_text
+
+# --- Reference implementation (readers/arxiv_reader.py before the single cleaner) ---
+
+def legacy_remove_latex_equations(text):
+    pattern = r'\\(?:begin\{[a-z]*\}|end\{[a-z]*\}|[a-zA-Z]+\{.*?\}|[a-zA-Z]+)'
+    clean_text = re.sub(pattern, '', text)
+    clean_text = re.sub(r'\\[a-zA-Z]+', '', clean_text)
+    clean_text = re.sub(r'\{|\}', '', clean_text)
+    return clean_text
+
+def legacy_remove_complex_latex(text):
+    patterns = [
+        r'\([^\)]*\)',
+        r'\[[^\]]*\]',
+        r'\\[a-zA-Z]+\[[^\]]*\]',
+        r'\\[a-zA-Z]+',
+        r'\{[^\}]*\}',
+        r'[a-zA-Z]\[[^\]]*\]',
+        r'\^[^\s]+',
+        r'_\{[^\}]*\}',
+        r'bold_[a-zA-Z]',
+        r'italic_[a-zA-Z]',
+        r'fraktur_[a-zA-Z]',
+        r'over\^[^\s]+',
+        r'start_[A-Z]+',
+        r'end_[A-Z]+'
+    ]
+    clean_text = text
+    for pattern in patterns:
+        clean_text = re.sub(pattern, '', clean_text)
+    clean_text = re.sub(r'[\{\}\[\]\(\)]', '', clean_text)
+    clean_text = re.sub(r'\s+', ' ', clean_text).strip()
+    return clean_text
+
+def legacy_clean_text(text):
+    cleaned_text = re.sub(r'[^\x00-\x7F]+', '', text)
+    cleaned_text = legacy_remove_latex_equations(cleaned_text)
+    cleaned_text = legacy_remove_complex_latex(cleaned_text)
+    return cleaned_text
+
+# --- Inputs ---
+
+FUZZ_TOKENS = [
+    '\\', '{', '}', '[', ']', '(', ')', '^', '_', ' ', '\n', '\t', 'a', 'B', 'x', '1', '.', 'é', '∑',
+    '\\frac', '\\begin{eq}', '\\end{eq}', '\\alpha', 'begin', 'end', 'bold_', 'italic_', 'fraktur_',
+    'over^', 'start_', 'end_', 'POSTSUBSCRIPT', 'italic', 'bold', 'x^2', '_{i}', '\\cmd[', 'X[',
+]
+
+def fuzz_inputs(count, seed=0):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield ''.join(rng.choice(FUZZ_TOKENS) for _ in range(rng.randint(0, 40)))
+
+SYNTHETIC_BLOCKS = [
+    "We propose a new method for training large language models efficiently (see Section 3).",
+    "The loss is \\mathcal{L}(\\theta) = \\sum_{i=1}^{N} \\log p_\\theta(x_i) [Eq. 2], minimized with Adam.",
+    "Let bold_x start_POSTSUBSCRIPT italic_i end_POSTSUBSCRIPT denote the input over^ ~ embedding.",
+    "Results in Table 2 show a 3.2% improvement over the baseline [12, 15] on all benchmarks.",
+    "\\begin{equation} f(x) = \\frac{1}{Z} e^{-E(x)} \\end{equation} where Z is the partition function.",
+    "Our code is available at https://github.com/example/project and the data under CC-BY 4.0 licence.",
+]
+
+def synthetic_paper(blocks=20000, seed=0):
+    rng = random.Random(seed)
+    return [' '.join(rng.choice(SYNTHETIC_BLOCKS) for _ in range(rng.randint(1, 4))) for _ in range(blocks)]
+
+def corpus_blocks(html_dir):
+    """Text blocks of every .html file, extracted the way arxiv_reader.parse_html sees them."""
+    from bs4 import BeautifulSoup
+    blocks = []
+    for name in sorted(os.listdir(html_dir)):
+        if not name.endswith('.html'):
+            continue
+        with open(os.path.join(html_dir, name), encoding='utf-8') as f:
+            soup = BeautifulSoup(f.read(), 'html.parser')
+        for element in soup.find_all(['h1', 'h2', 'p', 'div', 'section', 'figure', 'table']):
+            blocks.append(element.get_text(strip=True))
+    return blocks
+
+# --- Checks ---
+
+def check_equivalence(inputs):
+    checked = 0
+    for text in inputs:
+        expected = legacy_clean_text(text)
+        actual = clean_text(text)
+        if expected != actual:
+            print(f"❌ Mismatch for {text!r}:\n   legacy: {expected!r}\n   new:    {actual!r}")
+            return False
+        checked += 1
+    print(f"✅ {checked} inputs produce identical output")
+    return True
+
+def benchmark(blocks, repeat):
+    def run(fn):
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for block in blocks:
+                fn(block)
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    legacy = run(legacy_clean_text)
+    new = run(clean_text)
+    total_chars = sum(len(block) for block in blocks)
+    print(f"📊 {len(blocks)} blocks, {total_chars / 1e6:.2f} M chars (best of {repeat})")
+    print(f"   legacy: {legacy * 1000:.1f} ms")
+    print(f"   new:    {new * 1000:.1f} ms ({legacy / new:.1f}x faster)")
+
+def main():
+    parser = argparse.ArgumentParser(description='Check and benchmark the arXiv LaTeX cleaner')
+    parser.add_argument('html_dir', nargs='?', help='Directory of saved arXiv HTML pages')
+    parser.add_argument('--fuzz', type=int, default=200000, help='Number of random inputs to compare')
+    parser.add_argument('--repeat', type=int, default=3, help='Benchmark repetitions')
+    args = parser.parse_args()
+
+    blocks = corpus_blocks(args.html_dir) if args.html_dir else synthetic_paper()
+
+    if not check_equivalence(fuzz_inputs(args.fuzz)) or not check_equivalence(blocks):
+        sys.exit(1)
+    benchmark(blocks, args.repeat)
+
+if __name__ == '__main__':
+    main()
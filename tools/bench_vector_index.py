@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Recall versus latency benchmark for the HNSW vector index
+
+Builds the exact NumPy index and the HNSW index over the same vectors, then for each
+search ``ef`` reports recall@k against the exact results and the per-query latency
+of both. By default the vectors are synthetic (clustered, like real embeddings);
+with --db the embeddings stored in a bot database are used instead.
+
+With --users the queries are filtered by user. The ``hnsw ef=`` lines then force the
+filtered graph search, and the ``hnsw small`` line shows the path the index takes for
+filters matching at most ``EXACT_FILTER_LIMIT`` documents (exact scoring of that
+user's vectors), which is what per-user ``!related`` queries normally hit.
+
+Usage:
+    python tools/bench_vector_index.py [--n N] [--dim D] [--queries Q] [--k K] [--ef 16,32,64] [--users U] [--db PATH]
+
+Examples:
+    python tools/bench_vector_index.py --n 100000 --dim 1536
+    python tools/bench_vector_index.py --users 50    # also measure per-user filtered queries
+    python tools/bench_vector_index.py --db discord_bot.db
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from vector_index import VectorIndex, HnswIndex
+
+def synthetic_vectors(n, dim, clusters=256, seed=0):
+    """Points scattered around random cluster centres, so neighbours are meaningful."""
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((clusters, dim)).astype(np.float32)
+    assignment = rng.integers(0, clusters, n)
+    return centres[assignment] + 0.5 * rng.standard_normal((n, dim)).astype(np.float32)
+
+def database_vectors(db_path):
+    from database_manager import DatabaseManager, decode_embedding
+    db = DatabaseManager(db_path)
+    rows = list(db._iter_embedding_rows())
+    db.close()
+    vectors = [decode_embedding(row[3]) for row in rows]
+    dim = max((len(vector) for vector in vectors), default=0)
+    return np.stack([vector for vector in vectors if len(vector) == dim])
+
+def percentile_ms(samples, q):
+    return np.percentile(samples, q) * 1000
+
+def run_queries(index, queries, k, user_ids):
+    latencies, results = [], []
+    for query, user_id in zip(queries, user_ids):
+        start = time.perf_counter()
+        matches = index.search(query, k=k, user_id=user_id)
+        latencies.append(time.perf_counter() - start)
+        results.append([doc_id for doc_id, _ in matches])
+    return latencies, results
+
+def recall(results, truth):
+    found = sum(len(set(result) & set(expected)) for result, expected in zip(results, truth))
+    return found / max(sum(len(expected) for expected in truth), 1)
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark HNSW recall and latency against the exact index')
+    parser.add_argument('--n', type=int, default=100000, help='Number of synthetic vectors')
+    parser.add_argument('--dim', type=int, default=1536, help='Dimension of synthetic vectors')
+    parser.add_argument('--queries', type=int, default=200, help='Number of queries')
+    parser.add_argument('--k', type=int, default=10, help='Neighbours per query')
+    parser.add_argument('--ef', default='16,32,64,128,256', help='Comma-separated search ef values')
+    parser.add_argument('--users', type=int, default=0, help='Spread vectors over this many users and filter queries by user')
+    parser.add_argument('--db', help='Use the embeddings stored in this bot database')
+    args = parser.parse_args()
+
+    vectors = database_vectors(args.db) if args.db else synthetic_vectors(args.n, args.dim)
+    n, dim = vectors.shape
+    rng = np.random.default_rng(1)
+    users = [f'user{i % args.users}' for i in range(n)] if args.users else [None] * n
+    picked = rng.choice(n, size=min(args.queries, n), replace=False)
+    # Perturbed copies of stored vectors, as a query is rarely an exact duplicate
+    queries = vectors[picked] + 0.1 * rng.standard_normal((len(picked), dim)).astype(np.float32)
+    query_users = [users[i] for i in picked]
+    print(f"📊 {n} vectors, dim {dim}, {len(queries)} queries, k={args.k}"
+          + (f", filtered by {args.users} users" if args.users else ""))
+
+    exact = VectorIndex()
+    hnsw = HnswIndex()
+    start = time.perf_counter()
+    for doc_id, (vector, user_id) in enumerate(zip(vectors, users)):
+        exact.upsert(doc_id, vector, user_id)
+    print(f"   exact build: {time.perf_counter() - start:.1f}s")
+    start = time.perf_counter()
+    for doc_id, (vector, user_id) in enumerate(zip(vectors, users)):
+        hnsw.upsert(doc_id, vector, user_id)
+    print(f"   hnsw build:  {time.perf_counter() - start:.1f}s")
+
+    latencies, truth = run_queries(exact, queries, args.k, query_users)
+    print(f"\n   {'index':<12} {'recall@' + str(args.k):>10} {'p50 ms':>8} {'p95 ms':>8}")
+    print(f"   {'exact':<12} {1.0:>10.3f} {percentile_ms(latencies, 50):>8.2f} {percentile_ms(latencies, 95):>8.2f}")
+    if args.users:
+        latencies, results = run_queries(hnsw, queries, args.k, query_users)
+        print(f"   {'hnsw small':<12} {recall(results, truth):>10.3f} "
+              f"{percentile_ms(latencies, 50):>8.2f} {percentile_ms(latencies, 95):>8.2f}")
+        hnsw.EXACT_FILTER_LIMIT = 0  # Send every filtered query through the graph
+    for ef in [int(value) for value in args.ef.split(',')]:
+        hnsw.EF_SEARCH = ef
+        latencies, results = run_queries(hnsw, queries, args.k, query_users)
+        print(f"   {'hnsw ef=' + str(ef):<12} {recall(results, truth):>10.3f} "
+              f"{percentile_ms(latencies, 50):>8.2f} {percentile_ms(latencies, 95):>8.2f}")
+
+if __name__ == '__main__':
+    main()
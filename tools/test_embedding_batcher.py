@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Behaviour checks for EmbeddingBatcher: batching, per-text failures and mismatched results
+"""
+
+import os
+import sys
+import asyncio
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from utils.embedding_batcher import EmbeddingBatcher
+
+def fake_service(batches, result=None):
+    """An embed_batch that records each batch and returns one vector per text by default."""
+    async def embed_batch(texts):
+        batches.append(list(texts))
+        await asyncio.sleep(0)
+        return result(texts) if result else [[float(len(text))] for text in texts]
+    return embed_batch
+
+async def check_batching():
+    """Concurrent requests go out as one call, each caller gets its own vector."""
+    batches = []
+    batcher = EmbeddingBatcher(fake_service(batches), max_batch=64, max_wait=0.01)
+    texts = ['a', 'bb', 'ccc', 'dddd']
+    vectors = await asyncio.gather(*(batcher.embed(text) for text in texts))
+    assert batches == [texts], batches
+    assert vectors == [[1.0], [2.0], [3.0], [4.0]], vectors
+
+async def check_max_batch():
+    """A full batch is sent at once; the rest waits for the next flush."""
+    batches = []
+    batcher = EmbeddingBatcher(fake_service(batches), max_batch=3, max_wait=0.01)
+    await asyncio.gather(*(batcher.embed(str(i)) for i in range(7)))
+    assert [len(batch) for batch in batches] == [3, 3, 1], batches
+
+async def check_per_text_failure():
+    """An exception in place of a vector fails only that text."""
+    batcher = EmbeddingBatcher(fake_service([], lambda texts: [[1.0], ValueError('rejected'), [3.0]]))
+    outcomes = await asyncio.gather(*(batcher.embed(text) for text in 'abc'), return_exceptions=True)
+    assert outcomes[0] == [1.0] and outcomes[2] == [3.0], outcomes
+    assert isinstance(outcomes[1], ValueError), outcomes
+
+async def check_short_result():
+    """Fewer vectors than texts fails every request instead of leaving some waiting."""
+    batcher = EmbeddingBatcher(fake_service([], lambda texts: [[1.0]] * (len(texts) - 1)))
+    outcomes = await asyncio.wait_for(
+        asyncio.gather(*(batcher.embed(text) for text in 'abc'), return_exceptions=True), timeout=1)
+    assert all(isinstance(outcome, RuntimeError) for outcome in outcomes), outcomes
+
+async def check_batch_error():
+    """An error from the whole call reaches every request in the batch."""
+    async def failing(texts):
+        raise ConnectionError('service down')
+    batcher = EmbeddingBatcher(failing)
+    outcomes = await asyncio.gather(*(batcher.embed(text) for text in 'ab'), return_exceptions=True)
+    assert all(isinstance(outcome, ConnectionError) for outcome in outcomes), outcomes
+
+async def check_cancelled_send():
+    """Cancelling the send cancels its callers rather than stranding them."""
+    async def hanging(texts):
+        await asyncio.sleep(10)
+    batcher = EmbeddingBatcher(hanging, max_wait=0.001)
+    request = asyncio.ensure_future(batcher.embed('a'))
+    await asyncio.sleep(0.01)
+    for task in list(batcher._tasks):
+        task.cancel()
+    try:
+        await asyncio.wait_for(request, timeout=1)
+        raise AssertionError("request finished")
+    except asyncio.CancelledError:
+        pass
+
+CHECKS = [
+    ("Concurrent requests share one call", check_batching),
+    ("max_batch splits large bursts", check_max_batch),
+    ("A rejected text fails alone", check_per_text_failure),
+    ("A short result fails the whole batch", check_short_result),
+    ("A failed call fails every request", check_batch_error),
+    ("A cancelled send cancels its requests", check_cancelled_send),
+]
+
+def main():
+    print("🧪 Testing EmbeddingBatcher")
+    print("=" * 50)
+    failures = 0
+    for name, check in CHECKS:
+        try:
+            asyncio.run(check())
+            print(f"   ✅ {name}")
+        except Exception as e:
+            failures += 1
+            print(f"   ❌ {name}: {e!r}")
+    print(f"\n{'🎉 All checks passed!' if not failures else f'❌ {failures} check(s) failed'}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
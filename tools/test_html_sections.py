@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Behaviour checks for the section walker used by the arXiv and Hugging Face readers:
+iter_section_siblings must collect the same sections as the find_next_siblings() loop
+it replaced, with either parser
+"""
+
+import os
+import sys
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from bs4 import BeautifulSoup
+from readers.html_utils import HTML_PARSER, iter_section_siblings
+
+def make_page(sections=200, paragraphs=5):
+    """A page of h2 sections with paragraphs, lists, h3 subheadings and loose text between tags."""
+    parts = ['<html><body><p>Intro before any section</p>']
+    for i in range(sections):
+        parts.append(f'<h2>Section {i}</h2>\n')
+        for j in range(paragraphs):
+            parts.append(f'<p>Paragraph {i}.{j}</p> loose text {j}\n')
+        if i % 3 == 0:
+            parts.append(f'<h3>Subsection {i}</h3><ul><li>Item {i}</li></ul>')
+    parts.append('<div class="footer">Footer</div></body></html>')
+    return ''.join(parts)
+
+def sections_before(soup):
+    """The original per-heading loop over find_next_siblings()."""
+    sections = {}
+    for heading in soup.find_all('h2'):
+        content = []
+        for sibling in heading.find_next_siblings():
+            if sibling.name == 'h2':
+                break
+            content.append(sibling.get_text(strip=True))
+        sections[heading.get_text(strip=True)] = ' '.join(content)
+    return sections
+
+def sections_after(soup):
+    """The current loop, as in parse_huggingface_html."""
+    sections = {}
+    for heading in soup.find_all('h2'):
+        content = [sibling.get_text(strip=True) for sibling in iter_section_siblings(heading)]
+        sections[heading.get_text(strip=True)] = ' '.join(content)
+    return sections
+
+def check_matches_find_next_siblings():
+    """Both loops produce identical sections with every available parser."""
+    html = make_page()
+    for parser in sorted({'html.parser', HTML_PARSER}):
+        soup = BeautifulSoup(html, parser)
+        expected = sections_before(soup)
+        assert len(expected) == 200, f"{parser}: {len(expected)} sections"
+        assert sections_after(soup) == expected, f"{parser}: sections differ"
+
+def check_section_boundaries():
+    """A section stops at the next h2, skips loose text and keeps the last section's tail."""
+    soup = BeautifulSoup(make_page(sections=3, paragraphs=2), HTML_PARSER)
+    headings = soup.find_all('h2')
+    first = [sibling.name for sibling in iter_section_siblings(headings[0])]
+    assert first == ['p', 'p', 'h3', 'ul'], first
+    last = [sibling.get_text(strip=True) for sibling in iter_section_siblings(headings[-1])]
+    assert last == ['Paragraph 2.0', 'Paragraph 2.1', 'Footer'], last
+
+def check_custom_stop():
+    """stop_name ends a section at other heading levels."""
+    soup = BeautifulSoup(make_page(sections=1, paragraphs=2), HTML_PARSER)
+    heading = soup.find('h2')
+    content = [sibling.name for sibling in iter_section_siblings(heading, stop_name='h3')]
+    assert content == ['p', 'p'], content
+
+CHECKS = [
+    ("Sections match the find_next_siblings() loop", check_matches_find_next_siblings),
+    ("Section boundaries", check_section_boundaries),
+    ("Custom stop tag", check_custom_stop),
+]
+
+def main():
+    print("🧪 Testing HTML section walker")
+    print("=" * 50)
+    failures = 0
+    for name, check in CHECKS:
+        try:
+            check()
+            print(f"   ✅ {name}")
+        except Exception as e:
+            failures += 1
+            print(f"   ❌ {name}: {e!r}")
+    print(f"\n{'🎉 All checks passed!' if not failures else f'❌ {failures} check(s) failed'}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Behaviour checks for IngestionQueue: per-user fairness, queue positions, cancellation and shutdown
+"""
+
+import os
+import sys
+import asyncio
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from utils.ingestion_queue import IngestionQueue
+
+def recorder(order, label, delay=0.01):
+    async def job():
+        order.append(label)
+        await asyncio.sleep(delay)
+        return label
+    return job
+
+async def check_round_robin():
+    """One user's backlog is interleaved with another user's jobs."""
+    queue = IngestionQueue(num_workers=1)
+    order = []
+    # Occupy the only worker so everything below queues up before dispatch starts
+    blocker = asyncio.ensure_future(queue.submit('c', recorder(order, 'c0', delay=0.05)))
+    await asyncio.sleep(0.01)
+    jobs = [asyncio.ensure_future(queue.submit('a', recorder(order, f'a{i}'))) for i in range(4)]
+    await asyncio.sleep(0)
+    jobs += [asyncio.ensure_future(queue.submit('b', recorder(order, f'b{i}'))) for i in range(2)]
+    results = await asyncio.gather(blocker, *jobs)
+    assert order == ['c0', 'a0', 'b0', 'a1', 'b1', 'a2', 'a3'], order
+    assert results[1:] == ['a0', 'a1', 'a2', 'a3', 'b0', 'b1']
+    await queue.close()
+
+async def check_positions():
+    """Waiting jobs are told their position, and it moves up as jobs are dispatched."""
+    queue = IngestionQueue(num_workers=1)
+    order, positions = [], []
+    blocker = asyncio.ensure_future(queue.submit('a', recorder(order, 'a0', delay=0.05)))
+    await asyncio.sleep(0.01)
+    first = asyncio.ensure_future(queue.submit('a', recorder(order, 'a1')))
+    second = asyncio.ensure_future(queue.submit('b', recorder(order, 'b0'), on_position=positions.append))
+    await asyncio.gather(blocker, first, second)
+    assert positions == [2, 1], positions
+    await queue.close()
+
+async def check_bounded_workers():
+    """No more than num_workers jobs run at once."""
+    queue = IngestionQueue(num_workers=2)
+    running, peak = 0, 0
+
+    async def job():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    await asyncio.gather(*(queue.submit(f'user{i % 3}', job) for i in range(9)))
+    assert peak == 2, f"peak concurrency {peak}"
+    await queue.close()
+
+async def check_waiting_cancellation():
+    """A job cancelled while it waits is never run."""
+    queue = IngestionQueue(num_workers=1)
+    order = []
+    blocker = asyncio.ensure_future(queue.submit('a', recorder(order, 'a0', delay=0.05)))
+    await asyncio.sleep(0.01)
+    waiting = asyncio.ensure_future(queue.submit('b', recorder(order, 'b0')))
+    await asyncio.sleep(0.01)
+    waiting.cancel()
+    await blocker
+    await asyncio.sleep(0.02)
+    assert order == ['a0'], order
+    assert queue.pending_count() == 0
+    await queue.close()
+
+async def check_failing_jobs():
+    """Exceptions and self-cancelled jobs reach their caller, and the worker keeps serving."""
+    queue = IngestionQueue(num_workers=1)
+
+    async def failing():
+        raise ValueError('bad page')
+
+    async def cancelling():
+        raise asyncio.CancelledError()
+
+    try:
+        await queue.submit('a', failing)
+        raise AssertionError("exception not propagated")
+    except ValueError:
+        pass
+    try:
+        await asyncio.wait_for(queue.submit('a', cancelling), timeout=1)
+        raise AssertionError("cancellation not propagated")
+    except asyncio.CancelledError:
+        pass
+    assert await asyncio.wait_for(queue.submit('a', recorder([], 'after')), timeout=1) == 'after'
+    assert queue.active_jobs == 0
+    await queue.close()
+
+async def check_close():
+    """close() cancels running and queued jobs, and later submissions are refused."""
+    queue = IngestionQueue(num_workers=1)
+    running = asyncio.ensure_future(queue.submit('a', recorder([], 'a0', delay=10)))
+    queued = asyncio.ensure_future(queue.submit('b', recorder([], 'b0')))
+    await asyncio.sleep(0.01)
+    await queue.close()
+    for job in (running, queued):
+        try:
+            await asyncio.wait_for(job, timeout=1)
+            raise AssertionError("job finished after close")
+        except asyncio.CancelledError:
+            pass
+    try:
+        await queue.submit('a', recorder([], 'late'))
+        raise AssertionError("closed queue accepted a job")
+    except RuntimeError:
+        pass
+
+CHECKS = [
+    ("Round-robin across users", check_round_robin),
+    ("Queue position updates", check_positions),
+    ("Worker count bounds concurrency", check_bounded_workers),
+    ("Cancelled waiting job is skipped", check_waiting_cancellation),
+    ("Failing jobs do not kill workers", check_failing_jobs),
+    ("close() resolves every job", check_close),
+]
+
+def main():
+    print("🧪 Testing IngestionQueue")
+    print("=" * 50)
+    failures = 0
+    for name, check in CHECKS:
+        try:
+            asyncio.run(check())
+            print(f"   ✅ {name}")
+        except Exception as e:
+            failures += 1
+            print(f"   ❌ {name}: {e!r}")
+    print(f"\n{'🎉 All checks passed!' if not failures else f'❌ {failures} check(s) failed'}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,6 +7,7 @@ import os
 import sys
 import time
 import json
+import threading
 
 # Add project root to path
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
@@ -194,7 +195,100 @@ def test_migration_compatibility():
             shutil.rmtree(test_dir)
         print(f"\n🧹 Migration test cleanup completed")
 
+def test_connection_management():
+    """Test WAL mode, per-thread connections and reads during a write."""
+    print("\n" + "=" * 50)
+    print("🔌 Testing Connection Management")
+    print("=" * 50)
+    
+    test_db_path = "test_connections.db"
+    if os.path.exists(test_db_path):
+        os.remove(test_db_path)
+    
+    db = DatabaseManager(test_db_path, busy_timeout=1.0)
+    
+    try:
+        doc_id = db.add_document(
+            url="https://example.com/committed",
+            doc_type="webpage",
+            timestamp=time.time(),
+            summary="Committed document",
+            file_path=None,
+            keywords=["committed"],
+            embedding=[0.1, 0.2, 0.3],
+            content_preview="Committed before the write below"
+        )
+        
+        # Test 1: Journal mode
+        print("\n1. 📒 Testing journal mode...")
+        journal_mode = db._connect().execute('PRAGMA journal_mode').fetchone()[0]
+        print(f"   Journal mode: {journal_mode}")
+        assert journal_mode == 'wal', f"expected WAL, got {journal_mode}"
+        
+        # Test 2: One connection per thread, reused within the thread
+        print("\n2. 🧵 Testing per-thread connections...")
+        main_conn = db._connect()
+        assert db._connect() is main_conn, "connection not reused within a thread"
+        other = {}
+        worker = threading.Thread(target=lambda: other.setdefault('conn', db._connect()))
+        worker.start()
+        worker.join()
+        assert other['conn'] is not main_conn, "threads share a connection"
+        print(f"   Open connections: {len(db._connections)}")
+        
+        # Test 3: A reader is not blocked by an open write transaction
+        print("\n3. 📖 Testing a read during a write...")
+        writer_ready = threading.Event()
+        reader_done = threading.Event()
+        
+        def writer():
+            conn = db._connect()
+            conn.execute('BEGIN IMMEDIATE')
+            conn.execute(
+                "INSERT INTO documents (url, type, timestamp) VALUES ('https://example.com/pending', 'webpage', ?)",
+                (time.time(),)
+            )
+            writer_ready.set()
+            reader_done.wait(timeout=5)
+            conn.rollback()
+        
+        write_thread = threading.Thread(target=writer)
+        write_thread.start()
+        writer_ready.wait(timeout=5)
+        start = time.time()
+        committed = db.get_document_by_id(doc_id)
+        pending = db.check_existing_document("https://example.com/pending")
+        elapsed = time.time() - start
+        reader_done.set()
+        write_thread.join()
+        print(f"   Read took {elapsed * 1000:.1f} ms while the write was open")
+        assert committed is not None, "committed document not readable"
+        assert pending is None, "uncommitted row visible to the reader"
+        assert elapsed < db.busy_timeout, "reader waited for the writer"
+        
+        # Test 4: close() closes every thread's connection, and the manager reconnects
+        print("\n4. 🔒 Testing close and reconnect...")
+        db.close()
+        assert not db._connections, "connections left open after close"
+        assert db.get_document_by_id(doc_id) is not None, "manager did not reconnect"
+        print("   Reconnected after close")
+        
+        print("\n✅ Connection management test passed!")
+        
+    except Exception as e:
+        print(f"\n❌ Connection management test failed: {e!r}")
+        import traceback
+        traceback.print_exc()
+        
+    finally:
+        db.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(test_db_path + suffix):
+                os.remove(test_db_path + suffix)
+        print(f"\n🧹 Connection test cleanup completed")
+
 if __name__ == "__main__":
     test_new_schema_features()
     test_migration_compatibility()
+    test_connection_management()
     print("\n🎉 All tests completed successfully!")
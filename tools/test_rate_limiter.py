@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Behaviour checks for the token bucket and RateLimiter used for OpenAI calls
+"""
+
+import os
+import sys
+import time
+import asyncio
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from utils.rate_limiter import TokenBucket, RateLimiter
+
+# Timing checks allow this much scheduling slack, in seconds
+SLACK = 0.05
+
+async def check_burst_then_refill():
+    """A full bucket serves a burst at once, then refills at the configured rate."""
+    bucket = TokenBucket(rate_per_minute=600, capacity=3)  # 10 tokens per second
+    start = time.monotonic()
+    for _ in range(3):
+        await bucket.acquire()
+    assert time.monotonic() - start < SLACK, "burst within capacity was delayed"
+    await bucket.acquire()
+    waited = time.monotonic() - start
+    assert 0.1 - SLACK / 2 <= waited <= 0.1 + SLACK, f"waited {waited:.3f}s for one token at 10/s"
+
+async def check_refill_is_capped():
+    """An idle bucket does not accumulate more than its capacity."""
+    bucket = TokenBucket(rate_per_minute=600, capacity=2)  # 10 tokens per second
+    await asyncio.sleep(0.3)  # Long enough to refill 3 more tokens without the cap
+    start = time.monotonic()
+    for _ in range(3):
+        await bucket.acquire()
+    waited = time.monotonic() - start
+    assert waited >= 0.1 - SLACK / 2, f"third token after {waited:.3f}s: bucket refilled past its capacity"
+
+async def check_oversized_request():
+    """A request larger than the capacity is charged the capacity instead of waiting forever."""
+    bucket = TokenBucket(rate_per_minute=60, capacity=5)
+    await asyncio.wait_for(bucket.acquire(50), timeout=1)
+    assert bucket.available < 1
+
+async def check_fifo():
+    """Waiters are served in arrival order."""
+    bucket = TokenBucket(rate_per_minute=1200, capacity=1)  # 20 tokens per second
+    order = []
+
+    async def waiter(label):
+        await bucket.acquire()
+        order.append(label)
+
+    tasks = []
+    for label in range(5):
+        tasks.append(asyncio.ensure_future(waiter(label)))
+        await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+    assert order == list(range(5)), order
+
+async def check_rate_limiter():
+    """RateLimiter applies both rate limits and the shared concurrency limit."""
+    semaphore = asyncio.Semaphore(2)
+    limiter = RateLimiter(requests_per_minute=60000, tokens_per_minute=60000, semaphore=semaphore)
+    running, peak = 0, 0
+
+    async def call():
+        nonlocal running, peak
+        async with limiter.limit(10):
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    await asyncio.gather(*(call() for _ in range(6)))
+    assert peak == 2, f"peak concurrency {peak}"
+
+    # 2 requests per second: the third call has to wait for a refill
+    slow = RateLimiter(requests_per_minute=120, tokens_per_minute=60000, semaphore=asyncio.Semaphore(8))
+    slow.requests = TokenBucket(120, capacity=2)
+    start = time.monotonic()
+    for _ in range(3):
+        async with slow.limit(1):
+            pass
+    waited = time.monotonic() - start
+    assert 0.5 - SLACK / 2 <= waited <= 0.5 + SLACK, f"waited {waited:.3f}s for the third request at 2/s"
+
+CHECKS = [
+    ("Burst up to capacity, then refill rate", check_burst_then_refill),
+    ("Refill is capped at capacity", check_refill_is_capped),
+    ("Oversized requests still go through", check_oversized_request),
+    ("Waiters are served in order", check_fifo),
+    ("RateLimiter combines rate and concurrency limits", check_rate_limiter),
+]
+
+def main():
+    print("🧪 Testing TokenBucket and RateLimiter")
+    print("=" * 50)
+    failures = 0
+    for name, check in CHECKS:
+        try:
+            asyncio.run(check())
+            print(f"   ✅ {name}")
+        except Exception as e:
+            failures += 1
+            print(f"   ❌ {name}: {e!r}")
+    print(f"\n{'🎉 All checks passed!' if not failures else f'❌ {failures} check(s) failed'}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
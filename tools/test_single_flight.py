@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Behaviour checks for SingleFlight: coalescing, error propagation and cancellation
+"""
+
+import os
+import sys
+import asyncio
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from utils.single_flight import SingleFlight
+
+async def check_coalescing():
+    """Concurrent calls for one key run the work once and all get its result."""
+    flights = SingleFlight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return 'result'
+
+    outcomes = await asyncio.gather(*(flights.do('key', work) for _ in range(5)))
+    assert len(calls) == 1, f"work ran {len(calls)} times"
+    assert [result for result, _ in outcomes] == ['result'] * 5
+    assert [shared for _, shared in outcomes] == [False, True, True, True, True]
+    assert not flights.in_flight('key'), "key not released after the work finished"
+
+    # A later call starts fresh work
+    await flights.do('key', work)
+    assert len(calls) == 2
+
+async def check_distinct_keys():
+    """Different keys do not share work."""
+    flights = SingleFlight()
+    calls = []
+
+    async def work(key):
+        calls.append(key)
+        await asyncio.sleep(0.01)
+        return key
+
+    outcomes = await asyncio.gather(flights.do('a', lambda: work('a')), flights.do('b', lambda: work('b')))
+    assert sorted(calls) == ['a', 'b']
+    assert [result for result, _ in outcomes] == ['a', 'b']
+
+async def check_error_propagation():
+    """Every waiter sees the exception, and the key is released for a retry."""
+    flights = SingleFlight()
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise ValueError('fetch failed')
+
+    outcomes = await asyncio.gather(*(flights.do('key', failing) for _ in range(3)), return_exceptions=True)
+    assert all(isinstance(outcome, ValueError) for outcome in outcomes), outcomes
+    assert not flights.in_flight('key')
+
+async def check_follower_cancellation():
+    """Cancelling one waiter does not cancel the shared work for the others."""
+    flights = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.05)
+        return 'done'
+
+    leader = asyncio.ensure_future(flights.do('key', work))
+    follower = asyncio.ensure_future(flights.do('key', work))
+    await asyncio.sleep(0.01)
+    follower.cancel()
+    result, shared = await leader
+    assert (result, shared) == ('done', False)
+    assert follower.cancelled()
+
+CHECKS = [
+    ("Concurrent calls are coalesced", check_coalescing),
+    ("Distinct keys run separately", check_distinct_keys),
+    ("Errors reach every waiter", check_error_propagation),
+    ("A cancelled waiter leaves the work running", check_follower_cancellation),
+]
+
+def main():
+    print("🧪 Testing SingleFlight")
+    print("=" * 50)
+    failures = 0
+    for name, check in CHECKS:
+        try:
+            asyncio.run(check())
+            print(f"   ✅ {name}")
+        except Exception as e:
+            failures += 1
+            print(f"   ❌ {name}: {e!r}")
+    print(f"\n{'🎉 All checks passed!' if not failures else f'❌ {failures} check(s) failed'}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
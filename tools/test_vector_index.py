@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Behaviour checks for the vector indexes: exact search against brute force, and HNSW
+against exact search after updates, deletes (tombstones), a rebuild and a save/load
+
+The HNSW checks are skipped when hnswlib is not installed.
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from vector_index import VectorIndex, HnswIndex, hnswlib
+
+N, DIM, K = 3000, 64, 10
+# Minimum share of the exact top-k the approximate index must return
+MIN_RECALL = 0.9
+
+def make_vectors(n=N, dim=DIM, seed=0):
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((32, dim)).astype(np.float32)
+    return centres[rng.integers(0, 32, n)] + 0.5 * rng.standard_normal((n, dim)).astype(np.float32)
+
+def user_of(doc_id):
+    return f'user{doc_id % 3}'
+
+def type_of(doc_id):
+    return 'paper' if doc_id % 2 else 'webpage'
+
+def brute_force(vectors, query, k, allowed):
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    scores = normalized @ (query / np.linalg.norm(query))
+    ranked = [doc_id for doc_id in np.argsort(-scores) if allowed(doc_id)]
+    return [int(doc_id) for doc_id in ranked[:k]]
+
+def build(index, vectors):
+    for doc_id, vector in enumerate(vectors):
+        index.upsert(doc_id, vector, user_of(doc_id), type_of(doc_id), version=doc_id + 1)
+    return index
+
+def ids(matches):
+    return [doc_id for doc_id, _ in matches]
+
+def recall(index, reference, queries, **filters):
+    found = total = 0
+    for query in queries:
+        expected = set(ids(reference.search(query, k=K, **filters)))
+        found += len(expected & set(ids(index.search(query, k=K, **filters))))
+        total += len(expected)
+    return found / max(total, 1)
+
+def check_exact_matches_brute_force():
+    """VectorIndex returns the same top-k as a brute-force scan, with and without filters."""
+    vectors = make_vectors()
+    index = build(VectorIndex(), vectors)
+    queries = make_vectors(20, seed=1)
+    for query in queries:
+        assert ids(index.search(query, k=K)) == brute_force(vectors, query, K, lambda d: True)
+        assert ids(index.search(query, k=K, user_id='user1', exclude_ids=[1, 4])) == \
+            brute_force(vectors, query, K, lambda d: user_of(d) == 'user1' and d not in (1, 4))
+        assert ids(index.search(query, k=K, user_id='user2', doc_type='paper')) == \
+            brute_force(vectors, query, K, lambda d: user_of(d) == 'user2' and type_of(d) == 'paper')
+    assert index.search(queries[0], k=K, user_id='nobody') == []
+
+def check_exact_updates_and_removals():
+    """Removed documents disappear from results; replaced vectors are searched by their new value."""
+    vectors = make_vectors()
+    index = build(VectorIndex(), vectors)
+    removed = list(range(0, N, 7))
+    for doc_id in removed:
+        assert index.remove(doc_id)
+    assert len(index) == N - len(removed)
+    index.upsert(5, vectors[100], user_of(5), type_of(5))
+    live = set(range(N)) - set(removed)
+    for query in make_vectors(20, seed=2):
+        result = ids(index.search(query, k=K))
+        assert not set(result) & set(removed)
+    top = ids(index.search(vectors[100], k=2))
+    assert set(top) == {5, 100}, top
+    assert 0 not in index and 1 in index and len(live) == len(index)
+
+def check_hnsw_agrees_with_exact():
+    """HNSW finds nearly the same top-k as the exact index, including filtered queries."""
+    vectors = make_vectors()
+    exact = build(VectorIndex(), vectors)
+    hnsw = build(HnswIndex(), vectors)
+    queries = make_vectors(50, seed=3)
+    assert recall(hnsw, exact, queries) >= MIN_RECALL
+    assert recall(hnsw, exact, queries, user_id='user1') >= MIN_RECALL
+    hnsw.EXACT_FILTER_LIMIT = 0  # Send filtered queries through the graph as well
+    assert recall(hnsw, exact, queries, user_id='user1', doc_type='paper') >= MIN_RECALL
+
+def check_hnsw_tombstones():
+    """Deleted and replaced documents are never returned with stale vectors, before and after a rebuild."""
+    vectors = make_vectors()
+    exact = build(VectorIndex(), vectors)
+    hnsw = build(HnswIndex(), vectors)
+    hnsw.REBUILD_MIN_CHANGES = 100
+    rng = np.random.default_rng(4)
+    removed = [int(doc_id) for doc_id in rng.choice(N, 400, replace=False)]
+    for doc_id in removed:
+        exact.remove(doc_id)
+        hnsw.remove(doc_id)
+    moved = [doc_id for doc_id in range(N) if doc_id not in removed][:200]
+    replacements = make_vectors(len(moved), seed=5)
+    for doc_id, vector in zip(moved, replacements):
+        exact.upsert(doc_id, vector, user_of(doc_id), type_of(doc_id))
+        hnsw.upsert(doc_id, vector, user_of(doc_id), type_of(doc_id), version=N + doc_id)
+
+    queries = list(make_vectors(30, seed=6)) + list(replacements[:20])
+    for query in queries:
+        assert not set(ids(hnsw.search(query, k=K))) & set(removed)
+    assert recall(hnsw, exact, queries) >= MIN_RECALL
+    assert hnsw.needs_rebuild()
+
+    # Rebuild from the current vectors, as the database would supply them
+    current = {doc_id: vector for doc_id, vector in enumerate(vectors) if doc_id not in removed}
+    current.update(zip(moved, replacements))
+    assert hnsw.start_rebuild(lambda: iter(current.items()))
+    hnsw._rebuild_thread.join()
+    assert not hnsw.needs_rebuild()
+    assert len(hnsw) == len(current)
+    for query in queries:
+        assert not set(ids(hnsw.search(query, k=K))) & set(removed)
+    assert recall(hnsw, exact, queries) >= MIN_RECALL
+
+def check_hnsw_save_and_load():
+    """A saved index loads with the same contents, versions, tombstones and results."""
+    vectors = make_vectors()
+    hnsw = build(HnswIndex(), vectors)
+    for doc_id in range(0, 300, 3):
+        hnsw.remove(doc_id)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        hnsw.path = os.path.join(temp_dir, 'test.hnsw')
+        hnsw.save()
+        loaded = HnswIndex(path=hnsw.path)
+        assert loaded.load()
+    assert loaded.versions() == hnsw.versions()
+    for query in make_vectors(20, seed=7):
+        assert ids(loaded.search(query, k=K)) == ids(hnsw.search(query, k=K))
+        assert ids(loaded.search(query, k=K, user_id='user0')) == ids(hnsw.search(query, k=K, user_id='user0'))
+
+CHECKS = [
+    ("Exact index matches brute force", check_exact_matches_brute_force, False),
+    ("Exact index updates and removals", check_exact_updates_and_removals, False),
+    ("HNSW top-k agrees with exact", check_hnsw_agrees_with_exact, True),
+    ("HNSW tombstones, updates and rebuild", check_hnsw_tombstones, True),
+    ("HNSW save and load", check_hnsw_save_and_load, True),
+]
+
+def main():
+    print("🧪 Testing vector indexes")
+    print("=" * 50)
+    failures = 0
+    for name, check, needs_hnswlib in CHECKS:
+        if needs_hnswlib and hnswlib is None:
+            print(f"   ⏭️  {name}: skipped (pip install hnswlib)")
+            continue
+        try:
+            check()
+            print(f"   ✅ {name}")
+        except Exception as e:
+            failures += 1
+            print(f"   ❌ {name}: {e!r}")
+    print(f"\n{'🎉 All checks passed!' if not failures else f'❌ {failures} check(s) failed'}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,47 +1,87 @@
 import re
 import time
 import os
-from readers.base_reader import BaseReader
 from readers.arxiv_reader import ArxivReader
+from readers.http_client import revalidate_cache
 from readers.github_reader import GithubReader, GithubIpynbReader
 from readers.huggingface_reader import HuggingfaceReader
-from readers.pdf_reader import PDFReader, is_pdf_url
-from readers.x_reader import XReader, is_x_url
+from readers.pdf_reader import PDFReader, is_pdf_url, is_pdf_response
 from readers.youtube_reader import YoutubeReader
 from readers.webpage_reader import WebpageReader
 
-def get_url_type_and_reader(url) -> tuple[str, BaseReader]:
+try:
+    from readers.x_reader import XReader, is_x_url
+except ImportError:
+    XReader = None  # X/Twitter support is optional
+
+YOUTUBE_RE = re.compile(
+    r'(https?://)?(www\.)?'
+    r'(youtube|youtu|youtube-nocookie)\.(com|be)/'
+    r'(watch\?v=|embed/|v/|.+\?v=)?([^&=%\?]{11})')
+HUGGINGFACE_RE = re.compile(r'https?:\/\/huggingface\.co\/([^\/]+\/[^\/]+)')
+HF_PAPERS_RE = re.compile(r'https?://huggingface\.co/papers/(\d{4}\.\d{4,5}(v\d+)?)')
+ARXIV_RE = re.compile(r'https?://(www\.)?arxiv\.org/')
+
+# Readers are stateless apart from the shared HTTP client, so one instance each is reused
+_webpage_reader = WebpageReader()
+_pdf_reader = PDFReader()
+_arxiv_reader = ArxivReader()
+
+# Routing table, checked in order: (file type, predicate on the https:// URL, reader)
+ROUTES = [
+    ('github', lambda url: 'github.com' in url and 'ipynb' not in url, GithubReader()),
+    ('github_ipynb', lambda url: 'github.com' in url and 'ipynb' in url, GithubIpynbReader()),
+    ('arxiv', ARXIV_RE.search, _arxiv_reader),
+]
+if XReader is not None:
+    ROUTES.append(('x', is_x_url, XReader()))  # Check for X.com/Twitter URLs
+ROUTES += [
+    ('pdf', is_pdf_url, _pdf_reader),  # PDFs by extension; others are sniffed from the response
+    ('wechat', lambda url: 'mp.weixin.qq.com' in url, _webpage_reader),  # Assuming wechat uses general webpage reader
+    ('youtube', YOUTUBE_RE.match, YoutubeReader()),
+    ('arxiv', HF_PAPERS_RE.match, _arxiv_reader),  # Route Hugging Face paper page to arXiv reader
+    ('huggingface', HUGGINGFACE_RE.match, HuggingfaceReader()),
+]
+
+def _ensure_scheme(url):
     if not url.startswith('http://') and not url.startswith('https://'):
         url = 'https://' + url
+    return url
+
+def _match_route(url):
+    for file_type, matches, reader in ROUTES:
+        if matches(url):
+            return file_type, reader
+    return None
+
+def read_url(url, revalidate=False) -> tuple[str, str | dict, dict | None]:
+    """
+    Route and read a URL.
+    
+    General URLs are fetched with a single GET and treated as a PDF when the response
+    says so (content-type or ``%PDF-`` magic bytes), replacing the old HEAD probe.
+    With ``revalidate``, cached responses are checked with the server even while
+    fresh (see ``revalidate_cache``).
     
-    youtube_regex = (
-        r'(https?://)?(www\.)?'
-        '(youtube|youtu|youtube-nocookie)\.(com|be)/'
-        '(watch\?v=|embed/|v/|.+\?v=)?([^&=%\?]{11})')
-    huggingface_regex = (r'https?:\/\/huggingface\.co\/([^\/]+\/[^\/]+)')
-    hf_papers_regex = r'https?://huggingface\.co/papers/(\d{4}\.\d{4,5}(v\d+)?)'
+    Returns:
+        (file_type, content, artifact), as from ``BaseReader.read_document``.
+    """
+    if revalidate:
+        with revalidate_cache():
+            return read_url(url)
 
-    if 'github.com' in url and not 'ipynb' in url:
-        return 'github', GithubReader()
-    elif 'github.com' in url and 'ipynb' in url:
-        return 'github_ipynb', GithubIpynbReader()
-    elif re.search(r'https?://(www\.)?arxiv\.org/', url):
-        return 'arxiv', ArxivReader()
-    elif is_x_url(url):  # Check for X.com/Twitter URLs
-        return 'x', XReader()
-    elif is_pdf_url(url):  # Check for PDF URLs before general webpage
-        return 'pdf', PDFReader()
-    elif 'mp.weixin.qq.com' in url:
-        return 'wechat', WebpageReader() # Assuming wechat uses general webpage reader
-    elif re.match(youtube_regex, url):
-        return 'youtube', YoutubeReader()
-    elif re.match(hf_papers_regex, url):
-        # Route Hugging Face paper page to arXiv reader
-        return 'arxiv', ArxivReader()
-    elif re.match(huggingface_regex, url):
-        return 'huggingface', HuggingfaceReader()
-    else:
-        return 'general', WebpageReader()
+    url = _ensure_scheme(url)
+    route = _match_route(url)
+    if route:
+        file_type, reader = route
+        content, artifact = reader.read_document(url)
+        return file_type, content, artifact
+    
+    response = _webpage_reader.http.get(url)
+    if is_pdf_response(response):
+        content, artifact = _pdf_reader.read_document_from_bytes(url, response.content)
+        return 'pdf', content, artifact
+    return 'general', _webpage_reader.parse(response.text), None
 
 def generate_file_path(url, file_type):
     time_now = time.time()
@@ -72,8 +112,7 @@ def generate_file_path(url, file_type):
     #     youtube_id = re.match(youtube_regex, url).group(6)
     #     file_name = f'youtube_{youtube_id}'
     elif file_type == 'huggingface':
-        huggingface_regex = (r'https?:\/\/huggingface\.co\/([^\/]+\/[^\/]+)')
-        huggingface_id = re.match(huggingface_regex, url).group(1).replace('/', '-')
+        huggingface_id = HUGGINGFACE_RE.match(url).group(1).replace('/', '-')
         file_name = f'huggingface_{huggingface_id}'
     elif file_type == 'pdf':
         # Extract filename from URL for PDFs
@@ -0,0 +1,79 @@
+import re
+from typing import List, Tuple
+
+from utils.token_utils import count_tokens, truncate_to_tokens
+
+# Prompt budget for arXiv papers: enough for the abstract, introduction, conclusion and
+# the core method/results sections of a typical paper, well under the single-call limit.
+ARXIV_CONTEXT_TOKENS = 12000
+
+# Smallest remainder worth filling with the start of a section that does not fit
+MIN_PARTIAL_SECTION_TOKENS = 300
+
+# Section headings as written by readers/arxiv_reader.get_arxiv_content
+_SECTION_HEADING_RE = re.compile(r'^\*\*(.+?)\*\*$', re.MULTILINE)
+
+# Lower is packed first; None is never packed. Matched against the lowercased heading.
+_DROPPED_RE = re.compile(r'\b(?:references|bibliography|acknowledge?ments?|appendix|appendices|'
+                         r'supplementary|checklist|author contributions)\b')
+_SECTION_PRIORITIES = [
+    (0, re.compile(r'^(?:title|abstract)$')),
+    (1, re.compile(r'\b(?:introduction|conclusions?|concluding|summary)\b')),
+    (2, re.compile(r'\b(?:method|methods|methodology|approach|model|framework|results?|experiments?|'
+                   r'evaluation|findings|analysis|limitations?)\b')),
+]
+_DEFAULT_PRIORITY = 3  # Related work, background, discussion and anything unrecognized
+
+def section_priority(name: str):
+    """Packing priority for a section heading, or None for sections that are always dropped."""
+    name = name.lower()
+    if _DROPPED_RE.search(name):
+        return None
+    for priority, pattern in _SECTION_PRIORITIES:
+        if pattern.search(name):
+            return priority
+    return _DEFAULT_PRIORITY
+
+def split_sections(text: str) -> List[Tuple[str, str]]:
+    """Split ``**Heading**`` formatted text into (heading, body) pairs, in document order."""
+    matches = list(_SECTION_HEADING_RE.finditer(text))
+    sections = []
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        sections.append((match.group(1).strip(), text[match.end():end].strip()))
+    return sections
+
+def pack_sections(text: str, max_tokens: int = ARXIV_CONTEXT_TOKENS) -> str:
+    """
+    Select the sections of a paper that matter most for its summary, within ``max_tokens``.
+
+    Sections are taken by priority (title and abstract, then introduction and conclusion,
+    then method and results, then the rest) and emitted in their original order; the
+    first section that does not fit is cut to the remaining budget. References and
+    appendices are always dropped. Text without section headings is returned unchanged.
+    """
+    sections = split_sections(text)
+    if not sections:
+        return text
+
+    candidates = []
+    for index, (name, body) in enumerate(sections):
+        priority = section_priority(name)
+        if priority is not None and body:
+            candidates.append((priority, index, name, body))
+
+    kept = {}
+    remaining = max_tokens
+    for priority, index, name, body in sorted(candidates):
+        block = f'**{name}**\n{body}'
+        tokens = count_tokens(block)
+        if tokens <= remaining:
+            kept[index] = block
+            remaining -= tokens
+        elif remaining >= MIN_PARTIAL_SECTION_TOKENS:
+            kept[index] = truncate_to_tokens(block, remaining)
+            remaining = 0
+        if remaining < MIN_PARTIAL_SECTION_TOKENS:
+            break
+
+    return '\n\n'.join(kept[index] for index in sorted(kept))
@@ -22,22 +22,87 @@ def create_error_embed(title: str, message: str, command: str = None, url: str =
     embed.set_footer(text=f"Error occurred at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     return embed
 
-def create_processing_embed(url: str) -> discord.Embed:
-    """Creates an embed to show that a URL is being processed."""
-    embed = discord.Embed(
-        title="⏳ Processing URL...",
-        description=f"Please wait while I fetch and analyze the content from:\n{url}",
-        color=INFO_COLOR
-    )
+def create_processing_embed(url: str, force_refresh: bool = False, stage: str = None, queue_position: int = None) -> discord.Embed:
+    """Creates an embed to show that a URL is being processed, with its queue position and current stage."""
+    if force_refresh:
+        embed = discord.Embed(
+            title="🔄 Force Refreshing URL...",
+            description=f"Force refreshing content from:\n{url}\n\n*Note: This will bypass cache and reprocess the document.*",
+            color=INFO_COLOR
+        )
+    else:
+        embed = discord.Embed(
+            title="⏳ Processing URL...",
+            description=f"Please wait while I fetch and analyze the content from:\n{url}",
+            color=INFO_COLOR
+        )
+    if queue_position:
+        embed.add_field(name="Queue Position", value=f"`#{queue_position}`", inline=True)
+    if stage:
+        embed.add_field(name="Status", value=stage, inline=True)
+    return embed
+
+# Per-item status icons for the bulk !wget status embed
+BULK_STATUS_ICONS = {
+    'pending': '⏳',
+    'queued': '🕒',
+    'running': '⚙️',
+    'new': '✅',
+    'updated': '🔄',
+    'found': '📋',
+    'error': '❌',
+}
+
+def create_bulk_status_embed(items: list, force_refresh: bool = False, processing_time: float = None) -> discord.Embed:
+    """Creates one aggregated embed with a status line per URL of a bulk !wget."""
+    finished = sum(1 for item in items if item['status'] in ('new', 'updated', 'found', 'error'))
+    failed = sum(1 for item in items if item['status'] == 'error')
+    done = processing_time is not None
+
+    if done:
+        title = f"📚 Processed {len(items)} URLs"
+        color = WARN_COLOR if failed else SUCCESS_COLOR
+    else:
+        title = f"{'🔄 Force refreshing' if force_refresh else '⏳ Processing'} {len(items)} URLs ({finished}/{len(items)} done)"
+        color = INFO_COLOR
+
+    lines = []
+    for number, item in enumerate(items, 1):
+        icon = BULK_STATUS_ICONS.get(item['status'], '•')
+        label = item.get('title') or item['url']
+        if len(label) > 80:
+            label = label[:77] + "..."
+        line = f"{icon} **{number}.** [{label}]({item['url']})" if item.get('title') else f"{icon} **{number}.** {label}"
+        if item.get('db_id'):
+            line += f" • ID `{item['db_id']}`"
+        if item.get('detail'):
+            line += f" • {item['detail'][:100]}"
+        lines.append(line)
+
+    # Stay under Discord's 4096 character description limit
+    description = ""
+    for shown, line in enumerate(lines):
+        remaining = len(lines) - shown
+        if len(description) + len(line) + 40 > 4096:
+            description += f"*…and {remaining} more*"
+            break
+        description += line + "\n"
+
+    embed = discord.Embed(title=title, description=description, color=color)
+    if done:
+        counts = {status: sum(1 for item in items if item['status'] == status) for status in ('new', 'updated', 'found', 'error')}
+        summary = " • ".join(f"{BULK_STATUS_ICONS[status]} {count} {status}" for status, count in counts.items() if count)
+        embed.add_field(name="Result", value=summary or "Nothing processed", inline=False)
+        embed.set_footer(text=f"Processed in {processing_time:.2f}s • {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     return embed
 
-def create_summary_embed(summary_json: str, url: str, doc_type: str, db_id: int, processing_time: float, is_updated: bool = False) -> discord.Embed:
+def create_summary_embed(summary_json: str, url: str, doc_type: str, db_id: int, processing_time: float, is_updated: bool = False, is_unchanged: bool = False) -> discord.Embed:
     """Creates a rich embed from a structured JSON summary."""
     try:
         data = json.loads(summary_json)
     except (json.JSONDecodeError, TypeError):
         # Fallback for plain text summary
-        return create_fallback_summary_embed(summary_json, url, doc_type, db_id, processing_time, is_updated)
+        return create_fallback_summary_embed(summary_json, url, doc_type, db_id, processing_time, is_updated, is_unchanged)
 
     # Main embed setup
     title_prefix = "🔄 Updated: " if is_updated else "✅ New: "
@@ -125,7 +190,7 @@ def create_summary_embed(summary_json: str, url: str, doc_type: str, db_id: int,
     embed.add_field(name="DB ID", value=f"`{db_id}`", inline=True)
 
     # Footer
-    status_text = "Updated" if is_updated else "Processed"
+    status_text = "Refreshed (content unchanged)" if is_unchanged else "Updated" if is_updated else "Processed"
     footer_text = f"{status_text} in {processing_time:.2f}s"
     if is_arxiv_format:
         footer_text += " • Academic Paper Analysis"
@@ -134,7 +199,7 @@ def create_summary_embed(summary_json: str, url: str, doc_type: str, db_id: int,
 
     return embed
 
-def create_fallback_summary_embed(summary_text: str, url: str, doc_type: str, db_id: int, processing_time: float, is_updated: bool = False) -> discord.Embed:
+def create_fallback_summary_embed(summary_text: str, url: str, doc_type: str, db_id: int, processing_time: float, is_updated: bool = False, is_unchanged: bool = False) -> discord.Embed:
     """Creates a simple summary embed when structured data is not available."""
     title_prefix = "🔄 Updated: " if is_updated else "✅ New: "
     embed = discord.Embed(
@@ -145,7 +210,7 @@ def create_fallback_summary_embed(summary_text: str, url: str, doc_type: str, db
     )
     embed.add_field(name="Type", value=f"`{doc_type}`", inline=True)
     embed.add_field(name="DB ID", value=f"`{db_id}`", inline=True)
-    status_text = "Updated" if is_updated else "Processed"
+    status_text = "Refreshed (content unchanged)" if is_unchanged else "Updated" if is_updated else "Processed"
     embed.set_footer(text=f"{status_text} in {processing_time:.2f}s • {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     return embed
 
@@ -0,0 +1,67 @@
+import asyncio
+from typing import Awaitable, Callable, List
+
+class EmbeddingBatcher:
+    """
+    Collects embedding requests made concurrently and sends them as batched calls.
+
+    ``embed(text)`` queues the text and waits for its vector. A batch is sent when
+    ``max_batch`` texts are pending or ``max_wait`` seconds after the first one arrived,
+    whichever comes first, so a lone request is delayed by at most ``max_wait``.
+
+    ``embed_batch`` takes a list of texts and returns their vectors in the same order;
+    an exception in place of a vector fails only that text's request, while a result of
+    the wrong length fails the whole batch.
+    """
+
+    def __init__(self, embed_batch: Callable[[List[str]], Awaitable[List]], max_batch: int = 64,
+                 max_wait: float = 0.02):
+        self.embed_batch = embed_batch
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._pending = []
+        self._timer = None
+        self._tasks = set()
+
+    async def embed(self, text: str) -> List[float]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._send(batch))
+            # Keep a reference so the task is not garbage collected mid-flight
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch):
+        outcome = None
+        try:
+            vectors = await self.embed_batch([text for text, _ in batch])
+            if len(vectors) != len(batch):
+                raise RuntimeError(f"Embedding batch returned {len(vectors)} vectors for {len(batch)} texts")
+            outcome = vectors
+        except Exception as e:
+            outcome = e
+        finally:
+            # Answer every request in the batch, even if sending it was cancelled
+            for index, (_, future) in enumerate(batch):
+                if future.done():
+                    continue  # The caller was cancelled
+                vector = outcome[index] if isinstance(outcome, list) else outcome
+                if vector is None:
+                    future.cancel()
+                elif isinstance(vector, BaseException):
+                    future.set_exception(vector)
+                else:
+                    future.set_result(vector)
@@ -0,0 +1,149 @@
+import asyncio
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+class _IngestionJob:
+    def __init__(self, user_id: str, fn: Callable[[], Awaitable[Any]],
+                 on_position: Optional[Callable[[int], None]]):
+        self.user_id = user_id
+        self.fn = fn
+        self.on_position = on_position
+        self.future = asyncio.get_running_loop().create_future()
+        self.position = None
+
+class IngestionQueue:
+    """
+    Bounded pool of ingestion workers with round-robin fairness across users.
+
+    Each user has their own FIFO of pending jobs and workers take one job per user in
+    turn, so one user pasting 30 links cannot starve everyone else. Jobs waiting in
+    the queue are told their position whenever it changes.
+    """
+
+    def __init__(self, num_workers: int = 4):
+        self.num_workers = num_workers
+        self._pending: Dict[str, Deque[_IngestionJob]] = {}
+        self._rotation: Deque[str] = deque()  # Users with pending jobs, in round-robin order
+        self._ready: Optional[asyncio.Queue] = None  # One token per pending job
+        self._workers: List[asyncio.Task] = []
+        self._closed = False
+        self.active_jobs = 0
+
+    def configure(self, num_workers: int):
+        """Set the worker count; takes effect when the workers are started."""
+        self.num_workers = max(1, int(num_workers))
+
+    async def submit(self, user_id: str, fn: Callable[[], Awaitable[Any]],
+                     on_position: Optional[Callable[[int], None]] = None) -> Any:
+        """
+        Queue ``fn()`` on behalf of ``user_id`` and return its result once a worker ran it.
+
+        ``on_position(position)`` is called with the job's 1-based queue position while it waits.
+        """
+        if self._closed:
+            raise RuntimeError("The ingestion queue is closed")
+        self._ensure_workers()
+        job = _IngestionJob(user_id, fn, on_position)
+        if user_id not in self._pending:
+            self._pending[user_id] = deque()
+            self._rotation.append(user_id)
+        self._pending[user_id].append(job)
+        self._ready.put_nowait(None)
+        self._notify_positions()
+
+        try:
+            return await job.future
+        except asyncio.CancelledError:
+            self._discard(job)
+            raise
+
+    def pending_count(self) -> int:
+        return sum(len(jobs) for jobs in self._pending.values())
+
+    def _ensure_workers(self):
+        if self._workers:
+            return
+        self._ready = asyncio.Queue()
+        self._workers = [asyncio.ensure_future(self._worker()) for _ in range(self.num_workers)]
+
+    def _next_job(self) -> Optional[_IngestionJob]:
+        while self._rotation:
+            user_id = self._rotation.popleft()
+            jobs = self._pending[user_id]
+            job = jobs.popleft()
+            if jobs:
+                self._rotation.append(user_id)
+            else:
+                del self._pending[user_id]
+            if not job.future.done():
+                return job
+        return None
+
+    def _discard(self, job: _IngestionJob):
+        jobs = self._pending.get(job.user_id)
+        if jobs and job in jobs:
+            jobs.remove(job)
+            if not jobs:
+                del self._pending[job.user_id]
+                self._rotation.remove(job.user_id)
+            self._notify_positions()
+
+    def _dispatch_order(self) -> List[_IngestionJob]:
+        """Pending jobs in the order workers will pick them up."""
+        order = []
+        queues = [self._pending[user_id] for user_id in self._rotation]
+        depth = 0
+        while queues:
+            queues = [jobs for jobs in queues if len(jobs) > depth]
+            order.extend(jobs[depth] for jobs in queues)
+            depth += 1
+        return order
+
+    def _notify_positions(self):
+        for position, job in enumerate(self._dispatch_order(), 1):
+            if job.position != position:
+                job.position = position
+                if job.on_position:
+                    job.on_position(position)
+
+    async def close(self):
+        """Stop the workers; running and queued jobs are cancelled."""
+        self._closed = True
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        for jobs in self._pending.values():
+            for job in jobs:
+                job.future.cancel()
+        self._pending.clear()
+        self._rotation.clear()
+
+    async def _worker(self):
+        while True:
+            await self._ready.get()
+            job = self._next_job()
+            if job is None:
+                continue  # The job was cancelled while waiting
+            self._notify_positions()
+            self.active_jobs += 1
+            try:
+                result = await job.fn()
+            except asyncio.CancelledError:
+                if self._closed:
+                    raise
+                # The job cancelled itself; its caller sees the cancellation, the worker carries on
+                job.future.cancel()
+            except BaseException as e:
+                if not job.future.done():
+                    job.future.set_exception(e)
+                if not isinstance(e, Exception):
+                    raise  # KeyboardInterrupt, SystemExit
+            else:
+                if not job.future.done():
+                    job.future.set_result(result)
+            finally:
+                self.active_jobs -= 1
+                # Whatever happened, the caller must not wait forever
+                if not job.future.done():
+                    job.future.cancel()
@@ -0,0 +1,120 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+class LLMCache:
+    """
+    Disk-backed cache of LLM responses.
+
+    Responses are stored in their own SQLite file, keyed by ``make_key`` over the prompt
+    name and version, the model, the request parameters and a hash of the whitespace-
+    normalized prompts, so replaying an identical request is a local lookup. The least
+    recently used responses are evicted once the stored text grows past ``max_bytes``.
+    Hit and miss counters cover the lifetime of the process.
+    """
+
+    def __init__(self, db_path: str = 'saved_text/llm_cache.db', max_bytes: int = 256 * 1024 * 1024):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._total_bytes = 0  # Running total of stored response sizes
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self._init_database()
+
+    @contextmanager
+    def _connect(self):
+        """A connection that commits on success and is always closed."""
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _init_database(self):
+        with self._connect() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS responses (
+                    cache_key TEXT PRIMARY KEY,
+                    prompt_name TEXT,
+                    model TEXT,
+                    response TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses(last_used)')
+            self._total_bytes = conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+    @staticmethod
+    def make_key(prompt_name: str, prompt_version: int, model: str, params: Dict,
+                 system_prompt: str, user_prompt: str) -> str:
+        """Cache key for a request; prompts differing only in whitespace share a key."""
+        content_hash = hashlib.sha256()
+        for text in (system_prompt, user_prompt):
+            content_hash.update(' '.join(text.split()).encode('utf-8'))
+            content_hash.update(b'\0')
+        key = json.dumps([prompt_name, prompt_version, model, params, content_hash.hexdigest()], sort_keys=True)
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock, self._connect() as conn:
+            row = conn.execute('SELECT response FROM responses WHERE cache_key = ?', (key,)).fetchone()
+            if row:
+                conn.execute('UPDATE responses SET last_used = ? WHERE cache_key = ?', (time.time(), key))
+                self.hits += 1
+                return row[0]
+            self.misses += 1
+            return None
+
+    def put(self, key: str, response: str, prompt_name: str = None, model: str = None):
+        now = time.time()
+        size = len(response.encode('utf-8'))
+        with self._lock, self._connect() as conn:
+            replaced = conn.execute('SELECT size FROM responses WHERE cache_key = ?', (key,)).fetchone()
+            conn.execute('''
+                INSERT OR REPLACE INTO responses
+                (cache_key, prompt_name, model, response, size, created_at, last_used)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (key, prompt_name, model, response, size, now, now))
+            self._total_bytes += size - (replaced[0] if replaced else 0)
+            if self._total_bytes > self.max_bytes:
+                self._evict(conn)
+
+    def _evict(self, conn):
+        """Drop least recently used responses beyond the size cap."""
+        # Recount before evicting, in case another process shares the file
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total > self.max_bytes:
+            for key, size in conn.execute('SELECT cache_key, size FROM responses ORDER BY last_used').fetchall():
+                if total <= self.max_bytes:
+                    break
+                conn.execute('DELETE FROM responses WHERE cache_key = ?', (key,))
+                total -= size
+        self._total_bytes = total
+
+    def stats(self) -> Dict:
+        with self._connect() as conn:
+            entries, size = conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses').fetchone()
+        return {'entries': entries, 'bytes': size, 'max_bytes': self.max_bytes,
+                'hits': self.hits, 'misses': self.misses}
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+def get_llm_cache() -> LLMCache:
+    """Return the process-wide LLM response cache."""
+    global _default_cache
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = LLMCache()
+    return _default_cache
@@ -0,0 +1,117 @@
+import asyncio
+import discord
+from utils.embed_builder import create_processing_embed, create_bulk_status_embed
+
+class ThrottledMessage:
+    """
+    Keeps a Discord message in sync with some changing state without hitting rate limits.
+
+    Subclasses implement ``render`` to build an embed from the current state and call
+    ``refresh`` whenever it changes. Edits are serialized, coalesced to the latest state
+    and spaced out; call ``finish`` before the final edit so a late progress edit cannot
+    overwrite the result.
+    """
+
+    MIN_EDIT_INTERVAL = 1.5  # Seconds between progress edits of the same message
+
+    def __init__(self, message):
+        self.message = message
+        self._version = 0
+        self._shown = 0
+        self._task = None
+        self._finished = False
+
+    def render(self) -> discord.Embed:
+        raise NotImplementedError
+
+    def refresh(self):
+        if self._finished:
+            return
+        self._version += 1
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._flush())
+
+    async def finish(self):
+        self._finished = True
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _flush(self):
+        while self._version != self._shown and not self._finished:
+            version = self._version
+            try:
+                await self.message.edit(embed=self.render())
+            except discord.HTTPException:
+                pass  # Progress is best-effort
+            self._shown = version
+            await asyncio.sleep(self.MIN_EDIT_INTERVAL)
+
+class ProgressReporter(ThrottledMessage):
+    """
+    Keeps a "Processing URL" message in sync with an ingestion's queue position and stage.
+
+    ``update`` can be called as often as needed from anywhere on the event loop.
+    """
+
+    def __init__(self, message, url: str, force_refresh: bool = False):
+        super().__init__(message)
+        self.url = url
+        self.force_refresh = force_refresh
+        self._state = (None, None)
+
+    def update(self, stage: str = None, queue_position: int = None):
+        if (stage, queue_position) != self._state:
+            self._state = (stage, queue_position)
+            self.refresh()
+
+    def queued(self, position: int):
+        self.update(stage="Waiting in queue", queue_position=position)
+
+    def render(self) -> discord.Embed:
+        stage, queue_position = self._state
+        return create_processing_embed(self.url, force_refresh=self.force_refresh,
+                                       stage=stage, queue_position=queue_position)
+
+class BulkProgressReporter(ThrottledMessage):
+    """
+    Keeps one aggregated status message in sync with many concurrent ingestions.
+
+    Each item is a dict with ``url`` and ``status`` plus optional ``title``, ``db_id`` and
+    ``detail``; ``item(index)`` returns a per-URL reporter with the same ``update`` and
+    ``queued`` methods as ``ProgressReporter``.
+    """
+
+    def __init__(self, message, urls, force_refresh: bool = False):
+        super().__init__(message)
+        self.items = [{'url': url, 'status': 'pending'} for url in urls]
+        self.force_refresh = force_refresh
+        self.processing_time = None
+
+    def set(self, index: int, **fields):
+        self.items[index].update(fields)
+        self.refresh()
+
+    def item(self, index: int) -> '_BulkItemProgress':
+        return _BulkItemProgress(self, index)
+
+    def render(self) -> discord.Embed:
+        return create_bulk_status_embed(self.items, force_refresh=self.force_refresh,
+                                        processing_time=self.processing_time)
+
+class _BulkItemProgress:
+    def __init__(self, bulk: BulkProgressReporter, index: int):
+        self.bulk = bulk
+        self.index = index
+
+    def update(self, stage: str = None, queue_position: int = None):
+        if queue_position:
+            self.bulk.set(self.index, status='queued', detail=f"#{queue_position} in queue")
+        else:
+            self.bulk.set(self.index, status='running', detail=stage)
+
+    def queued(self, position: int):
+        self.update(queue_position=position)
@@ -0,0 +1,57 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+class TokenBucket:
+    """
+    Async token bucket refilled continuously at ``rate_per_minute``.
+
+    ``acquire`` waits until enough tokens are available. Waiters are served in arrival
+    order, so a burst drains at the refill rate instead of racing. A request larger than
+    the bucket's capacity is charged the full capacity, so it can still go through.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: float = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.available = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.available = min(self.capacity, self.available + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1):
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            self._refill()
+            while self.available < amount:
+                await asyncio.sleep((amount - self.available) / self.rate)
+                self._refill()
+            self.available -= amount
+
+class RateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute limits for one model, plus a concurrency
+    limit that can be shared between models.
+
+    Usage:
+        async with limiter.limit(estimated_tokens):
+            await client.chat.completions.create(...)
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int, semaphore: asyncio.Semaphore):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.semaphore = semaphore
+
+    @asynccontextmanager
+    async def limit(self, tokens: int):
+        # Wait for the rate limits before taking a concurrency slot, so a request queued
+        # behind one model's limit does not hold up calls to another model
+        await self.requests.acquire(1)
+        await self.tokens.acquire(tokens)
+        async with self.semaphore:
+            yield
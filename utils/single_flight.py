@@ -0,0 +1,42 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into a single in-flight task.
+
+    The first caller for a key starts the work; callers arriving while it is still
+    running await the same task and receive its result (or exception). The key is
+    released as soon as the task finishes, so later calls start fresh work.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Run ``fn()`` for ``key`` unless a call for it is already in flight.
+
+        Returns:
+            (result, shared): ``shared`` is True when the result came from another caller's task.
+        """
+        task = self._calls.get(key)
+        shared = task is not None
+        if not shared:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done, key=key: self._release(key, done))
+        # Shield so one caller being cancelled does not cancel the work for everyone else
+        result = await asyncio.shield(task)
+        return result, shared
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Return True if work for ``key`` is currently running."""
+        return key in self._calls
+
+    def _release(self, key: Hashable, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved when every waiter has gone away
+            task.exception()
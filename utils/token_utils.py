@@ -0,0 +1,98 @@
+import logging
+from typing import List
+
+try:
+    import tiktoken
+except ImportError:  # Optional: fall back to a character-based estimate
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+# Used when tiktoken (or its encoding files) is unavailable. English prose averages
+# about four characters per token; CJK text is closer to one token per character.
+CHARS_PER_TOKEN = 4
+
+_encodings = {}
+
+def _get_encoding(model: str):
+    if tiktoken is None:
+        return None
+    if model not in _encodings:
+        try:
+            _encodings[model] = tiktoken.encoding_for_model(model)
+        except KeyError:
+            _encodings[model] = tiktoken.get_encoding('o200k_base')
+        except Exception as e:
+            logger.warning("Tokenizer unavailable, estimating token counts: %s", e)
+            _encodings[model] = None
+    return _encodings[model]
+
+def _is_cjk(char: str) -> bool:
+    return '一' <= char <= '鿿'
+
+def _estimate_tokens(text: str) -> int:
+    cjk = sum(1 for c in text if _is_cjk(c))
+    return cjk + (len(text) - cjk + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+def count_tokens(text: str, model: str = 'gpt-4o') -> int:
+    """Number of tokens ``text`` takes for ``model`` (estimated without tiktoken)."""
+    if not text:
+        return 0
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return _estimate_tokens(text)
+    return len(encoding.encode(text, disallowed_special=()))
+
+def truncate_to_tokens(text: str, max_tokens: int, model: str = 'gpt-4o') -> str:
+    """Return the longest prefix of ``text`` that fits in ``max_tokens`` tokens."""
+    encoding = _get_encoding(model)
+    if encoding is None:
+        if _estimate_tokens(text) <= max_tokens:
+            return text
+        # Shrink proportionally until the estimate fits (CJK text needs a second pass)
+        end = len(text)
+        while end and _estimate_tokens(text[:end]) > max_tokens:
+            end = end * max_tokens // _estimate_tokens(text[:end])
+        return text[:end]
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens])
+
+def split_into_chunks(text: str, chunk_tokens: int, model: str = 'gpt-4o') -> List[str]:
+    """
+    Split ``text`` into consecutive chunks of at most ``chunk_tokens`` tokens.
+
+    Chunks break between paragraphs where possible, so sections are not cut mid-sentence;
+    a single paragraph longer than a chunk is split by tokens.
+    """
+    chunks = []
+    current = []
+    current_tokens = 0
+    for paragraph in text.split('\n\n'):
+        if not paragraph.strip():
+            continue
+        tokens = count_tokens(paragraph, model)
+        if current and current_tokens + tokens > chunk_tokens:
+            chunks.append('\n\n'.join(current))
+            current, current_tokens = [], 0
+        if tokens > chunk_tokens:
+            chunks.extend(_split_paragraph(paragraph, chunk_tokens, model))
+            continue
+        current.append(paragraph)
+        current_tokens += tokens
+    if current:
+        chunks.append('\n\n'.join(current))
+    return chunks
+
+def _split_paragraph(paragraph: str, chunk_tokens: int, model: str) -> List[str]:
+    encoding = _get_encoding(model)
+    if encoding is not None:
+        tokens = encoding.encode(paragraph, disallowed_special=())
+        return [encoding.decode(tokens[i:i + chunk_tokens]) for i in range(0, len(tokens), chunk_tokens)]
+    pieces = []
+    while paragraph:
+        head = truncate_to_tokens(paragraph, chunk_tokens, model) or paragraph[:1]
+        pieces.append(head)
+        paragraph = paragraph[len(head):]
+    return pieces
@@ -0,0 +1,111 @@
+import re
+from typing import List
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# arXiv identifiers: new style (2304.14979, optional version) and old style (hep-th/9901001)
+ARXIV_ID_PATTERN = r'(\d{4}\.\d{4,5}|[a-z\-]+(?:\.[A-Z]{2})?/\d{7})(?:v\d+)?'
+
+_BARE_ARXIV_ID_RE = re.compile(r'(?:arxiv:)?' + ARXIV_ID_PATTERN, re.IGNORECASE)
+_ARXIV_URL_RE = re.compile(
+    r'^(?:[a-z]+\.)?arxiv\.org/(?:abs|pdf|html)/' + ARXIV_ID_PATTERN + r'(?:\.pdf)?/?$',
+    re.IGNORECASE
+)
+_HF_PAPERS_URL_RE = re.compile(r'^huggingface\.co/papers/(\d{4}\.\d{4,5})(?:v\d+)?/?$', re.IGNORECASE)
+
+# Query parameters that only track where a link was shared from
+_TRACKING_PARAMS = {'fbclid', 'gclid', 'igshid', 'mc_cid', 'mc_eid', 'ref', 'ref_src', 'si'}
+
+def canonicalize_url(url: str) -> str:
+    """
+    Return the canonical document key for a URL or bare arXiv identifier.
+
+    All forms of the same arXiv paper (abs/pdf/html pages, any version, www/export
+    mirrors, Hugging Face paper pages and bare IDs) map to ``arxiv:<id>``. Other URLs
+    are normalized to https with a lowercase host, no ``www.``, no default port,
+    no trailing slash, no fragment and no tracking query parameters.
+    """
+    if not url:
+        return url
+
+    candidate = url.strip()
+    bare_match = _BARE_ARXIV_ID_RE.fullmatch(candidate)
+    if bare_match:
+        return f'arxiv:{bare_match.group(1)}'
+
+    if not re.match(r'^[a-z][a-z0-9+.\-]*://', candidate, re.IGNORECASE):
+        candidate = 'https://' + candidate
+
+    parts = urlsplit(candidate)
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    port = parts.port
+    if port and port not in (80, 443):
+        host = f'{host}:{port}'
+
+    path = re.sub(r'/{2,}', '/', parts.path).rstrip('/')
+
+    host_and_path = f'{host}{path}'
+    arxiv_match = _ARXIV_URL_RE.match(host_and_path) or _HF_PAPERS_URL_RE.match(host_and_path)
+    if arxiv_match:
+        return f'arxiv:{arxiv_match.group(1)}'
+
+    query_params = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_') and key.lower() not in _TRACKING_PARAMS
+    ]
+    query = urlencode(sorted(query_params))
+
+    return urlunsplit(('https', host, path, query, ''))
+
+# URLs (with a scheme or a leading www.) and bare arXiv identifiers in free text
+_URL_IN_TEXT_RE = re.compile(r'(?:https?://|www\.)[^\s<>"\'`|]+', re.IGNORECASE)
+_ARXIV_ID_IN_TEXT_RE = re.compile(
+    r'(?<![\w./:])(?:arxiv:)?\d{2}(?:0[1-9]|1[0-2])\.\d{4,5}(?:v\d+)?(?![\w/])', re.IGNORECASE
+)
+_TRAILING_PUNCTUATION = '.,;:!?\'")]}*_>'
+
+def _trim_url(url: str) -> str:
+    while url and url[-1] in _TRAILING_PUNCTUATION:
+        # Keep a closing parenthesis that belongs to the URL, e.g. Wikipedia links
+        if url[-1] == ')' and url.count('(') >= url.count(')'):
+            break
+        url = url[:-1]
+    return url
+
+def extract_urls(text: str) -> List[str]:
+    """
+    Return every URL and bare arXiv ID in ``text``, in order of appearance.
+
+    Duplicates are kept; use ``dedupe_urls`` to collapse equivalent forms.
+    """
+    if not text:
+        return []
+    found = []
+    for match in _URL_IN_TEXT_RE.finditer(text):
+        url = _trim_url(match.group(0))
+        if url:
+            found.append((match.start(), url))
+    # Look for bare arXiv IDs outside of the URLs found above
+    remainder = _URL_IN_TEXT_RE.sub(lambda m: ' ' * len(m.group(0)), text)
+    for match in _ARXIV_ID_IN_TEXT_RE.finditer(remainder):
+        found.append((match.start(), match.group(0).rstrip('.')))
+    return [url for _, url in sorted(found)]
+
+def remove_urls(text: str) -> str:
+    """Return ``text`` with all URLs and bare arXiv IDs removed and whitespace collapsed."""
+    text = _URL_IN_TEXT_RE.sub(' ', text or '')
+    text = _ARXIV_ID_IN_TEXT_RE.sub(' ', text)
+    text = re.sub(r'<\s*>', ' ', text)  # Leftover <...> wrappers that suppress Discord previews
+    return ' '.join(text.split())
+
+def dedupe_urls(urls: List[str]) -> List[str]:
+    """Drop URLs whose canonical document key was already seen, keeping the first form."""
+    seen = set()
+    unique = []
+    for url in urls:
+        key = canonicalize_url(url)
+        if key not in seen:
+            seen.add(key)
+            unique.append(url)
+    return unique
@@ -0,0 +1,475 @@
+import json
+import logging
+import os
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import hnswlib
+except ImportError:  # Optional: only needed for the HNSW backend
+    hnswlib = None
+
+logger = logging.getLogger(__name__)
+
+class VectorIndex:
+    """
+    Exact in-memory cosine similarity index over document embeddings.
+
+    Vectors are L2-normalized on insert and kept in one contiguous float32 matrix, so a
+    query is a single matrix-vector product followed by ``argpartition`` for the top k.
+    Each row carries the document's user and type (as small integer codes) for
+    filtering. When a filter selects a small part of the library, only those rows are
+    scored, so per-user queries cost in proportion to that user's documents.
+
+    Rows are added, replaced and removed in place; the matrix grows by doubling.
+    Thread-safe.
+    """
+
+    INITIAL_CAPACITY = 1024
+    # Below this fraction of selected rows, score the selected rows only
+    SUBSET_SCAN_FRACTION = 0.25
+
+    def __init__(self, dim: Optional[int] = None):
+        self.dim = dim
+        self._size = 0
+        self._vectors = np.zeros((0, dim or 0), dtype=np.float32)
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._users = np.zeros(0, dtype=np.int32)
+        self._types = np.zeros(0, dtype=np.int32)
+        self._rows: Dict[int, int] = {}
+        self._codes: Dict[Optional[str], int] = {None: 0}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, doc_id: int):
+        return doc_id in self._rows
+
+    def _code(self, label: Optional[str]) -> int:
+        if label not in self._codes:
+            self._codes[label] = len(self._codes)
+        return self._codes[label]
+
+    def _reserve(self, size: int):
+        capacity = len(self._ids)
+        if size <= capacity:
+            return
+        new_capacity = max(self.INITIAL_CAPACITY, capacity * 2, size)
+        vectors = np.zeros((new_capacity, self.dim), dtype=np.float32)
+        vectors[:self._size] = self._vectors[:self._size]
+        self._vectors = vectors
+        for name in ('_ids', '_users', '_types'):
+            old = getattr(self, name)
+            grown = np.zeros(new_capacity, dtype=old.dtype)
+            grown[:self._size] = old[:self._size]
+            setattr(self, name, grown)
+
+    @staticmethod
+    def _normalize(vector) -> Optional[np.ndarray]:
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        if not norm or not np.isfinite(norm):
+            return None
+        return vector / norm
+
+    def upsert(self, doc_id: int, vector, user_id: Optional[str] = None, doc_type: Optional[str] = None,
+               version: Optional[int] = None):
+        """
+        Add or replace a document's vector.
+
+        Raises ValueError if the vector's dimension differs from the index's. A zero
+        vector removes the document, since it has no direction to compare. ``version``
+        (the embedding's row id) is only used by persistent indexes; this one is rebuilt
+        from the database on every start.
+        """
+        normalized = self._normalize(vector)
+        with self._lock:
+            if normalized is None:
+                self.remove(doc_id)
+                return
+            if self.dim is None:
+                self.dim = normalized.shape[0]
+                self._vectors = np.zeros((0, self.dim), dtype=np.float32)
+            if normalized.shape != (self.dim,):
+                raise ValueError(f"Embedding of document {doc_id} has shape {normalized.shape}, index dimension is {self.dim}")
+
+            row = self._rows.get(doc_id)
+            if row is None:
+                self._reserve(self._size + 1)
+                row = self._size
+                self._size += 1
+                self._rows[doc_id] = row
+                self._ids[row] = doc_id
+            self._vectors[row] = normalized
+            self._users[row] = self._code(user_id)
+            self._types[row] = self._code(doc_type)
+
+    def remove(self, doc_id: int) -> bool:
+        """Remove a document; the last row is moved into its place."""
+        with self._lock:
+            row = self._rows.pop(doc_id, None)
+            if row is None:
+                return False
+            last = self._size - 1
+            if row != last:
+                moved_id = int(self._ids[last])
+                self._vectors[row] = self._vectors[last]
+                self._ids[row] = moved_id
+                self._users[row] = self._users[last]
+                self._types[row] = self._types[last]
+                self._rows[moved_id] = row
+            self._size = last
+            return True
+
+    def search(self, query, k: int = 5, user_id: Optional[str] = None, doc_type: Optional[str] = None,
+               exclude_ids: Iterable[int] = ()) -> List[Tuple[int, float]]:
+        """
+        Return up to ``k`` (doc_id, cosine similarity) pairs, most similar first.
+
+        ``user_id`` and ``doc_type`` restrict the search to matching documents;
+        ``exclude_ids`` are never returned (e.g. the query document itself).
+        """
+        normalized = self._normalize(query)
+        if normalized is None or k <= 0:
+            return []
+        with self._lock:
+            size = self._size
+            if not size or normalized.shape != (self.dim,):
+                return []
+
+            mask = None
+            for codes, label in ((self._users, user_id), (self._types, doc_type)):
+                if label is None:
+                    continue
+                if label not in self._codes:
+                    return []
+                selected = codes[:size] == self._codes[label]
+                mask = selected if mask is None else mask & selected
+            excluded = [self._rows[doc_id] for doc_id in exclude_ids if doc_id in self._rows]
+            if excluded:
+                if mask is None:
+                    mask = np.ones(size, dtype=bool)
+                mask[excluded] = False
+
+            if mask is None:
+                rows, candidates = None, size
+                scores = self._vectors[:size] @ normalized
+            else:
+                candidates = int(np.count_nonzero(mask))
+                if not candidates:
+                    return []
+                if candidates < size * self.SUBSET_SCAN_FRACTION:
+                    rows = np.flatnonzero(mask)
+                    scores = self._vectors[rows] @ normalized
+                else:
+                    rows = None
+                    scores = np.where(mask, self._vectors[:size] @ normalized, -np.inf)
+
+            k = min(k, candidates)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            positions = rows[top] if rows is not None else top
+            return [(int(self._ids[position]), float(scores[i])) for i, position in zip(top, positions)]
+
+
+class _HnswGraph:
+    """One hnswlib graph over normalized vectors, labelled by document id, with its tombstones."""
+
+    def __init__(self, dim: int, capacity: int, m: int, ef_construction: int):
+        self.index = hnswlib.Index(space='ip', dim=dim)
+        self.index.init_index(max_elements=capacity, ef_construction=ef_construction, M=m)
+        self.deleted = set()
+
+    @classmethod
+    def load(cls, path: str, dim: int, deleted: Iterable[int]) -> '_HnswGraph':
+        graph = cls.__new__(cls)
+        graph.index = hnswlib.Index(space='ip', dim=dim)
+        graph.index.load_index(path)
+        graph.deleted = set(deleted)
+        return graph
+
+    def add(self, doc_ids, vectors):
+        needed = self.index.get_current_count() + len(doc_ids)
+        if needed > self.index.get_max_elements():
+            self.index.resize_index(max(needed, self.index.get_max_elements() * 2))
+        self.index.add_items(vectors, np.asarray(doc_ids, dtype=np.int64))
+
+    def upsert(self, doc_id: int, vector: np.ndarray):
+        if doc_id in self.deleted:
+            # A tombstoned label has to be revived before hnswlib lets it be updated
+            self.index.unmark_deleted(doc_id)
+            self.deleted.discard(doc_id)
+        self.add([doc_id], vector[np.newaxis, :])
+
+    def remove(self, doc_id: int):
+        if doc_id in self.deleted:
+            return
+        try:
+            self.index.mark_deleted(doc_id)
+        except RuntimeError:
+            return  # Not in this graph (e.g. replayed after a rebuild that never saw it)
+        self.deleted.add(doc_id)
+
+class HnswIndex:
+    """
+    Approximate nearest-neighbour index (HNSW, via hnswlib) for large libraries.
+
+    Same interface as ``VectorIndex``. Deletes leave tombstones in the graph; once
+    tombstones and in-place updates reach ``REBUILD_FRACTION`` of the library,
+    ``needs_rebuild`` turns true and ``start_rebuild`` builds a fresh graph in a
+    background thread while the old one keeps serving. Changes made during the rebuild
+    are replayed onto the new graph before it is swapped in.
+
+    The normalized vectors are also kept in an exact ``VectorIndex`` beside the graph.
+    Filters by user and type use per-label member sets. Filters matching at most
+    ``EXACT_FILTER_LIMIT`` documents are answered by that exact index, which scores only
+    the matching rows; broader ones search the graph with a filter and a proportionally
+    larger ``ef``.
+
+    ``save``/``load`` persist the graph at ``path`` and the metadata (users, types,
+    embedding versions, tombstones) at ``path + '.meta.npz'``.
+    """
+
+    M = 16
+    EF_CONSTRUCTION = 200
+    EF_SEARCH = 64
+    MAX_EF_SEARCH = 2000
+    INITIAL_CAPACITY = 1024
+    REBUILD_FRACTION = 0.2
+    REBUILD_MIN_CHANGES = 1000
+    EXACT_FILTER_LIMIT = 5000
+    BUILD_BATCH = 10000
+
+    def __init__(self, path: Optional[str] = None, dim: Optional[int] = None):
+        if hnswlib is None:
+            raise ImportError("The HNSW vector index needs hnswlib (pip install hnswlib)")
+        self.path = path
+        self.dim = dim
+        self._graph: Optional[_HnswGraph] = None
+        self._exact = VectorIndex(dim)
+        self._meta: Dict[int, Tuple[int, int, int]] = {}  # doc id -> (user code, type code, version)
+        self._codes: Dict[Optional[str], int] = {None: 0}
+        self._user_members = defaultdict(set)
+        self._type_members = defaultdict(set)
+        self._changes = 0  # Deletes and in-place updates since the graph was built
+        self._pending = None  # Operations logged while a rebuild runs
+        self._rebuild_thread = None
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._meta)
+
+    def __contains__(self, doc_id: int):
+        return doc_id in self._meta
+
+    def versions(self) -> Dict[int, int]:
+        """Embedding version (row id) of every indexed document."""
+        with self._lock:
+            return {doc_id: meta[2] for doc_id, meta in self._meta.items()}
+
+    def _code(self, label: Optional[str]) -> int:
+        if label not in self._codes:
+            self._codes[label] = len(self._codes)
+        return self._codes[label]
+
+    def _set_meta(self, doc_id: int, user_code: int, type_code: int, version: int):
+        self._clear_meta(doc_id)
+        self._meta[doc_id] = (user_code, type_code, version)
+        self._user_members[user_code].add(doc_id)
+        self._type_members[type_code].add(doc_id)
+
+    def _clear_meta(self, doc_id: int):
+        meta = self._meta.pop(doc_id, None)
+        if meta:
+            self._user_members[meta[0]].discard(doc_id)
+            self._type_members[meta[1]].discard(doc_id)
+        return meta
+
+    def upsert(self, doc_id: int, vector, user_id: Optional[str] = None, doc_type: Optional[str] = None,
+               version: Optional[int] = None):
+        """Add or replace a document's vector; see ``VectorIndex.upsert``."""
+        normalized = VectorIndex._normalize(vector)
+        with self._lock:
+            if normalized is None:
+                self.remove(doc_id)
+                return
+            if self.dim is None:
+                self.dim = normalized.shape[0]
+            if normalized.shape != (self.dim,):
+                raise ValueError(f"Embedding of document {doc_id} has shape {normalized.shape}, index dimension is {self.dim}")
+            if self._graph is None:
+                self._graph = _HnswGraph(self.dim, self.INITIAL_CAPACITY, self.M, self.EF_CONSTRUCTION)
+
+            if doc_id in self._meta:
+                self._changes += 1
+            self._set_meta(doc_id, self._code(user_id), self._code(doc_type), version or 0)
+            self._graph.upsert(doc_id, normalized)
+            self._exact.upsert(doc_id, normalized, user_id, doc_type)
+            if self._pending is not None:
+                self._pending.append((doc_id, normalized))
+
+    def remove(self, doc_id: int) -> bool:
+        with self._lock:
+            if self._clear_meta(doc_id) is None:
+                return False
+            self._changes += 1
+            self._graph.remove(doc_id)
+            self._exact.remove(doc_id)
+            if self._pending is not None:
+                self._pending.append((doc_id, None))
+            return True
+
+    def search(self, query, k: int = 5, user_id: Optional[str] = None, doc_type: Optional[str] = None,
+               exclude_ids: Iterable[int] = ()) -> List[Tuple[int, float]]:
+        """Return up to ``k`` (doc_id, cosine similarity) pairs, most similar first; see ``VectorIndex.search``."""
+        normalized = VectorIndex._normalize(query)
+        if normalized is None or k <= 0:
+            return []
+        with self._lock:
+            if not self._meta or normalized.shape != (self.dim,):
+                return []
+
+            candidates = None
+            for members, label in ((self._user_members, user_id), (self._type_members, doc_type)):
+                if label is None:
+                    continue
+                if label not in self._codes:
+                    return []
+                selected = members[self._codes[label]]
+                candidates = selected if candidates is None else candidates & selected
+            excluded = set(exclude_ids) & self._meta.keys()
+
+            if candidates is not None and len(candidates) <= self.EXACT_FILTER_LIMIT:
+                return self._exact.search(normalized, k=k, user_id=user_id, doc_type=doc_type,
+                                          exclude_ids=excluded)
+
+            available = (len(candidates) if candidates is not None else len(self._meta)) - len(excluded)
+            k = min(k, available)
+            if k <= 0:
+                return []
+            allowed = None
+            if candidates is not None or excluded:
+                def allowed(label):
+                    return (candidates is None or label in candidates) and label not in excluded
+            # A filter rejects most visited nodes, so widen the search in proportion
+            selectivity = len(self._meta) / max(available, 1)
+            ef = int(min(self.MAX_EF_SEARCH, max(self.EF_SEARCH, 2 * k) * selectivity))
+            self._graph.index.set_ef(max(ef, k))
+            while k:
+                try:
+                    labels, distances = self._graph.index.knn_query(normalized, k=k, num_threads=1, filter=allowed)
+                    break
+                except RuntimeError:
+                    k //= 2  # Fewer than k reachable matches
+            else:
+                return []
+            return [(int(label), 1.0 - float(distance)) for label, distance in zip(labels[0], distances[0])]
+
+    def needs_rebuild(self) -> bool:
+        return (self._rebuild_thread is None
+                and self._changes >= max(self.REBUILD_MIN_CHANGES, self.REBUILD_FRACTION * len(self._meta)))
+
+    def start_rebuild(self, rows: Callable[[], Iterable[Tuple[int, np.ndarray]]]) -> bool:
+        """
+        Rebuild the graph in a background thread from ``rows()``, an iterable of
+        (doc_id, vector) for every stored embedding. Returns False if one is running.
+        """
+        with self._lock:
+            if self._rebuild_thread is not None or self.dim is None:
+                return False
+            self._pending = []
+            self._changes = 0
+            self._rebuild_thread = threading.Thread(target=self._rebuild, args=(rows,),
+                                                    name='hnsw-rebuild', daemon=True)
+            self._rebuild_thread.start()
+            return True
+
+    def _rebuild(self, rows):
+        try:
+            graph = _HnswGraph(self.dim, max(self.INITIAL_CAPACITY, int(len(self._meta) * 1.25)),
+                               self.M, self.EF_CONSTRUCTION)
+            doc_ids, vectors = [], []
+            for doc_id, vector in rows():
+                normalized = VectorIndex._normalize(vector)
+                if normalized is None or normalized.shape != (self.dim,):
+                    continue
+                doc_ids.append(doc_id)
+                vectors.append(normalized)
+                if len(doc_ids) >= self.BUILD_BATCH:
+                    graph.add(doc_ids, np.stack(vectors))
+                    doc_ids, vectors = [], []
+            if doc_ids:
+                graph.add(doc_ids, np.stack(vectors))
+
+            with self._lock:
+                # Replay what changed since the rows were read, then drop anything the
+                # index no longer holds, and swap the new graph in
+                for doc_id, vector in self._pending:
+                    if vector is None:
+                        graph.remove(doc_id)
+                    else:
+                        graph.upsert(doc_id, vector)
+                for doc_id in graph.index.get_ids_list():
+                    if doc_id not in self._meta:
+                        graph.remove(doc_id)
+                self._graph = graph
+            logger.info("Vector index rebuilt: %d documents", len(self._meta))
+            self.save()
+        except Exception as e:
+            logger.exception("Vector index rebuild failed: %s", e)
+        finally:
+            with self._lock:
+                self._pending = None
+                self._rebuild_thread = None
+
+    def save(self):
+        """Write the graph and metadata next to ``path`` (atomically, via temporary files)."""
+        if not self.path:
+            return
+        with self._lock:
+            if self._graph is None:
+                return
+            doc_ids = np.fromiter(self._meta.keys(), dtype=np.int64, count=len(self._meta))
+            meta = np.array(list(self._meta.values()), dtype=np.int64).reshape(-1, 3)
+            self._graph.index.save_index(f'{self.path}.tmp')
+            with open(f'{self.path}.meta.tmp', 'wb') as f:
+                np.savez(f, doc_ids=doc_ids, meta=meta, dim=self.dim,
+                         deleted=np.fromiter(self._graph.deleted, dtype=np.int64),
+                         codes=json.dumps([label for label, _ in sorted(self._codes.items(), key=lambda item: item[1])]))
+            os.replace(f'{self.path}.tmp', self.path)
+            os.replace(f'{self.path}.meta.tmp', f'{self.path}.meta.npz')
+
+    def load(self) -> bool:
+        """Load a saved index from ``path``; returns False if there is none (or it is unreadable)."""
+        if not self.path or not (os.path.exists(self.path) and os.path.exists(f'{self.path}.meta.npz')):
+            return False
+        try:
+            with np.load(f'{self.path}.meta.npz') as saved:
+                dim = int(saved['dim'])
+                labels = json.loads(str(saved['codes']))
+                doc_ids, meta, deleted = saved['doc_ids'], saved['meta'], saved['deleted']
+            graph = _HnswGraph.load(self.path, dim, deleted.tolist())
+            # Refill the exact index from the graph's copies of the vectors
+            exact = VectorIndex(dim)
+            doc_ids, meta = doc_ids.tolist(), meta.tolist()
+            for start in range(0, len(doc_ids), self.BUILD_BATCH):
+                batch = doc_ids[start:start + self.BUILD_BATCH]
+                vectors = np.asarray(graph.index.get_items(batch), dtype=np.float32)
+                for doc_id, vector, (user_code, type_code, _) in zip(batch, vectors, meta[start:start + self.BUILD_BATCH]):
+                    exact.upsert(doc_id, vector, labels[user_code], labels[type_code])
+        except (OSError, ValueError, KeyError, IndexError, RuntimeError) as e:
+            logger.warning("Could not load vector index from %s: %s", self.path, e)
+            return False
+        with self._lock:
+            self.dim = dim
+            self._graph = graph
+            self._exact = exact
+            self._codes = {label: code for code, label in enumerate(labels)}
+            for doc_id, (user_code, type_code, version) in zip(doc_ids, meta):
+                self._set_meta(doc_id, user_code, type_code, version)
+            self._changes = len(graph.deleted)
+        return True